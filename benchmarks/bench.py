@@ -0,0 +1,156 @@
+# Benchmark suite: times each check, the engine, build_output and the Excel export on synthetic data
+#
+#   python -m benchmarks.bench --sizes 10k 1m                 # run and compare against the baseline
+#   python -m benchmarks.bench --sizes 10k 1m --save-baseline # record a new baseline
+#
+# Exits with status 1 when a case is slower than its baseline by more than --threshold.
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from engine import discover_checks, run_selected_batches
+from reporting import AssetIndex, build_output, export_findings_excel, findings_to_dataframe
+from run_context import RunContext
+from telemetry import RunTelemetry
+from benchmarks.datasets import DefectRates, make_mayrise_tables
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this many seconds are timer noise and never count as regressions
+DEFAULT_MIN_DELTA = 0.02
+# The Excel export is skipped above this many findings to keep large runs short
+EXCEL_MAX_ROWS = 200_000
+
+@dataclass
+class Result:
+    """Best-of-N timing of one case at one size."""
+    case: str
+    size: str
+    rows: int
+    seconds: float
+    repeat: int
+
+    @property
+    def key(self) -> str:
+        return f'{self.size}/{self.case}'
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def run_size(label: str, rows: int, repeat: int = 3, seed: int = 0, rates: DefectRates = DefectRates(),
+             cases: Optional[Sequence[str]] = None) -> List[Result]:
+    """Time every case (or those whose name starts with one of `cases`) on one synthetic dataset."""
+    tables = make_mayrise_tables(rows, seed=seed, rates=rates)
+    quiet = lambda: RunTelemetry(None, None)
+    wanted = lambda case: not cases or any(case.startswith(c) for c in cases)
+    results: List[Result] = []
+
+    def _time(case: str, fn: Callable[[], object]) -> None:
+        if wanted(case):
+            results.append(Result(case, label, rows, _best_of(fn, repeat), repeat))
+
+    # Each check on its own, with a fresh RunContext so shared views aren't reused between repeats
+    for cid, cls in sorted(discover_checks().items()):
+        _time(f'check:{cid}', lambda cls=cls: cls().run_batch(RunContext(tables)))
+    _time('engine:sequential', lambda: run_selected_batches(tables, mode='sequential', telemetry=quiet()))
+    _time('engine:thread', lambda: run_selected_batches(tables, mode='thread', telemetry=quiet()))
+
+    fdf = findings_to_dataframe(run_selected_batches(tables, telemetry=quiet()))
+    _time('build_output', lambda: build_output(fdf, tables['ASSETS']))
+    index = AssetIndex(tables['ASSETS'])
+    build_output(fdf, index)  # first lookup builds the hash table
+    _time('build_output:indexed', lambda: build_output(fdf, index))
+    output_df = build_output(fdf, tables['ASSETS'])
+    if len(output_df) <= EXCEL_MAX_ROWS:
+        with tempfile.TemporaryDirectory() as tmp:
+            _time('export_findings_excel', lambda: export_findings_excel(output_df, os.path.join(tmp, 'out.xlsx')))
+    return results
+
+def load_baseline(path: str) -> Dict[str, float]:
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+def save_baseline(path: str, results: Sequence[Result]) -> None:
+    """Merge results into the baseline file (other sizes/cases already in it are kept)."""
+    merged = load_baseline(path)
+    merged.update({r.key: round(r.seconds, 6) for r in results})
+    doc = {'python': platform.python_version(), 'pandas': pd.__version__, 'machine': platform.platform(),
+           'results': dict(sorted(merged.items()))}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=1)
+
+def compare(results: Sequence[Result], baseline: Dict[str, float], threshold: float = DEFAULT_THRESHOLD,
+            min_delta: float = DEFAULT_MIN_DELTA) -> List[dict]:
+    """
+    One row per result with its baseline ratio. A case has 'regressed' when it is slower than
+    baseline * (1 + threshold) and by more than min_delta seconds.
+    """
+    rows = []
+    for r in results:
+        base = baseline.get(r.key)
+        ratio = r.seconds / base if base else None
+        regressed = ratio is not None and ratio > 1 + threshold and r.seconds - base > min_delta
+        rows.append({**asdict(r), 'baseline': base, 'ratio': ratio, 'regressed': regressed})
+    return rows
+
+def _format(rows: Sequence[dict]) -> str:
+    lines = [f"{'case':<48} {'rows':>10} {'seconds':>9} {'baseline':>9} {'ratio':>6}"]
+    for r in rows:
+        base = f"{r['baseline']:.4f}" if r['baseline'] else '-'
+        ratio = f"{r['ratio']:.2f}" if r['ratio'] else '-'
+        flag = '  REGRESSED' if r['regressed'] else ''
+        lines.append(f"{r['size'] + '/' + r['case']:<48} {r['rows']:>10,} {r['seconds']:>9.4f} {base:>9} {ratio:>6}{flag}")
+    return '\n'.join(lines)
+
+def main(argv: Sequence[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog='python -m benchmarks.bench', description='Benchmark checks on synthetic Mayrise data.')
+    p.add_argument('--sizes', nargs='+', default=['10k'], choices=list(SIZES), help='Dataset sizes to run')
+    p.add_argument('--cases', nargs='*', help="Only cases starting with these prefixes (e.g. 'check:' 'engine')")
+    p.add_argument('--repeat', type=int, default=3, help='Timings per case; the best is kept')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    p.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown before failing (0.25 = 25%%)')
+    p.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA, help='Ignore slowdowns below this many seconds')
+    p.add_argument('--save-baseline', action='store_true', help='Record these timings as the new baseline')
+    p.add_argument('--json', metavar='PATH', help='Also write the results as JSON')
+    args = p.parse_args(argv)
+
+    results: List[Result] = []
+    for label in args.sizes:
+        results += run_size(label, SIZES[label], repeat=args.repeat, seed=args.seed, cases=args.cases)
+    rows = compare(results, load_baseline(args.baseline), args.threshold, args.min_delta)
+    print(_format(rows))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=1)
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+    regressed = [r for r in rows if r['regressed']]
+    if regressed:
+        print(f'{len(regressed)} case(s) regressed by more than {args.threshold:.0%}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Synthetic Mayrise-like data for the benchmarks and the scale tests
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+@dataclass(frozen=True)
+class DefectRates:
+    """Share of ASSETS rows given each defect; each defect hits exactly round(rate * rows) rows."""
+    blank_unitno: float = 0.01      # UNITNO null or blank
+    blank_street: float = 0.01      # STREET null or blank
+    bad_unitno: float = 0.01        # UNITNO present but not matching the default format
+    future_install: float = 0.005   # INSTALLDATE after today
+    missing_link: float = 0.01      # 'PL UG' asset without any CABLENOD row
+    plug_share: float = 0.3         # share of assets with SERVICEOWN 'PL UG'
+
+NO_DEFECTS = DefectRates(0, 0, 0, 0, 0)
+
+_PREFIXES = np.array(['A', 'B', 'C', 'LC', 'SL', 'FP', 'BOL', 'SIGN'])
+_SEPARATORS = np.array(['', '-', ' ', '.'])
+_SUFFIXES = np.array([''] * 6 + ['A', 'B'])
+_BAD_UNITNOS = np.array(['123', 'A-', '-12', 'A--1', '#7', 'A1-B2', '12AB', '?'])
+_OTHER_OWNERS = np.array(['DNO', 'PL OH', 'COUNCIL', 'PRIVATE'])
+_STREET_TYPES = np.array(['Road', 'Street', 'Lane', 'Avenue', 'Close', 'Way'])
+
+def _pick(rng: np.random.Generator, choices, n: int) -> pd.Series:
+    # Draw from a small pool with an Arrow take instead of materializing n Python strings
+    pool = pd.array(np.asarray(choices), dtype='str')
+    return pd.Series(pool.take(rng.integers(0, len(pool), n)))
+
+def _unit_ids(n: int) -> pd.Series:
+    width = len(str(n))
+    digits = pc.utf8_lpad(pc.cast(pa.array(np.arange(1, n + 1)), pa.string()), width=width, padding='0')
+    return pd.Series(pd.array(pc.binary_join_element_wise('U', digits, ''), dtype='str'))
+
+def make_mayrise_tables(rows: int, seed: int = 0, rates: DefectRates = DefectRates(), cables_per_link: int = 2,
+                        today: pd.Timestamp | None = None, dates_as_text: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    Seeded ASSETS and CABLENOD tables shaped like the Mayrise extracts, built with vectorized
+    numpy so 10M rows take seconds. The same (rows, seed, rates) always give the same tables.
+
+    Defect rows are drawn without overlap between the UNITNO defects, so each check's expected
+    finding count is exact: INSTALL_DATE_FUTURE = future_install, SERVICEOWN_PLUG_REQUIRES_CABLENOD
+    = missing_link (taken from the 'PL UG' rows), UNITNO_FORMAT = bad_unitno + blank_unitno,
+    MANDATORY_FIELDS = blank_unitno + blank_street.
+    """
+    rng = np.random.default_rng(seed)
+    today = (today or pd.Timestamp.today()).normalize()
+    n = int(rows)
+    count = lambda rate: int(round(rate * n))
+
+    unitid = _unit_ids(n)
+    unitno = (_pick(rng, _PREFIXES, n) + _pick(rng, _SEPARATORS, n)
+              + _pick(rng, np.arange(1, 100_000).astype(str), n) + _pick(rng, _SUFFIXES, n))
+    street = _pick(rng, [f'Street {i} {t}' for i in range(1, 2_000) for t in _STREET_TYPES], n)
+    serviceown = _pick(rng, _OTHER_OWNERS, n)
+    installed = pd.Series(today - pd.to_timedelta(rng.integers(1, 50 * 365, n), unit='D'))
+
+    # UNITNO defects come from one permutation so blank and malformed rows never overlap
+    perm = rng.permutation(n)
+    n_blank, n_bad = count(rates.blank_unitno), count(rates.bad_unitno)
+    blank_rows = perm[:n_blank]
+    unitno.iloc[blank_rows[::2]] = None
+    unitno.iloc[blank_rows[1::2]] = '  '
+    unitno.iloc[perm[n_blank:n_blank + n_bad]] = _BAD_UNITNOS[rng.integers(0, len(_BAD_UNITNOS), n_bad)]
+
+    blank_street = rng.choice(n, count(rates.blank_street), replace=False)
+    street.iloc[blank_street[::2]] = None
+    street.iloc[blank_street[1::2]] = ''
+
+    future = rng.choice(n, count(rates.future_install), replace=False)
+    installed.iloc[future] = today + pd.to_timedelta(rng.integers(1, 10 * 365, len(future)), unit='D')
+
+    plug = rng.choice(n, count(rates.plug_share), replace=False)
+    serviceown.iloc[plug] = 'PL UG'
+    missing = plug[:min(count(rates.missing_link), len(plug))]
+    linked = np.sort(plug[len(missing):])
+
+    assets = pd.DataFrame({
+        'UNITID': unitid,
+        'UNITNO': unitno,
+        'STREET': street,
+        'SERVICEOWN': serviceown,
+        'INSTALLDATE': installed.dt.strftime('%Y-%m-%d') if dates_as_text else installed,
+    })
+    link_ids = pd.Series(unitid.array.take(np.repeat(linked, cables_per_link)))
+    cablenod = pd.DataFrame({
+        'NODE_ID': np.arange(1, len(link_ids) + 1),
+        'LINK_ID': link_ids,
+        'CABLE_TYPE': _pick(rng, np.array(['2C', '3C', '4C']), len(link_ids)),
+    })
+    return {'ASSETS': assets, 'CABLENOD': cablenod}
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Iterable, Tuple
 import csv
 import os
 
@@ -12,6 +13,16 @@ def log_check_execution(check_id: str, items_count: int, log_file: str = 'checks
         log_file: Path to the CSV log file (default: checks.csv in current directory)
     """
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    log_check_executions([(timestamp, check_id, items_count)], log_file)
+
+def log_check_executions(rows: Iterable[Tuple[str, str, int]], log_file: str = 'checks.csv') -> None:
+    """
+    Append several (timestamp, check_id, items_count) rows to the CSV log in one write.
+    
+    Args:
+        rows: Rows to append, in order
+        log_file: Path to the CSV log file (default: checks.csv in current directory)
+    """
     file_exists = os.path.isfile(log_file)
     
     with open(log_file, 'a', newline='') as f:
@@ -19,6 +30,4 @@ def log_check_execution(check_id: str, items_count: int, log_file: str = 'checks
         # Write header if file is new
         if not file_exists:
             writer.writerow(['DateTime', 'CheckID', 'ItemsReturned'])
-        # Write data row
-        writer.writerow([timestamp, check_id, items_count])
-
+        writer.writerows(rows)
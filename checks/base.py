@@ -1,9 +1,12 @@
 # Base module for data validation checks - provides abstract base class for all check implementations
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from typing import Dict, List
+from abc import ABC
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import pandas as pd
-from models import Finding
+from models import Finding, FindingBatch
+
+if TYPE_CHECKING:
+    from pushdown import SqlDialect
 
 # Type alias for the tables dictionary structure used throughout the check framework
 # Maps table names (strings) to their corresponding DataFrames
@@ -13,7 +16,7 @@ class BaseCheck(ABC):
     """
     Abstract base class for all data validation checks.
     
-    Subclasses must implement the run() method to define custom validation logic.
+    Subclasses must implement run() or run_batch() to define custom validation logic.
     This framework allows standardized checks on database tables stored as DataFrames.
     """
     # Unique identifier for the check
@@ -24,13 +27,72 @@ class BaseCheck(ABC):
     description: str = ''
     # Default severity level for findings (can be overridden per finding)
     severity_default: str = 'ERROR'
+    # True when a row's findings depend only on that row of the first table in requires()
+    # (plus the other, reference tables as a whole), so the check can be re-run on changed rows only
+    row_local: bool = False
+
+    def requires(self) -> Dict[str, List[str]]:
+        """
+        Tables and columns this check reads, as {table name: [column names]}.
+        
+        For row_local checks the first table is the one validated row by row; any others
+        are reference tables. An empty dict means "unknown" (treated as reading everything).
+        """
+        return {}
+
+    def datetime_columns(self) -> List[str]:
+        """
+        Columns of the first table in requires() this check reads through RunContext's 'datetime' view.
+        
+        pd.to_datetime infers the date format from the column's first value, so partitioned runs
+        parse these once over the whole column rather than per partition.
+        """
+        return []
+
+    def reference_keys(self) -> List[Tuple[str, str]]:
+        """
+        (table, column) pairs this check looks keys up in through RunContext.key_index().
+        
+        The engine builds each distinct key index once before the checks start, so every
+        rule sharing a reference key reuses one pass over the reference table.
+        """
+        return []
+
+    def pushdown_sql(self, table_sql: Dict[str, str], dialect: 'SqlDialect') -> Optional[Dict[str, str]]:
+        """
+        Queries returning only the rows that can fail this check, as {table name: SQL} built over
+        the source SQL in table_sql, or None if the check can't run in the database.
+        
+        run_batch() is then run on just those rows (see pushdown.run_pushdown), so a query may
+        return more rows than fail, but never fewer. Every table run_batch() reads needs a query.
+        """
+        return None
+
+    def cache_token(self) -> str:
+        """
+        Extra state the findings depend on besides the input rows (e.g. today's date).
+        
+        Incremental runs discard carried-forward findings whenever this value changes.
+        """
+        return ''
+
+    def config_token(self) -> str:
+        """
+        Fingerprint of the check's definition: its class, check_id, severity and instance settings.
+        
+        Incremental runs re-run the check in full whenever this value changes. Checks whose
+        settings live in class attributes, or whose attribute reprs are lossy, extend it.
+        """
+        cls = type(self)
+        return repr((f'{cls.__module__}.{cls.__qualname__}', self.check_id, self.severity_default,
+                     sorted(vars(self).items())))
 
-    @abstractmethod
     def run(self, tables: Tables) -> List[Finding]:
         """
         Execute the validation check on the provided tables.
         
-        This method must be implemented by all subclasses to define custom validation logic.
+        Subclasses implement either run() or run_batch(); the other one is derived from it.
+        This list-based form is kept for compatibility with existing callers.
         
         Args:
             tables: Dictionary mapping table names (str) to DataFrames. The check can access
@@ -40,4 +102,17 @@ class BaseCheck(ABC):
             List of Finding objects representing validation errors/warnings found. 
             Returns empty list if no issues are detected.
         """
-        ...
+        if type(self).run_batch is BaseCheck.run_batch:
+            raise NotImplementedError(f'{type(self).__name__} must implement run() or run_batch()')
+        return self.run_batch(tables).to_findings()
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
+        """
+        Execute the check and return its findings as a columnar FindingBatch.
+        
+        Vectorized checks override this and build the batch straight from their boolean masks.
+        The default wraps the list returned by run().
+        """
+        if type(self).run is BaseCheck.run:
+            raise NotImplementedError(f'{type(self).__name__} must implement run() or run_batch()')
+        return FindingBatch.from_findings(self.run(tables))
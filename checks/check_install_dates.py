@@ -1,8 +1,8 @@
 # Check to validate that asset installation dates are not in the future
 from __future__ import annotations
-from typing import List
 import pandas as pd
-from models import Finding
+from models import FindingBatch
+from run_context import RunContext
 from .base import BaseCheck, Tables
 
 class InstallDateNotInFutureCheck(BaseCheck):
@@ -11,6 +11,7 @@ class InstallDateNotInFutureCheck(BaseCheck):
     name = 'Install date not in the future'
     description = 'Flags assets with INSTALLDATE later than today.'
     severity_default = 'WARN'
+    row_local = True
 
     def __init__(self, assets_key: str = 'ASSETS', date_col: str = 'INSTALLDATE'):
         """
@@ -23,29 +24,60 @@ class InstallDateNotInFutureCheck(BaseCheck):
         self.assets_key = assets_key
         self.date_col = date_col
 
-    def run(self, tables: Tables) -> List[Finding]:
+    def requires(self):
+        return {self.assets_key: ['UNITID', self.date_col]}
+
+    def datetime_columns(self):
+        return [self.date_col]
+
+    def cache_token(self) -> str:
+        # "In the future" is relative to today, so findings expire at midnight
+        return pd.Timestamp.today().normalize().isoformat()
+
+    def pushdown_sql(self, table_sql, dialect):
+        # Rows whose date the database parses to later than today at midnight, plus every date it
+        # may read differently from pd.to_datetime: unparsed, or not ISO-shaped (01/02/2030 depends
+        # on the date order)
+        col = dialect.ident(self.date_col)
+        if self.assets_key not in table_sql or col is None:
+            return None
+        src = table_sql[self.assets_key]
+        today = dialect.literal(pd.Timestamp.today().normalize())
+        parsed = dialect.as_datetime(col)
+        iso = dialect.matches(dialect.as_text(col), '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*')
+        candidates = f'{col} IS NOT NULL AND (NOT {iso} OR {parsed} IS NULL OR {parsed} > {today})'
+        # pd.to_datetime infers the format from the first value, so the first dated row comes first
+        # (if it isn't a candidate itself) and the candidates parse as in a full run. Neither a
+        # source's row order nor UNION ALL's is guaranteed (SQL Server), so "first" is by UNITID
+        # (nulls last, then the date text) in both the first-row query and the result
+        def order(alias):
+            key, date = dialect.ident('UNITID', alias), dialect.ident(self.date_col, alias)
+            return f'CASE WHEN {key} IS NULL THEN 1 ELSE 0 END, {dialect.exact(key)}, {dialect.as_text(date)}'
+        first = dialect.first_row(src, f'{col} IS NOT NULL', order('f'), alias='f')
+        rows = (f'SELECT * FROM ({first}) f WHERE NOT ({candidates}) UNION ALL '
+                + dialect.select_where(src, candidates))
+        return {self.assets_key: f'SELECT * FROM ({rows}) u ORDER BY {order("u")}'}
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
         """Execute the install date validation check."""
         # Check if the assets table exists in the provided tables dictionary
         if self.assets_key not in tables:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', f'Missing table: {self.assets_key}', field=self.assets_key)]
+            return FindingBatch.dataset_error(self.check_id, f'Missing table: {self.assets_key}', field=self.assets_key)
         
         # Retrieve the assets DataFrame
         df = tables[self.assets_key]
         
         # Check if the date column exists in the assets table
         if self.date_col not in df.columns:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', f'Missing column: {self.date_col}', field=self.date_col)]
+            return FindingBatch.dataset_error(self.check_id, f'Missing column: {self.date_col}', field=self.date_col)
         
-        # Convert date column to datetime 
-        dates = pd.to_datetime(df[self.date_col], errors='coerce')
+        # Convert date column to datetime (parsed once per run and shared between checks)
+        ctx = RunContext.wrap(tables)
+        dates = ctx.view(self.assets_key, self.date_col, 'datetime')
         # Create a mask for rows where the date exists and is in the future (after today at midnight)
         mask = dates.notna() & (dates > pd.Timestamp.today().normalize())
         
-        # Build findings list for all assets with future install dates
-        out: List[Finding] = []
-        for _, row in df.loc[mask, ['UNITID', self.date_col]].iterrows():
-            # Create a finding for each asset with a future date
-            out.append(Finding(str(row['UNITID']), self.check_id, self.severity_default,
-                               'Install date is in the future.', field=self.date_col,
-                               current_value=str(row[self.date_col]), expected='<= today'))
-        return out
+        # One finding per asset with a future date, built straight from the mask
+        return FindingBatch.from_mask(ctx.view(self.assets_key, 'UNITID', 'str'), mask, self.check_id, self.severity_default,
+                                      'Install date is in the future.', field=self.date_col,
+                                      current_value=ctx.view(self.assets_key, self.date_col, 'str'), expected='<= today')
@@ -1,8 +1,8 @@
 # Check to validate that mandatory asset fields are present and not blank
 from __future__ import annotations
-from typing import List
 import pandas as pd
-from models import Finding
+from models import FindingBatch
+from run_context import RunContext
 from .base import BaseCheck, Tables
 
 class MandatoryFieldsCheck(BaseCheck):
@@ -11,6 +11,7 @@ class MandatoryFieldsCheck(BaseCheck):
     name = 'Mandatory fields present'
     description = 'UNITID/UNITNO/STREET must exist and not be blank.'
     severity_default = 'ERROR'
+    row_local = True
 
     def __init__(self, assets_key: str = 'ASSETS', required=('UNITID','UNITNO','STREET')):
         """
@@ -23,11 +24,22 @@ class MandatoryFieldsCheck(BaseCheck):
         self.assets_key = assets_key
         self.required = list(required)
 
-    def run(self, tables: Tables) -> List[Finding]:
+    def requires(self):
+        return {self.assets_key: list(dict.fromkeys(['UNITID'] + self.required))}
+
+    def pushdown_sql(self, table_sql, dialect):
+        # Rows with any required field NULL or blank (strip_all() also blanks Unicode whitespace)
+        cols = [dialect.ident(c) for c in self.required]
+        if self.assets_key not in table_sql or None in cols:
+            return None
+        blank = ' OR '.join(f"{c} IS NULL OR {dialect.strip_all(c)} = ''" for c in cols)
+        return {self.assets_key: dialect.select_where(table_sql[self.assets_key], blank)}
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
         """Execute the mandatory fields validation check."""
         # Check if the assets table exists in the provided tables dictionary
         if self.assets_key not in tables:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', f'Missing table: {self.assets_key}', field=self.assets_key)]
+            return FindingBatch.dataset_error(self.check_id, f'Missing table: {self.assets_key}', field=self.assets_key)
         
         # Retrieve the assets DataFrame
         df = tables[self.assets_key]
@@ -35,16 +47,17 @@ class MandatoryFieldsCheck(BaseCheck):
         # Check if all required columns exist in the DataFrame
         missing = [c for c in self.required if c not in df.columns]
         if missing:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', 'Missing required column(s): '+', '.join(missing), field=','.join(missing))]
+            return FindingBatch.dataset_error(self.check_id, 'Missing required column(s): '+', '.join(missing), field=','.join(missing))
         
-        # Check for blank/null values in each required column
-        findings: List[Finding] = []
+        # Check for blank/null values in each required column, using the run's shared normalized views
+        ctx = RunContext.wrap(tables)
+        unitids = ctx.view(self.assets_key, 'UNITID', 'str').fillna('(UNKNOWN)')
+        batches = []
         for col in self.required:
-            # Create a mask for rows where the column is either null or blank (empty string after stripping whitespace)
-            mask = df[col].isna() | (df[col].astype(str).str.strip()=='')
+            # Mask of rows where the column is either null or blank (empty string after stripping whitespace)
+            mask = ctx.view(self.assets_key, col, 'blank')
             if mask.any():
-                # For each blank value, create a finding with the associated UNITID
-                for unitid in df.loc[mask, 'UNITID'].astype(str).fillna('(UNKNOWN)'):
-                    findings.append(Finding(str(unitid), self.check_id, self.severity_default,
-                                            f"Mandatory field '{col}' is blank.", field=col))
-        return findings
+                # One finding per blank value, tagged with the associated UNITID
+                batches.append(FindingBatch.from_mask(unitids, mask, self.check_id, self.severity_default,
+                                                      f"Mandatory field '{col}' is blank.", field=col))
+        return FindingBatch.concat(batches)
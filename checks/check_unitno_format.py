@@ -1,66 +1,117 @@
 # Check to validate that UNITNO field follows the expected format pattern
 from __future__ import annotations
 import re
-from typing import List
+from typing import Dict, Mapping, Sequence, Tuple
+import numpy as np
 import pandas as pd
-from models import Finding
+from models import FindingBatch
+from run_context import RunContext
 from .base import BaseCheck, Tables
 
+DEFAULT_UNITNO_PATTERN = r'^[A-Za-z]+[ .-]?\d+(?:[A-Za-z]+)?$'
+
+def match_any_pattern(values: pd.Series, patterns: Sequence[str], flags: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized format validation of a column against one or more regex patterns.
+
+    Values are normalized the same way the row-by-row check did (null -> '', otherwise
+    str(value).strip()). Each distinct raw value is normalized and matched only once and
+    the result is broadcast back to every row, since values repeat across rows.
+
+    Args:
+        values: Column to validate
+        patterns: Regex patterns; a value is valid when it matches (re.match) any of them
+        flags: re flags applied to every pattern
+
+    Returns:
+        (valid, normalized): boolean array of validity per row, and the normalized string per row.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # Normalize distinct values only; the null sentinel (-1) maps to '' via the appended slot
+    normalized = pd.Series([str(v).strip() for v in uniques] + [''], dtype=object)
+    valid = np.zeros(len(normalized), dtype=bool)
+    for pat in patterns:
+        valid |= normalized.str.match(pat, flags=flags).to_numpy(dtype=bool, na_value=False)
+    return valid[codes], normalized.to_numpy()[codes]
+
 class UnitNoFormatCheck(BaseCheck):
     """Validates that UNITNO values match the required format using regex pattern matching."""
     check_id = 'UNITNO_FORMAT'
     name = 'UNITNO format'
     description = "Letters (1+) + optional separator + digits (1+) + optional trailing letters (1+)."
     severity_default = 'ERROR'
+    row_local = True
 
     def __init__(self, assets_key: str = 'ASSETS', unitid_col: str = 'UNITID', unitno_col: str = 'UNITNO',
-                 pattern: str = r'^[A-Za-z]+[ .-]?\d+(?:[A-Za-z]+)?$', ignore_case: bool = True):
+                 pattern: str | Sequence[str] | Mapping[str, str] = DEFAULT_UNITNO_PATTERN, ignore_case: bool = True):
         """
         Initialize the UNITNO format check with configurable table, columns, and validation pattern.
-        
+
         Args:
             assets_key: Name of the table containing asset data (default: 'ASSETS')
             unitid_col: Name of the unit identifier column (default: 'UNITID')
             unitno_col: Name of the unit number column to validate (default: 'UNITNO')
-            pattern: Regex pattern to validate UNITNO format. Default pattern: 
-                    letters (1+) + optional separator (space/hyphen/period) + digits (1+) + optional trailing letters
+            pattern: Regex pattern to validate UNITNO format. Default pattern:
+                    letters (1+) + optional separator (space/hyphen/period) + digits (1+) + optional trailing letters.
+                    May also be a list of patterns, or a mapping of profile name -> pattern
+                    (e.g. one per unit-type profile); a value is valid if it matches any of them.
             ignore_case: Whether to perform case-insensitive matching (default: True)
         """
         self.assets_key = assets_key
         self.unitid_col = unitid_col
         self.unitno_col = unitno_col
-        # Compile regex pattern with optional IGNORECASE flag
-        flags = re.IGNORECASE if ignore_case else 0
-        self._rx = re.compile(pattern, flags)
-        self._pattern = pattern
+        # Named profiles; a single pattern or a plain list gets positional names
+        if isinstance(pattern, str):
+            self.profiles: Dict[str, str] = {'default': pattern}
+        elif isinstance(pattern, Mapping):
+            self.profiles = dict(pattern)
+        else:
+            self.profiles = {f'pattern_{i+1}': p for i, p in enumerate(pattern)}
+        if not self.profiles:
+            raise ValueError('At least one UNITNO pattern is required')
+        # Compile regex patterns with optional IGNORECASE flag (also validates them up front)
+        self._flags = re.IGNORECASE if ignore_case else 0
+        self._rxs = [re.compile(p, self._flags) for p in self.profiles.values()]
+        self._rx = self._rxs[0]
+        self._pattern = ' | '.join(self.profiles.values())
 
-    def run(self, tables: Tables) -> List[Finding]:
+    def requires(self):
+        return {self.assets_key: [self.unitid_col, self.unitno_col]}
+
+    def config_token(self) -> str:
+        # The compiled regexes' repr truncates long patterns, so the profiles (in order) and
+        # the case flag stand in for them
+        cls = type(self)
+        return repr((f'{cls.__module__}.{cls.__qualname__}', self.check_id, self.severity_default, self.assets_key,
+                     self.unitid_col, self.unitno_col, list(self.profiles.items()), bool(self._flags & re.IGNORECASE)))
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
         """Execute the UNITNO format validation check."""
         # Check if the assets table exists in the provided tables dictionary
         if self.assets_key not in tables:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', f'Missing table: {self.assets_key}', field=self.assets_key)]
-        
+            return FindingBatch.dataset_error(self.check_id, f'Missing table: {self.assets_key}', field=self.assets_key)
+
         # Retrieve the assets DataFrame
         df = tables[self.assets_key]
-        
+
         # Check if required columns exist in the DataFrame
         miss = [c for c in (self.unitid_col, self.unitno_col) if c not in df.columns]
         if miss:
-            return [Finding('(DATASET)', self.check_id, 'ERROR', 'Missing column(s): '+', '.join(miss), field=','.join(miss))]
-        
-        # Iterate through each row and validate UNITNO format against the regex pattern
-        out: List[Finding] = []
-        for _, row in df[[self.unitid_col, self.unitno_col]].iterrows():
-            # Extract UNITID, defaulting to '(UNKNOWN)' if null
-            uid = str(row[self.unitid_col]).strip() if pd.notna(row[self.unitid_col]) else '(UNKNOWN)'
-            # Extract UNITNO value
-            raw = row[self.unitno_col]
-            # Normalize UNITNO: convert null to empty string, otherwise strip whitespace
-            val = '' if pd.isna(raw) else str(raw).strip()
-            # Check if UNITNO matches the expected format pattern
-            if not self._rx.match(val):
-                # Create a finding for invalid format
-                out.append(Finding(uid, self.check_id, self.severity_default,
-                                   'UNITNO format does not match expected pattern.',
-                                   field=self.unitno_col, current_value=val or None, expected=self._pattern))
-        return out
+            return FindingBatch.dataset_error(self.check_id, 'Missing column(s): '+', '.join(miss), field=','.join(miss))
+
+        # Validate every distinct UNITNO once against all patterns and broadcast back to the rows
+        valid, normalized = match_any_pattern(df[self.unitno_col], list(self.profiles.values()), self._flags)
+        bad = ~valid
+        if not bad.any():
+            return FindingBatch()
+
+        # UNITID of the failing rows, stripped, defaulting to '(UNKNOWN)' if null
+        ctx = RunContext.wrap(tables)
+        unitids = (ctx.view(self.assets_key, self.unitid_col, 'strip')
+                   .where(~ctx.view(self.assets_key, self.unitid_col, 'isna'), '(UNKNOWN)')[bad])
+        # Blank values are reported as None rather than ''
+        current = normalized[bad]
+        current = np.where(current == '', None, current)
+        return FindingBatch.from_mask(unitids, None, self.check_id, self.severity_default,
+                                      'UNITNO format does not match expected pattern.',
+                                      field=self.unitno_col, current_value=current, expected=self._pattern)
@@ -0,0 +1,137 @@
+# Declarative cross-table (referential integrity) checks built on the run's shared key indexes
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from models import FindingBatch
+from run_context import RunContext
+from .base import BaseCheck, Tables
+
+# The attributes declaring a rule (see ReferentialCheck)
+_RULE_ATTRS = ('source_key', 'key_col', 'ref_key', 'ref_col', 'where_col', 'where_values', 'min_count', 'require',
+               'message', 'field', 'current_value', 'expected')
+
+class ReferentialCheck(BaseCheck):
+    """
+    Base class for rules of the form "rows of a source table matching a predicate must (or must
+    not) have at least min_count rows in a reference table whose ref_col equals their key_col".
+
+    Subclasses only declare the rule, as class attributes or instance attributes set in
+    __init__ (see ServiceOwnPlugRequiresCableNodCheck):
+
+        source_key, key_col      source table and its join column (e.g. ASSETS.UNITID)
+        ref_key, ref_col         reference table and its join column (e.g. CABLENOD.LINK_ID)
+        where_col, where_values  predicate: rows whose where_col, stripped and casefolded, is one
+                                 of where_values (where_col None = every row)
+        min_count, require       require=True flags rows with fewer than min_count matches;
+                                 require=False flags rows with min_count or more (an anti-join
+                                 when min_count is 1)
+        message, field, current_value, expected   what each finding says
+
+    Keys are compared stripped, and null keys never match. The reference side is a
+    RunContext.key_index(), built once per run, and the per-row match counts are memoized per
+    key pair, so every rule over the same key pair costs one pass over the reference table
+    plus a mask.
+    """
+    source_key: str = 'ASSETS'
+    key_col: str = 'UNITID'
+    ref_key: str = ''
+    ref_col: str = ''
+    where_col: Optional[str] = None
+    where_values: Sequence[str] = ()
+    min_count: int = 1
+    require: bool = True
+    message: str = ''
+    field: Optional[str] = None
+    current_value: Optional[str] = None
+    expected: Optional[str] = None
+    # Row-local over the source table for a given reference table
+    row_local = True
+
+    def requires(self) -> Dict[str, List[str]]:
+        cols = [self.key_col] + ([self.where_col] if self.where_col else [])
+        return {self.source_key: list(dict.fromkeys(cols)), self.ref_key: [self.ref_col]}
+
+    def reference_keys(self) -> List[Tuple[str, str]]:
+        return [(self.ref_key, self.ref_col)]
+
+    def config_token(self) -> str:
+        # The rule is usually declared in class attributes, which vars(self) doesn't see
+        rule = {name: getattr(self, name) for name in _RULE_ATTRS}
+        return repr((super().config_token(), sorted(rule.items())))
+
+    def _missing(self, tables: Tables) -> Optional[FindingBatch]:
+        # Missing tables/columns are reported as one '(DATASET)' error, like the other checks
+        for key in (self.source_key, self.ref_key):
+            if key not in tables:
+                return FindingBatch.dataset_error(self.check_id, f'Missing table: {key}', field=key)
+        src_cols = [c for c in dict.fromkeys((self.key_col, self.where_col)) if c]
+        miss = [c for c in src_cols if c not in tables[self.source_key].columns]
+        if miss:
+            return FindingBatch.dataset_error(self.check_id, f'Missing {self.source_key.lower()} column(s): ' + ', '.join(miss),
+                                              field=','.join(miss))
+        if self.ref_col not in tables[self.ref_key].columns:
+            return FindingBatch.dataset_error(self.check_id, f'Missing column in {self.ref_key}: {self.ref_col}', field=self.ref_col)
+        return None
+
+    def pushdown_sql(self, table_sql, dialect):
+        # Source rows that can fail, plus the reference rows that can match them. The database only
+        # approximates run_batch()'s stripped/casefolded comparisons, so each test errs towards
+        # fetching more rows; run_batch() then counts the matches among those exactly.
+        if self.source_key not in table_sql or self.ref_key not in table_sql:
+            return None
+        key, ref, match = dialect.ident(self.key_col, 's'), dialect.ident(self.ref_col, 'r'), dialect.ident(self.ref_col, 'm')
+        where = dialect.ident(self.where_col, 's') if self.where_col else ''
+        if None in (key, ref, match, where):
+            return None
+        src_sql, ref_sql = table_sql[self.source_key], table_sql[self.ref_key]
+        applies = '1 = 1'
+        if self.where_col:
+            # LOWER() is casefold() on ASCII text; values with any other character are all fetched
+            wanted = (''.join(' ' if ch.isspace() else ch for ch in str(v)).strip().casefold() for v in self.where_values)
+            values = ', '.join(dialect.literal(v) for v in wanted)
+            applies = f"(LOWER({dialect.strip_all(where)}) IN ({values}) OR {dialect.matches(where, '*[^ -~]*')})"
+        # min_count 1: a plain (anti-)join; otherwise the matches are counted (HAVING needs COUNT in the select)
+        counted, at_least = ('1', '') if int(self.min_count) == 1 else ('COUNT(*)', f' HAVING COUNT(*) >= {int(self.min_count)}')
+        if self.require:
+            # Keys equal byte for byte once trimmed surely match, so one anti-join on that
+            # keeps every row that may have too few matches
+            same = f'{dialect.exact(dialect.trim(match))} = {dialect.exact(dialect.trim(key))}'
+            count_ok = f'NOT EXISTS (SELECT {counted} FROM ({ref_sql}) m WHERE {same}{at_least})'
+        else:
+            # Keys that differ even loosely surely don't match, so one semi-join on the loose
+            # comparison keeps every row that may have too many
+            same = f'{dialect.strip_all(match)} = {dialect.strip_all(key)}'
+            count_ok = f'EXISTS (SELECT {counted} FROM ({ref_sql}) m WHERE {same}{at_least})'
+        candidates = f'{applies} AND {count_ok}'
+        return {
+            self.source_key: dialect.select_where(src_sql, candidates, alias='s'),
+            self.ref_key: dialect.select_where(ref_sql, f'{dialect.strip_all(ref)} IN (SELECT {dialect.strip_all(key)} '
+                                                        f'FROM ({src_sql}) s WHERE {candidates})', alias='r'),
+        }
+
+    def source_mask(self, ctx: RunContext) -> Optional[pd.Series]:
+        """Rows the rule applies to (None = all rows). Override for predicates beyond where_col/where_values."""
+        if not self.where_col:
+            return None
+        wanted = [str(v).strip().casefold() for v in self.where_values]
+        return ctx.view(self.source_key, self.where_col, 'casefold').isin(wanted)
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
+        missing = self._missing(tables)
+        if missing is not None:
+            return missing
+        ctx = RunContext.wrap(tables)
+        applies = self.source_mask(ctx)
+        if applies is not None and not applies.any():
+            return FindingBatch()
+
+        counts = ctx.match_counts(self.source_key, self.key_col, self.ref_key, self.ref_col)
+        bad = counts < self.min_count if self.require else counts >= self.min_count
+        if applies is not None:
+            bad &= applies.to_numpy(dtype=bool, na_value=False)
+        if not bad.any():
+            return FindingBatch()
+        keys = ctx.view(self.source_key, self.key_col, 'key')
+        return FindingBatch.from_mask(keys, pd.Series(bad, index=keys.index), self.check_id, self.severity_default,
+                                      self.message, field=self.field, current_value=self.current_value,
+                                      expected=self.expected)
@@ -0,0 +1,268 @@
+# Headless batch runner: load, check and export without the Tk GUI (for scheduled runs)
+from __future__ import annotations
+from typing import Dict, List, Sequence, TextIO
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+
+import registry
+
+# Exit codes. 1 (unhandled failure) and 2 (argparse usage error) keep their usual meaning.
+EXIT_OK = 0
+EXIT_FAILURE = 1
+EXIT_USAGE = 2
+EXIT_WARN = 3
+EXIT_ERROR = 4
+
+# Exit code for the most severe finding; unknown severities count as warnings
+SEVERITY_EXIT_CODES = {'ERROR': EXIT_ERROR, 'WARN': EXIT_WARN}
+
+OUTPUT_FORMATS = {'.parquet': 'parquet', '.csv': 'csv', '.gz': 'csv', '.jsonl': 'jsonl',
+                  '.db': 'sqlite', '.sqlite': 'sqlite', '.xlsx': 'xlsx'}
+# Formats written while checks run (sinks.py); the rest are written from the kept findings
+STREAMING_FORMATS = ('parquet', 'csv', 'jsonl', 'sqlite')
+
+class JsonLinesProgress:
+    """Writes one JSON object per event to a stream (stdout by default), flushed immediately."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+        self._t0 = time.perf_counter()
+
+    def emit(self, event: str, **fields) -> None:
+        rec = {'event': event, 'elapsed': round(time.perf_counter() - self._t0, 3), **fields}
+        self.stream.write(json.dumps(rec, default=str) + '\n')
+        self.stream.flush()
+
+def select_checks(patterns: Sequence[str] | None, available: Sequence[str]) -> List[str]:
+    """
+    Check ids matching any of the ids or glob patterns (e.g. 'MANDATORY_*'), in registry order.
+
+    No patterns selects every check. Raises ValueError naming patterns that match nothing.
+    """
+    if not patterns:
+        return list(available)
+    unmatched = [p for p in patterns if not any(fnmatch.fnmatchcase(cid, p) for cid in available)]
+    if unmatched:
+        raise ValueError(f"No check matches: {', '.join(unmatched)}")
+    return [cid for cid in available if any(fnmatch.fnmatchcase(cid, p) for p in patterns)]
+
+def exit_code_for(severity_counts: Dict[str, int]) -> int:
+    """Exit code for a run from its per-severity finding counts."""
+    codes = [SEVERITY_EXIT_CODES.get(sev, EXIT_WARN) for sev, n in severity_counts.items() if n]
+    return max(codes, default=EXIT_OK)
+
+def write_output(output_df, out_path: str, fmt: str | None = None, progress=None) -> str:
+    """
+    Write the enriched findings as Parquet, CSV or Excel (format from fmt or the extension).
+    progress(rows_written, total_rows) is reported by the streaming Excel writer.
+    """
+    fmt = fmt or OUTPUT_FORMATS.get(os.path.splitext(out_path)[1].lower())
+    if fmt == 'parquet':
+        output_df.to_parquet(out_path, index=False)
+    elif fmt == 'csv':
+        output_df.to_csv(out_path, index=False)
+    elif fmt == 'xlsx':
+        from reporting import export_findings_excel
+        export_findings_excel(output_df, out_path, progress=progress)
+    else:
+        raise ValueError(f'Cannot infer output format from {out_path!r}; use --format')
+    return fmt
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog='cli.py', description='Run Mayrise PFI data verification checks headlessly.')
+    p.add_argument('--conn', default=os.environ.get('MAYRISE_CONN', 'DSN=TYNESQL;Trusted_Connection=Yes;'),
+                   help='ODBC connection string (default: $MAYRISE_CONN or the GUI default)')
+    p.add_argument('--checks', nargs='*', metavar='ID_OR_GLOB', help='Check ids or glob patterns (default: all)')
+    p.add_argument('--list', action='store_true', help='List available checks as JSON lines and exit')
+    p.add_argument('--load', choices=('direct', 'cache', 'offline'), default='direct',
+                   help='direct: query the source; cache: use the local snapshot cache; offline: last snapshot only')
+    p.add_argument('--refresh', action='store_true', help='With --load cache, refetch and overwrite snapshots')
+    p.add_argument('--ttl', type=float, default=None, help='Snapshot time-to-live in seconds')
+    p.add_argument('--snapshot-dir', default=None, help='Snapshot cache directory')
+    p.add_argument('--all-tables', action='store_true', help='Load every registered table in full instead of only what the checks read')
+    p.add_argument('--pipeline', action='store_true',
+                   help='Start each check as soon as its tables have loaded instead of after every load (thread mode)')
+    p.add_argument('--no-compact', action='store_true', help='Keep loaded tables as returned instead of compacting them (sql_defs.TABLE_COMPACTION)')
+    p.add_argument('--pushdown', action='store_true',
+                   help='Run checks that support it as SQL in the source database, fetching only violating rows (see pushdown.py)')
+    p.add_argument('--mode', choices=('sequential', 'thread', 'process', 'partitioned'), default='thread', help='Check execution mode')
+    p.add_argument('--workers', type=int, default=None, help='Worker count for --mode thread/process/partitioned')
+    p.add_argument('--partitions', type=int, default=None, help='With --mode partitioned, partitions per table (default: 2 per worker)')
+    p.add_argument('--partition-key', default='UNITID', help='With --mode partitioned, column rows are partitioned on (e.g. STREETID)')
+    p.add_argument('--incremental', metavar='STATE_DIR', nargs='?', const='.incremental', default=None,
+                   help='Only re-check rows changed since the last run (state kept in STATE_DIR)')
+    p.add_argument('--telemetry-db', help='SQLite file receiving per-check run telemetry (default: checks.db)')
+    p.add_argument('--track-memory', action='store_true', help='Record peak traced memory per check (slower)')
+    p.add_argument('--profile', metavar='TRACE_JSON', help='Write stage/check timing spans as a Chrome trace (flame chart)')
+    p.add_argument('--cprofile', metavar='PROF_FILE', help='Profile every check with cProfile and write merged pstats')
+    p.add_argument('--out', help='Findings output file (.parquet, .csv, .csv.gz, .jsonl, .db or .xlsx)')
+    p.add_argument('--format', choices=sorted(set(OUTPUT_FORMATS.values())), help='Output format (default: from --out extension)')
+    return p
+
+def main(argv: Sequence[str] | None = None, stream: TextIO | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    progress = JsonLinesProgress(stream)
+    try:
+        infos = registry.list_checks()
+    except ValueError as e:
+        # e.g. a rule in the rules file with the id of a Python check
+        progress.emit('run_failed', error=str(e))
+        return EXIT_USAGE
+
+    if args.list:
+        for cid, info in sorted(infos.items()):
+            progress.emit('check', check_id=cid, name=info.name, description=info.description, module=info.module)
+        return EXIT_OK
+    try:
+        selected = select_checks(args.checks, sorted(infos))
+    except ValueError as e:
+        progress.emit('run_failed', error=str(e))
+        return EXIT_USAGE
+    if args.pipeline and args.mode not in ('sequential', 'thread'):
+        progress.emit('run_failed', error=f'--pipeline runs checks on threads; it cannot be combined with --mode {args.mode}')
+        return EXIT_USAGE
+
+    try:
+        from engine import required_inputs, run_pipelined, run_selected_batches
+        from loading import TableLoad, default_loader, iter_required_loads, load_required_tables, merge_requirements
+        from profiling import Profiler
+        from reporting import OUTPUT_ASSET_COLS, AssetEnricher, AssetIndex, build_output, findings_to_dataframe
+        from sinks import DeferredSink, ProgressSink, SummarySink, open_sink
+        from models import FindingBatch
+        import pandas as pd
+
+        progress.emit('run_started', checks=selected, load=args.load, mode=args.mode)
+        profiler = Profiler(cprofile=bool(args.cprofile), track_memory=args.track_memory)
+        loader = default_loader()
+        if args.load != 'direct':
+            from snapshot_cache import DEFAULT_SNAPSHOT_DIR, DEFAULT_TTL, SnapshotCache
+            cache = SnapshotCache(args.snapshot_dir or DEFAULT_SNAPSHOT_DIR, DEFAULT_TTL if args.ttl is None else args.ttl)
+            loader = cache.wrap(loader, refresh=args.refresh, offline=args.load == 'offline')
+
+        from telemetry import DEFAULT_DB_PATH, RunTelemetry
+        telemetry = RunTelemetry(args.telemetry_db or DEFAULT_DB_PATH, mode=args.mode)
+        # Pushed-down checks run first; only the rest need their tables loaded
+        pushed = None
+        to_load = selected
+        if args.pushdown:
+            from pushdown import run_pushdown
+            with profiler.span('pushdown'):
+                pushed = run_pushdown(args.conn, [(cid, registry.load_check(cid)) for cid in selected],
+                                      loader=loader, telemetry=telemetry)
+            to_load = pushed.fallback
+            progress.emit('pushdown', checks=sorted(pushed.batches), rows_fetched=pushed.rows_fetched,
+                          fallback=pushed.fallback, errors=pushed.errors)
+
+        tables = {}
+        run_checks = pushed is None or bool(to_load)
+        loads = None
+        if run_checks:
+            # Partitioned runs also need the partition key of the validated table (ASSETS)
+            extra = [args.partition_key] if args.mode == 'partitioned' else []
+            required = None if args.all_tables else merge_requirements(required_inputs(to_load),
+                                                                       {'ASSETS': list(OUTPUT_ASSET_COLS) + extra})
+            def _on_loaded(load: TableLoad, done: int, total: int) -> None:
+                profiler.add_finished('load', load.name, load.seconds)
+                memory = {}
+                if load.compaction is not None:
+                    memory = dict(bytes_before=load.compaction.bytes_before, bytes_after=load.compaction.bytes_after)
+                progress.emit('table_loaded', table=load.name, rows=len(load.frame), cols=len(load.frame.columns),
+                              seconds=round(load.seconds, 3), done=done, total=total, **memory)
+            if args.pipeline:
+                # Consumed by run_pipelined below, which starts each check as its tables arrive
+                loads = iter_required_loads(args.conn, required, loader=loader, progress=_on_loaded,
+                                            compact=not args.no_compact)
+            else:
+                with profiler.span('load'):
+                    tables = load_required_tables(args.conn, required, loader=loader, progress=_on_loaded,
+                                                  compact=not args.no_compact)
+
+        incremental = None
+        if args.incremental:
+            from incremental import IncrementalStore
+            incremental = IncrementalStore(args.incremental)
+        fmt = (args.format or OUTPUT_FORMATS.get(os.path.splitext(args.out)[1].lower())) if args.out else None
+        if args.out and fmt is None:
+            raise ValueError(f'Cannot infer output format from {args.out!r}; use --format')
+        # Streamed outputs are enriched and written as each check completes, so findings aren't kept
+        summary = SummarySink()
+        # check_finished events stream as each check completes, not after the run
+        sinks = [summary, ProgressSink(lambda cid, n: progress.emit('check_finished', check_id=cid, findings=n))]
+        assets = tables.get('ASSETS')
+        if assets is None and not run_checks:
+            # Everything was pushed down: the candidate ASSETS rows hold every asset with a finding
+            assets = pushed.tables.get('ASSETS', pd.DataFrame(columns=list(OUTPUT_ASSET_COLS)))
+        asset_index = AssetIndex(assets) if args.out and assets is not None else None
+        out_sink = deferred = None
+        if fmt in STREAMING_FORMATS:
+            if asset_index is not None:
+                out_sink = open_sink(args.out, fmt, AssetEnricher(asset_index, OUTPUT_ASSET_COLS))
+                sinks.append(out_sink)
+            else:
+                # Pipelined: findings are held until ASSETS has loaded and can enrich them
+                out_sink = open_sink(args.out, fmt)
+                deferred = DeferredSink(out_sink)
+                sinks.append(deferred)
+        def _on_table(load: TableLoad) -> None:
+            nonlocal asset_index
+            tables[load.name] = load.frame
+            if load.name == 'ASSETS' and args.out:
+                asset_index = AssetIndex(load.frame)
+                if deferred is not None:
+                    deferred.release(AssetEnricher(asset_index, OUTPUT_ASSET_COLS))
+        t0 = time.perf_counter()
+        try:
+            batches = []
+            if pushed is not None:
+                for cid in selected:
+                    if cid in pushed.batches:
+                        for sink in sinks:
+                            sink.write(pushed.batches[cid])
+                            sink.check_finished(cid, len(pushed.batches[cid]))
+                        if fmt == 'xlsx':
+                            batches.append(pushed.batches[cid])
+            if loads is not None:
+                batches.append(run_pipelined(loads, to_load, max_workers=args.workers, incremental=incremental,
+                                             telemetry=telemetry, profiler=profiler, sinks=sinks,
+                                             keep_findings=fmt == 'xlsx', on_loaded=_on_table))
+            elif run_checks:
+                batches.append(run_selected_batches(tables, to_load, mode=args.mode, max_workers=args.workers,
+                                                    incremental=incremental, telemetry=telemetry, profiler=profiler,
+                                                    sinks=sinks, keep_findings=fmt == 'xlsx', partitions=args.partitions,
+                                                    partition_key=args.partition_key))
+            else:
+                telemetry.flush()
+            batch = FindingBatch.concat(batches)
+        finally:
+            for sink in sinks:
+                sink.close()
+        progress.emit('checks_finished', findings=summary.rows_written, seconds=round(time.perf_counter() - t0, 3))
+
+        severity_counts = summary.by_severity
+        if fmt in STREAMING_FORMATS:
+            progress.emit('output_written', path=args.out, format=fmt, rows=out_sink.rows_written)
+        elif args.out:
+            with profiler.span('reporting'):
+                output_df = build_output(findings_to_dataframe(batch), asset_index, asset_cols=OUTPUT_ASSET_COLS)
+            with profiler.span('export'):
+                write_output(output_df, args.out, fmt,
+                             progress=lambda done, total: progress.emit('export_progress', rows=done, total=total))
+            progress.emit('output_written', path=args.out, format=fmt, rows=len(output_df))
+        progress.emit('stage_timings', **{st: round(sec, 3) for st, sec in profiler.stage_totals().items()})
+        if args.profile:
+            profiler.dump_trace(args.profile)
+        if args.cprofile:
+            profiler.dump_pstats(args.cprofile)
+        code = exit_code_for(severity_counts)
+        progress.emit('run_finished', run_id=telemetry.run_id, findings=summary.rows_written, by_severity=severity_counts, exit_code=code)
+        return code
+    except Exception as e:
+        progress.emit('run_failed', error=f'{type(e).__name__}: {e}')
+        return EXIT_FAILURE
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# Load-time compaction: narrower, typed columns for the loaded tables (configured per table in sql_defs)
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple
+import time
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_integer_dtype, is_object_dtype
+
+# Spec keys understood by compact_frame(); see sql_defs.TABLE_COMPACTION
+#   category:       text columns stored as categoricals (low cardinality: SERVICEOWN, STREET, ...)
+#   string:         text columns stored as Arrow-backed strings (high cardinality: UNITID, UNITNO, ...)
+#   datetime:       columns parsed once with pd.to_datetime(errors='coerce'), like RunContext's 'datetime' view
+#   category_ratio: other text columns become categoricals when distinct/rows is at most this, else strings
+#   downcast:       integer columns are downcast to the smallest integer type that holds them
+CompactionSpec = Mapping[str, object]
+
+DEFAULT_CATEGORY_RATIO = 0.5
+
+@dataclass
+class CompactionReport:
+    """Memory footprint of one table before and after compaction, and what was converted."""
+    table: str
+    rows: int
+    bytes_before: int
+    bytes_after: int
+    seconds: float
+    converted: Dict[str, str] = field(default_factory=dict)   # column -> new dtype
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0.0
+
+    def summary(self) -> str:
+        mb = lambda n: n / 1_048_576
+        return (f'{self.table}: {mb(self.bytes_before):,.1f} MB -> {mb(self.bytes_after):,.1f} MB '
+                f'({self.saved_ratio:.0%} smaller, {len(self.converted)} col(s) in {self.seconds:.2f}s)')
+
+def _is_text(s: pd.Series) -> bool:
+    # Only columns holding nothing but str (and nulls) are converted, so ints, bytes or
+    # Decimals mixed into an object column keep their exact Python values
+    if pd.api.types.is_string_dtype(s.dtype) and not is_object_dtype(s.dtype):
+        return True
+    return is_object_dtype(s.dtype) and infer_dtype(s, skipna=True) in ('string', 'empty')
+
+def _text_target(s: pd.Series, kind: str | None, ratio: float) -> Optional[str]:
+    if not _is_text(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        return None
+    if kind is None:
+        n = len(s)
+        kind = 'category' if n and s.nunique(dropna=True) <= ratio * n else 'string'
+    if kind == 'category':
+        return 'category'
+    # 'str' is pandas 3's Arrow-backed string dtype (NaN for nulls, like the 'str' views); pandas 2
+    # would make it object, hence pandas>=3 in requirements.txt
+    return None if s.dtype == 'str' else 'str'
+
+def compact_frame(df: pd.DataFrame, spec: CompactionSpec | None = None, table: str = '') -> Tuple[pd.DataFrame, CompactionReport]:
+    """
+    Return a compacted copy of df and a report of its memory before and after.
+
+    Text columns become categoricals or Arrow-backed strings, integer columns are downcast and
+    the configured date columns are parsed to datetime64. Nulls stay nulls (NaN/NaT) and blank or
+    padded strings are kept as they are, so the checks' normalized views ('str', 'strip', 'blank',
+    'datetime', ...) give the same results as on the raw frame. Columns named in the spec but not
+    in df (e.g. dropped by a narrowed query) are ignored; float columns are left as they are.
+    """
+    spec = spec or {}
+    t0 = time.perf_counter()
+    before = int(df.memory_usage(deep=True, index=False).sum())
+    kinds: Dict[str, str] = {}
+    for kind in ('category', 'string', 'datetime'):
+        for col in spec.get(kind, ()) or ():
+            kinds[col] = kind
+    ratio = float(spec.get('category_ratio', DEFAULT_CATEGORY_RATIO))
+    downcast = bool(spec.get('downcast', True))
+
+    out: Dict[str, pd.Series] = {}
+    converted: Dict[str, str] = {}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        kind = kinds.get(col)
+        new = s
+        if kind == 'datetime':
+            if not pd.api.types.is_datetime64_any_dtype(s.dtype):
+                new = pd.to_datetime(s, errors='coerce')
+        elif is_integer_dtype(s.dtype) and not is_bool_dtype(s.dtype):
+            if downcast and kind is None:
+                new = pd.to_numeric(s, downcast='integer' if s.min() < 0 else 'unsigned') if len(s) else s
+        else:
+            target = _text_target(s, kind, ratio)
+            if target is not None:
+                new = s.astype(target)
+        if new.dtype != s.dtype:
+            converted[str(col)] = str(new.dtype)
+        out[i] = new
+    compacted = pd.DataFrame(out, copy=False)
+    compacted.columns = df.columns
+    compacted.index = df.index
+    after = int(compacted.memory_usage(deep=True, index=False).sum())
+    return compacted, CompactionReport(table, len(df), before, after, time.perf_counter() - t0, converted)
+
+def compact_tables(tables: Mapping[str, pd.DataFrame], specs: Mapping[str, CompactionSpec]) -> Tuple[Dict[str, pd.DataFrame], List[CompactionReport]]:
+    """compact_frame() for every table that has a spec; other tables are returned unchanged."""
+    out: Dict[str, pd.DataFrame] = {}
+    reports: List[CompactionReport] = []
+    for name, df in tables.items():
+        if name in specs:
+            out[name], report = compact_frame(df, specs[name], table=name)
+            reports.append(report)
+        else:
+            out[name] = df
+    return out, reports
@@ -1,11 +1,24 @@
 from __future__ import annotations
-from typing import Dict, List, Type
-import importlib, pkgutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Type
+import importlib, inspect, os, pkgutil, queue, threading, time, tracemalloc
+import numpy as np
 import pandas as pd
 import checks
 from checks.base import BaseCheck
-from models import Finding
-from check_logger import log_check_execution
+from models import Finding, FindingBatch
+from incremental import IncrementalStore
+from loading import Requirements, TableLoad, merge_requirements
+from partitioning import DEFAULT_PARTITION_KEY, PARTITIONS_PER_WORKER, SharedTables, partition_rows, worker_context
+from run_context import RunContext
+from registry import load_check
+from rules import RuleCheck, rule_checks
+from telemetry import CheckStats, CheckTimer, RunTelemetry
+from profiling import CheckProfile, Profiler
+
+if TYPE_CHECKING:
+    from sinks import FindingSink
 
 # Auto-import all modules under checks/ so subclasses are defined
 
@@ -13,30 +26,380 @@ def _auto_import_check_modules() -> None:
     for m in pkgutil.iter_modules(checks.__path__):
         importlib.import_module(f"{checks.__name__}.{m.name}")
 
-# Discover all checks as subclasses of BaseCheck
+def _all_subclasses(cls: type) -> Iterator[type]:
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _all_subclasses(sub)
+
+# Discover all checks as subclasses (at any depth) of BaseCheck that set their own check_id,
+# plus the rules compiled from the rules file (registry.RULES_PATH)
 
 def discover_checks() -> Dict[str, Type[BaseCheck]]:
     _auto_import_check_modules()
     found: Dict[str, Type[BaseCheck]] = {}
-    for cls in BaseCheck.__subclasses__():
-        cid = getattr(cls, 'check_id', None)
-        if cid:
+    for cls in _all_subclasses(BaseCheck):
+        cid = vars(cls).get('check_id')
+        # Compiled rule classes come from rule_checks() only, so stale compilations are never picked up
+        if cid and not inspect.isabstract(cls) and not issubclass(cls, RuleCheck):
             found[cid] = cls
+    for cid, cls in rule_checks().items():
+        if cid in found:
+            raise ValueError(f'Rule {cid} has the same id as the check {found[cid].__name__}')
+        found[cid] = cls
     return found
 
-# Run selected checks (if None, run them all)
+# Resolve selected ids to classes, importing only the selected check modules via the
+# registry manifest; ids it doesn't know (checks defined outside the package) fall back
+# to full discovery. No selection means every check.
 
-def run_selected_checks(tables: Dict[str, pd.DataFrame], selected_ids: List[str] | None = None) -> List[Finding]:
-    checks_map = discover_checks()
+def _resolve_checks(selected_ids: List[str] | None) -> List[Tuple[str, Type[BaseCheck]]]:
     if not selected_ids:
-        selected_ids = list(checks_map.keys())
-    findings: List[Finding] = []
+        return list(discover_checks().items())
+    resolved: List[Tuple[str, Type[BaseCheck]]] = []
+    discovered: Dict[str, Type[BaseCheck]] | None = None
     for cid in selected_ids:
-        cls = checks_map.get(cid)
-        if not cls:
-            continue
-        chk = cls()
-        check_findings = chk.run(tables)
-        findings.extend(check_findings)
-        log_check_execution(cid, len(check_findings))
-    return findings
+        cls = load_check(cid)
+        if cls is None:
+            discovered = discover_checks() if discovered is None else discovered
+            cls = discovered.get(cid)
+        if cls is not None:
+            resolved.append((cid, cls))
+    return resolved
+
+# Union of the tables/columns the selected checks read (None if any check doesn't declare them)
+
+def required_inputs(selected_ids: List[str] | None = None) -> Requirements:
+    return merge_requirements(*[cls().requires() or None for _, cls in _resolve_checks(selected_ids)])
+
+# Rows in the tables a check reads (all tables if it doesn't declare them)
+
+def _rows_read(chk: BaseCheck, tables: Dict[str, pd.DataFrame]) -> int:
+    names = list(chk.requires() or tables)
+    return sum(len(tables[n]) for n in names if n in tables)
+
+# Run one check in isolation and measure it where it runs (so CPU time is the worker's);
+# module-level so it can be shipped to a process pool. profile=True also returns its span
+# and, with cprofile, its cProfile stats.
+
+def _run_check(cls: Type[BaseCheck], tables: Dict[str, pd.DataFrame],
+               incremental: IncrementalStore | None = None, track_memory: bool = False,
+               profile: bool = False, cprofile: bool = False) -> Tuple[FindingBatch, CheckStats, CheckProfile | None]:
+    chk = cls()
+    prof = CheckProfile(cprofile) if profile else None
+    with CheckTimer(track_memory) as t:
+        if prof is not None:
+            with prof:
+                batch = incremental.run_check(chk, tables) if incremental is not None else chk.run_batch(tables)
+        else:
+            batch = incremental.run_check(chk, tables) if incremental is not None else chk.run_batch(tables)
+    stats = CheckStats(chk.check_id, t.started_at, t.wall_s, t.cpu_s, _rows_read(chk, tables), len(batch), t.peak_mem_bytes)
+    return batch, stats, prof
+
+# Build the key index of every reference key the checks join against, once per distinct
+# (table, column), before any check runs
+
+def _build_reference_indexes(ctx: RunContext, to_run: List[Tuple[str, Type[BaseCheck]]]) -> None:
+    keys = dict.fromkeys(key for _, cls in to_run for key in cls().reference_keys())
+    for table, column in keys:
+        if table in ctx and column in ctx[table].columns:
+            ctx.key_index(table, column)
+
+# The table a check can be partitioned on: its first table, if the check is row_local and
+# everything it reads (and the partition key) is there. None runs it on the whole tables.
+
+def _partition_table(chk: BaseCheck, ctx: RunContext, key: str) -> str | None:
+    req = chk.requires()
+    if not (chk.row_local and req):
+        return None
+    table = next(iter(req))
+    present = all(t in ctx and all(c in ctx[t].columns for c in cols) for t, cols in req.items())
+    return table if present and key in ctx[table].columns else None
+
+# Run row-local checks on one partition of their table in a worker process, against the
+# reference tables shared through partitioning.SharedTables; module-level for the pool
+
+def _run_partition(shared: Dict[str, str], table: str, part: pd.DataFrame, classes: List[Type[BaseCheck]],
+                   track_memory: bool = False, dates: Dict[str, pd.Series] | None = None) -> List[Tuple[FindingBatch, CheckStats]]:
+    ctx = worker_context(shared)
+    prev = dict.get(ctx, table)
+    ctx[table] = part
+    # Dates parsed over the whole column in the parent, so every partition reads the same format
+    for col, values in (dates or {}).items():
+        ctx.set_view(table, col, 'datetime', values)
+    try:
+        return [_run_check(cls, ctx, None, track_memory)[:2] for cls in classes]
+    finally:
+        if prev is None:
+            del ctx[table]
+        else:
+            ctx[table] = prev
+
+# mode='partitioned': yield (index in to_run, partition number, number of partitions, result)
+# per check and partition, in completion order (checks run whole are partition 0 of 1). Row-local checks run per partition
+# of their table (see partitioning.partition_rows) on a process pool; the rest run whole in
+# this process while the workers are busy.
+
+def _run_partitioned(ctx: RunContext, to_run: List[Tuple[str, Type[BaseCheck]]], track_memory: bool,
+                     profile: bool, cprofile: bool, max_workers: int | None, partitions: int | None,
+                     key: str) -> Iterator[Tuple[int, int, int, Tuple[FindingBatch, CheckStats, CheckProfile | None]]]:
+    groups: Dict[str, List[int]] = {}
+    whole: List[int] = []
+    for i, (_, cls) in enumerate(to_run):
+        table = _partition_table(cls(), ctx, key)
+        if table is None:
+            whole.append(i)
+        else:
+            groups.setdefault(table, []).append(i)
+    with ExitStack() as stack:
+        futures = {}
+        of: Dict[int, int] = {}
+        if groups:
+            workers = max_workers or os.cpu_count() or 1
+            refs = dict.fromkeys(t for idx in groups.values() for i in idx for t in list(to_run[i][1]().requires())[1:])
+            shared = stack.enter_context(SharedTables({t: ctx[t] for t in refs}))
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            for table, idx in groups.items():
+                classes = [to_run[i][1] for i in idx]
+                dates = {c: ctx.view(table, c, 'datetime') for cls in classes for c in cls().datetime_columns()
+                         if c in ctx[table].columns}
+                parts = [rows for rows in partition_rows(ctx.view(table, key, 'strip'), partitions or workers * PARTITIONS_PER_WORKER)
+                         if len(rows)] or [np.arange(0)]
+                of.update(dict.fromkeys(idx, len(parts)))
+                for n, rows in enumerate(parts):
+                    futures[pool.submit(_run_partition, shared.paths, table, ctx[table].take(rows), classes, track_memory,
+                                        {c: d.take(rows) for c, d in dates.items()})] = (idx, n)
+        _build_reference_indexes(ctx, [to_run[i] for i in whole])
+        for i in whole:
+            yield i, 0, 1, _run_check(to_run[i][1], ctx, None, track_memory, profile, cprofile)
+        for fut in as_completed(futures):
+            idx, n = futures[fut]
+            for i, (batch, stats) in zip(idx, fut.result()):
+                yield i, n, of[i], (batch, stats, None)
+
+# One result per check from its (partition number, result) pairs: findings are concatenated
+# in partition order whatever order the partitions finished in, stats add up across
+# partitions (wall and CPU time are the workers' total), rows_read is the check's whole input
+
+def _merge_partitions(numbered: List[Tuple[int, Tuple[FindingBatch, CheckStats, CheckProfile | None]]],
+                      rows_read: int) -> Tuple[FindingBatch, CheckStats, CheckProfile | None]:
+    parts = [result for _, result in sorted(numbered, key=lambda p: p[0])]
+    if len(parts) == 1:
+        return parts[0]
+    stats = [s for _, s, _ in parts]
+    peaks = [s.peak_mem_bytes for s in stats if s.peak_mem_bytes is not None]
+    merged = CheckStats(stats[0].check_id, min(s.started_at for s in stats), sum(s.wall_s for s in stats),
+                        sum(s.cpu_s for s in stats), rows_read, sum(s.findings for s in stats), max(peaks, default=None))
+    return FindingBatch.concat(b for b, _, _ in parts), merged, None
+
+# Tell every sink a check has completed (after all its partitions), with its finding count
+
+def _check_finished(sinks: Sequence[FindingSink], check_id: str, stats: CheckStats) -> None:
+    for sink in sinks:
+        sink.check_finished(check_id, stats.findings)
+
+# Record the run's per-check stats and profile, and concatenate its findings in to_run order
+
+def _finish_run(to_run: List[Tuple[str, Type[BaseCheck]]], results: List[Tuple[FindingBatch, CheckStats, CheckProfile | None]],
+                telemetry: RunTelemetry, profiler: Profiler | None, t0: float) -> FindingBatch:
+    if profiler:
+        profiler.add_span('check', None, t0, time.perf_counter())
+    for (cid, _), (batch, stats, prof) in zip(to_run, results):
+        stats.check_id = cid
+        telemetry.record(stats)
+        if profiler:
+            profiler.after_check(cid, batch, stats, prof)
+    telemetry.flush()
+    return FindingBatch.concat([batch for batch, _, _ in results])
+
+def _make_executor(mode: str, max_workers: int | None) -> Executor:
+    if mode == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='check')
+
+# Run selected checks (if None, run them all) and return one columnar FindingBatch
+#
+# mode='sequential' keeps the original one-after-another loop. 'thread' and 'process'
+# run the checks concurrently on a pool of max_workers; checks only read `tables`, so
+# they are independent. Findings are always returned in selected_ids order.
+# Per-check stats go to a RunTelemetry (default: checks.db + checks.csv) that is
+# flushed once at the end of the run; track_memory adds tracemalloc peak memory (except in
+# mode='thread', where concurrent checks would share one process-wide peak).
+# A Profiler gets a 'check' stage span, per-check spans (and cProfile stats if enabled)
+# and runs its pre/post-check hooks on the calling thread.
+# Each check's batch is pushed to every sink (see sinks.py) as soon as that check completes,
+# in completion order, then sink.check_finished() is called once per check (after its last
+# partition in partitioned runs, and for checks without findings); with keep_findings=False nothing is kept and an empty batch is returned,
+# so memory stays flat however many findings the run produces.
+# With an IncrementalStore, row-level checks only re-run rows that changed since the last run.
+# mode='partitioned' splits the table each row_local check validates into `partitions`
+# partitions by partition_key (default: 2 per worker; distinct keys are dealt round-robin,
+# see partitioning.partition_rows) and runs them on a process pool, with the reference tables
+# shared as memory-mapped Arrow files. A check's findings then come partition by partition,
+# in partition order, so the output is the same on every run. Columns the checks read as
+# dates (BaseCheck.datetime_columns) are parsed once here over the whole column, so the date
+# format is inferred as in the other modes. Other checks run whole. Not combinable with
+# incremental runs, and only whole checks get profile spans.
+# All checks share one RunContext, so normalized column views and reference key indexes
+# are built once per run and evicted when the run ends.
+
+def run_selected_batches(tables: Dict[str, pd.DataFrame], selected_ids: List[str] | None = None,
+                         mode: str = 'sequential', max_workers: int | None = None,
+                         incremental: IncrementalStore | None = None,
+                         telemetry: RunTelemetry | None = None, track_memory: bool = False,
+                         profiler: Profiler | None = None, sinks: Sequence[FindingSink] = (),
+                         keep_findings: bool = True, partitions: int | None = None,
+                         partition_key: str = DEFAULT_PARTITION_KEY) -> FindingBatch:
+    to_run = _resolve_checks(selected_ids)
+    if mode not in ('sequential', 'thread', 'process', 'partitioned'):
+        raise ValueError(f"Unknown execution mode: {mode!r} (expected 'sequential', 'thread', 'process' or 'partitioned')")
+    if mode == 'partitioned' and incremental is not None:
+        raise ValueError('Incremental runs cannot be partitioned')
+    telemetry = telemetry or RunTelemetry(mode=mode)
+    cprofile = bool(profiler and profiler.cprofile)
+    # cProfile can't profile several threads at once (3.12+), so profiled thread runs go sequential
+    sequential = mode == 'sequential' or max_workers == 1 or len(to_run) <= 1 or (mode == 'thread' and cprofile)
+    # tracemalloc's peak is per process, so it is only recorded where each process runs one
+    # check at a time (not for checks running concurrently on threads)
+    track_memory = (track_memory or bool(profiler and profiler.track_memory)) and (sequential or mode != 'thread')
+    opts = (incremental, track_memory, profiler is not None, cprofile)
+
+    ctx = RunContext.wrap(tables)
+    # Process workers start their own tracemalloc session; checks in this process share one
+    own_trace = track_memory and mode != 'process' and not tracemalloc.is_tracing()
+    if own_trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    results: List[Tuple[FindingBatch, CheckStats, CheckProfile | None]] = [None] * len(to_run)
+
+    def _collect(i: int, result: Tuple[FindingBatch, CheckStats, CheckProfile | None]) -> None:
+        batch, stats, prof = result
+        for sink in sinks:
+            sink.write(batch)
+        results[i] = result if keep_findings else (FindingBatch(), stats, prof)
+        _check_finished(sinks, to_run[i][0], stats)
+
+    try:
+        if mode == 'partitioned':
+            pieces: Dict[int, List[Tuple[int, Tuple[FindingBatch, CheckStats, CheckProfile | None]]]] = {}
+            if profiler:
+                for cid, _ in to_run:
+                    profiler.before_check(cid)
+            for i, n, of, (batch, stats, prof) in _run_partitioned(ctx, to_run, *opts[1:], max_workers, partitions, partition_key):
+                for sink in sinks:
+                    sink.write(batch)
+                pieces.setdefault(i, []).append((n, (batch if keep_findings else FindingBatch(), stats, prof)))
+                if len(pieces[i]) == of:
+                    results[i] = _merge_partitions(pieces.pop(i), _rows_read(to_run[i][1](), ctx))
+                    _check_finished(sinks, to_run[i][0], results[i][1])
+        elif sequential:
+            _build_reference_indexes(ctx, to_run)
+            for i, (cid, cls) in enumerate(to_run):
+                if profiler:
+                    profiler.before_check(cid)
+                _collect(i, _run_check(cls, ctx, *opts))
+        else:
+            # Process workers get the tables only and build their own indexes
+            if mode != 'process':
+                _build_reference_indexes(ctx, to_run)
+            with _make_executor(mode, max_workers) as pool:
+                futures = {}
+                for i, (cid, cls) in enumerate(to_run):
+                    if profiler:
+                        profiler.before_check(cid)
+                    futures[pool.submit(_run_check, cls, ctx, *opts)] = i
+                for fut in as_completed(futures):
+                    _collect(futures[fut], fut.result())
+    finally:
+        ctx.clear_views()
+        if own_trace:
+            tracemalloc.stop()
+
+    return _finish_run(to_run, results, telemetry, profiler, t0)
+
+# Pipelined run: start each check as soon as the tables it reads have loaded, instead of
+# loading every table first. loads yields TableLoads in completion order (e.g.
+# loading.iter_required_loads) and is consumed on its own thread; on_loaded(load) is called
+# on the calling thread for each one, before the checks waiting on it start. Checks run on a
+# thread pool of max_workers while the other tables are still loading, so a run takes about
+# the slowest load plus the slowest check that reads it, and sinks receive each check's
+# findings as it completes. Checks that don't declare requires() wait for every table;
+# checks whose tables never arrive run last (and report them missing). incremental,
+# telemetry, profiler, sinks and keep_findings work as in run_selected_batches, and
+# findings are returned in selected_ids order. A failed load cancels the checks not yet
+# started and is re-raised.
+
+def run_pipelined(loads: Iterable[TableLoad], selected_ids: List[str] | None = None, max_workers: int | None = None,
+                  incremental: IncrementalStore | None = None, telemetry: RunTelemetry | None = None,
+                  track_memory: bool = False, profiler: Profiler | None = None, sinks: Sequence[FindingSink] = (),
+                  keep_findings: bool = True, on_loaded: Callable[[TableLoad], None] | None = None) -> FindingBatch:
+    to_run = _resolve_checks(selected_ids)
+    telemetry = telemetry or RunTelemetry(mode='pipelined')
+    # cProfile can't profile several threads at once (3.12+), so pipelined runs record spans only;
+    # checks and loads share the process, so neither are tracemalloc peaks (track_memory is ignored)
+    opts = (incremental, False, profiler is not None, False)
+    ctx = RunContext()
+    # Tables each check still waits for (None: every table)
+    waiting: Dict[int, set | None] = {i: set(cls().requires()) or None for i, (_, cls) in enumerate(to_run)}
+    results: List[Tuple[FindingBatch, CheckStats, CheckProfile | None]] = [None] * len(to_run)
+    events: queue.Queue = queue.Queue()
+
+    def _feed() -> None:
+        # Loads and check completions arrive on one queue, so neither waits for the other
+        try:
+            for load in loads:
+                events.put(('table', load))
+            events.put(('loaded', None))
+        except BaseException as e:
+            events.put(('error', e))
+
+    t0 = time.perf_counter()
+    running = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='check') as pool:
+            def _start(all_loaded: bool) -> None:
+                nonlocal running
+                for i in [i for i, need in waiting.items() if all_loaded or (need is not None and need <= ctx.keys())]:
+                    del waiting[i]
+                    cid, cls = to_run[i]
+                    if profiler:
+                        profiler.before_check(cid)
+                    running += 1
+                    fut = pool.submit(_run_check, cls, ctx, *opts)
+                    fut.add_done_callback(lambda f, i=i: events.put(('check', (i, f))))
+
+            threading.Thread(target=_feed, name='pipeline-load', daemon=True).start()
+            loading = True
+            try:
+                while loading or running:
+                    kind, item = events.get()
+                    if kind == 'table':
+                        ctx[item.name] = item.frame
+                        if on_loaded:
+                            on_loaded(item)
+                        _start(False)
+                    elif kind == 'loaded':
+                        loading = False
+                        _start(True)
+                    elif kind == 'error':
+                        raise item
+                    else:
+                        i, fut = item
+                        running -= 1
+                        batch, stats, prof = fut.result()
+                        for sink in sinks:
+                            sink.write(batch)
+                        results[i] = (batch, stats, prof) if keep_findings else (FindingBatch(), stats, prof)
+                        _check_finished(sinks, to_run[i][0], stats)
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+    finally:
+        ctx.clear_views()
+
+    return _finish_run(to_run, results, telemetry, profiler, t0)
+
+# List-of-Finding form of run_selected_batches, kept for existing callers
+
+def run_selected_checks(tables: Dict[str, pd.DataFrame], selected_ids: List[str] | None = None,
+                        mode: str = 'sequential', max_workers: int | None = None) -> List[Finding]:
+    return run_selected_batches(tables, selected_ids, mode=mode, max_workers=max_workers).to_findings()
@@ -3,17 +3,40 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
+import importlib
 import threading
-import pandas as pd
+import time
 import os
 
 import checks  # ensure package exists
-from engine import discover_checks, run_selected_checks
-from io_odbc import load_dataset_odbc
-from reporting import findings_to_dataframe, build_output, export_findings_excel
+import registry
 import sql_defs
 
+# pandas, pyodbc/pyarrow and the check modules are imported on first use (or by a background
+# preload once the window is up), so the window doesn't wait for them at startup
+if TYPE_CHECKING:
+    import pandas as pd
+    from incremental import IncrementalStore
+    from loading import TableLoad
+    from profiling import Profiler
+    from reporting import AssetIndex
+    from snapshot_cache import SnapshotCache
+
+_PRELOAD_MODULES = ('pandas', 'engine', 'loading', 'reporting', 'incremental', 'snapshot_cache')
+
+def _preload_modules() -> None:
+    for name in _PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass  # surfaced properly when the module is actually needed
+
+# Worker threads used to run selected checks concurrently (None = executor default)
+CHECK_WORKERS: int | None = None
+# If set, each run's stage/check timing spans are written here as a Chrome trace (flame chart)
+PROFILE_TRACE: str | None = os.environ.get('MAYRISE_PROFILE_TRACE') or None
+
 class App(tk.Tk):
     """Main GUI application for Mayrise PFI Data Verification."""
     
@@ -26,7 +49,15 @@ class App(tk.Tk):
         # State
         self.conn_str = tk.StringVar(value='DSN=TYNESQL;Trusted_Connection=Yes;')
         self.check_vars: Dict[str, tk.BooleanVar] = {}
+        self.use_cache = tk.BooleanVar(value=True)
+        self.refresh_cache = tk.BooleanVar(value=False)
+        self.offline = tk.BooleanVar(value=False)
+        self.snapshot_cache: SnapshotCache | None = None
+        self.incremental = tk.BooleanVar(value=False)
+        self.incremental_store: IncrementalStore | None = None
+        self.profiler: Profiler | None = None
         self.assets_df: pd.DataFrame | None = None
+        self.asset_index: AssetIndex | None = None
         self.tables: Dict[str, pd.DataFrame] = {}
         self.output_df: pd.DataFrame | None = None
         self.progress_value = tk.DoubleVar(value=0.0)
@@ -36,6 +67,7 @@ class App(tk.Tk):
 
         self._build_ui()
         self._populate_checks()
+        self.after(200, lambda: threading.Thread(target=_preload_modules, daemon=True).start())
 
     def _build_ui(self):
         # Connection frame
@@ -43,6 +75,11 @@ class App(tk.Tk):
         frm_conn.pack(fill='x', padx=10, pady=10)
         tk.Label(frm_conn, text='Connection string:').grid(row=0, column=0, sticky='w')
         tk.Entry(frm_conn, textvariable=self.conn_str, width=120).grid(row=0, column=1, padx=8, pady=5, sticky='we')
+        frm_cache = tk.Frame(frm_conn); frm_cache.grid(row=1, column=1, sticky='w', padx=8, pady=(0,5))
+        tk.Checkbutton(frm_cache, text='Use local snapshot cache', variable=self.use_cache).pack(side='left')
+        tk.Checkbutton(frm_cache, text='Force refresh', variable=self.refresh_cache).pack(side='left', padx=8)
+        tk.Checkbutton(frm_cache, text='Offline (last snapshot)', variable=self.offline).pack(side='left')
+        tk.Checkbutton(frm_cache, text='Incremental (re-check changed rows only)', variable=self.incremental).pack(side='left', padx=8)
         frm_conn.grid_columnconfigure(1, weight=1)
 
         # Middle area: checks + log
@@ -87,12 +124,16 @@ class App(tk.Tk):
         self._log('Ready. (Option A simplified engine with GUI)')
 
     def _populate_checks(self):
-        """Auto-discover checks from engine and populate checkboxes."""
-        checks_map = discover_checks()
-        for cid, cls in sorted(checks_map.items()):
+        """Populate checkboxes from the check registry manifest (check modules are not imported)."""
+        try:
+            infos = registry.list_checks()
+        except ValueError as e:
+            # e.g. a rule in the rules file with the id of a Python check
+            messagebox.showerror('Error', f'Failed to list checks:\n{e}'); return
+        for cid, info in sorted(infos.items()):
             var = tk.BooleanVar(value=True)
             self.check_vars[cid] = var
-            tk.Checkbutton(self.checks_container, text=f"{cid} - {cls.name}", variable=var, anchor='w').pack(fill='x', padx=8, pady=2)
+            tk.Checkbutton(self.checks_container, text=f"{cid} - {info.name}", variable=var, anchor='w').pack(fill='x', padx=8, pady=2)
 
     # -------------- Logging & progress helpers --------------
     def _log(self, msg: str):
@@ -159,37 +200,75 @@ class App(tk.Tk):
         if not selected_ids:
             messagebox.showwarning('No checks', 'Please select at least one check to run.'); return
         self._log('Starting run with static SQL...'); self._log(f"Selected checks: {', '.join(selected_ids)}")
-        threading.Thread(target=self._run_worker, args=(conn, selected_ids), daemon=True).start()
+        from loading import default_loader
+        loader = default_loader()
+        if self.use_cache.get() or self.offline.get():
+            from snapshot_cache import SnapshotCache
+            self.snapshot_cache = self.snapshot_cache or SnapshotCache()
+            loader = self.snapshot_cache.wrap(loader, refresh=self.refresh_cache.get(), offline=self.offline.get())
+        incremental = None
+        if self.incremental.get():
+            from incremental import IncrementalStore
+            self.incremental_store = incremental = self.incremental_store or IncrementalStore()
+        threading.Thread(target=self._run_worker, args=(conn, selected_ids, loader, incremental), daemon=True).start()
 
-    def _run_worker(self, conn: str, selected_ids: list[str]):
+    def _run_worker(self, conn: str, selected_ids: list[str], loader=None, incremental: IncrementalStore | None = None):
         """Background worker: load data, run checks, generate findings."""
+        from engine import required_inputs, run_pipelined
+        from loading import iter_required_loads, merge_requirements
+        from profiling import Profiler
+        from reporting import OUTPUT_ASSET_COLS, AssetEnricher, AssetIndex
+        from sinks import DeferredSink, FrameSink
         self._set_running(True); self._set_progress(0, 'Connecting and loading data...')
+        profiler = self.profiler = Profiler()
         try:
-            # Load assets table
-            self._log('Loading ASSETS...')
-            assets_df = load_dataset_odbc(conn, sql_defs.ALL_TABLE_SQL['ASSETS'])
-            for col in ('UNITID','UNITNO','STREET'):
-                if col not in assets_df.columns: raise ValueError(f"ASSETS SQL must return column '{col}'")
-            self.assets_df = assets_df
-            self._set_progress(25, f'Loaded assets: {len(assets_df):,} rows')
-
-            # Load all other tables
-            tables: Dict[str, pd.DataFrame] = {'ASSETS': assets_df}
-            for name, sql in sql_defs.ALL_TABLE_SQL.items():
-                if name == 'ASSETS': continue
-                self._log(f'Loading {name}...')
-                df = load_dataset_odbc(conn, sql); tables[name] = df
-                self._log(f'{name}: {len(df):,} rows, {len(df.columns)} cols')
+            # Load only the tables/columns the selected checks read (plus the ASSETS output columns),
+            # concurrently, each on its own connection; each check starts as soon as its tables are in
+            required = merge_requirements(required_inputs(selected_ids), {'ASSETS': list(OUTPUT_ASSET_COLS)})
+            needed = [t for t in sql_defs.ALL_TABLE_SQL if required is None or t in required]
+            skipped = [t for t in sql_defs.ALL_TABLE_SQL if t not in needed]
+            self._log(f"Loading {', '.join(needed)}..." + (f" (skipping {', '.join(skipped)})" if skipped else ''))
+            # Output rows are built as each check completes, once ASSETS is there to enrich them
+            output = FrameSink()
+            deferred = DeferredSink(output)
+            tables = {}
+            loaded_at = t0 = time.perf_counter()
+            def _on_progress(load: TableLoad, done: int, total: int):
+                nonlocal loaded_at
+                loaded_at = time.perf_counter()
+                profiler.add_finished('load', load.name, load.seconds)
+                self._log(f'{load.name}: {len(load.frame):,} rows, {len(load.frame.columns)} cols in {load.seconds:.1f}s')
+                if load.compaction is not None:
+                    self._log('  Compacted ' + load.compaction.summary())
+                self._set_progress(45 * done / total, f'Loaded {done}/{total} tables, running checks...')
+            def _on_loaded(load: TableLoad):
+                tables[load.name] = load.frame
+                if load.name == 'ASSETS':
+                    for col in OUTPUT_ASSET_COLS:
+                        if col not in load.frame.columns: raise ValueError(f"ASSETS SQL must return column '{col}'")
+                    self.asset_index = AssetIndex(load.frame)  # built once per load, reused by every enrichment
+                    deferred.release(AssetEnricher(self.asset_index, OUTPUT_ASSET_COLS))
+            run_pipelined(iter_required_loads(conn, required, loader=loader, progress=_on_progress), selected_ids,
+                          max_workers=CHECK_WORKERS, incremental=incremental, profiler=profiler, sinks=[deferred],
+                          keep_findings=False, on_loaded=_on_loaded)
+            deferred.close()
+            # The load and check stages overlap, so they add up to more than the run took
+            profiler.add_span('load', None, t0, loaded_at)
+            if 'ASSETS' not in tables: raise ValueError('ASSETS was not loaded')
+            self.assets_df = tables['ASSETS']
             self.tables = tables
-            self._set_progress(45, 'Running checks...')
-
-            # Execute checks and build output
-            findings = run_selected_checks(self.tables, selected_ids)
+            if incremental is not None:
+                for cid, st in incremental.last_stats.items():
+                    if cid in selected_ids:
+                        self._log(f"{cid}: re-checked {st['rechecked']:,}/{st['rows']:,} rows, carried forward {st['carried']:,} findings")
             self._set_progress(85, 'Building output...')
-            fdf = findings_to_dataframe(findings)
-            self.output_df = build_output(fdf, self.assets_df, asset_cols=("UNITID","UNITNO","STREET"))
+            with profiler.span('reporting'):
+                self.output_df = output.frame(check_order=selected_ids)
             self._set_progress(100, f'Complete. Findings: {len(self.output_df):,}')
             self._log(f'Run complete. Total findings: {len(self.output_df):,}')
+            self._log('Timing breakdown:\n' + '\n'.join(profiler.breakdown_lines()))
+            if PROFILE_TRACE:
+                profiler.dump_trace(PROFILE_TRACE); self._log(f'Timing trace written to {PROFILE_TRACE}')
             self.after(0, lambda: messagebox.showinfo('Completed', f'Checks complete. Findings: {len(self.output_df):,}'))
         except Exception as e:
             self._set_progress(0, 'Idle'); self._log(f'ERROR: {e}')
@@ -199,36 +278,13 @@ class App(tk.Tk):
 
     # -------------- Results grid --------------
     def show_results_grid(self):
-        """Display findings in a new Treeview window."""
+        """Display findings in a virtualized grid window (only visible rows are materialized)."""
         if self._is_running:
             self._log('Busy: wait for the current run to finish.'); return
         if self.output_df is None or self.output_df.empty:
             messagebox.showinfo('No results', 'No findings to display. Run checks first, or results are empty.'); return
-        win = tk.Toplevel(self)
-        win.title(f'Results grid - {len(self.output_df):,} rows')
-        win.geometry('1120x560')
-        bar = tk.Frame(win); bar.pack(fill='x')
-        tk.Label(bar, text=f"Rows: {len(self.output_df):,}").pack(side='left', padx=8, pady=6)
-        container = tk.Frame(win); container.pack(fill='both', expand=True)
-        columns = list(self.output_df.columns)
-        tv = ttk.Treeview(container, columns=columns, show='headings', height=20)
-        vsb = tk.Scrollbar(container, orient='vertical', command=tv.yview)
-        hsb = tk.Scrollbar(container, orient='horizontal', command=tv.xview)
-        tv.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        for col in columns:
-            tv.heading(col, text=col); tv.column(col, width=150, anchor='w')
-        for _, row in self.output_df.iterrows():
-            values = [str(x) if x is not None else '' for x in row.tolist()]; tv.insert('', 'end', values=values)
-        tv.grid(row=0, column=0, sticky='nsew'); vsb.grid(row=0, column=1, sticky='ns'); hsb.grid(row=1, column=0, sticky='ew')
-        container.grid_rowconfigure(0, weight=1); container.grid_columnconfigure(0, weight=1)
-        # Auto-size columns based on sample data
-        try:
-            sample = self.output_df.head(200)
-            for col in columns:
-                maxlen = max([len(str(x)) for x in sample[col].tolist()] + [len(col)])
-                tv.column(col, width=min(380, max(100, int(maxlen*7))))
-        except Exception:
-            pass
+        from results_grid import ResultsGrid
+        ResultsGrid(self, self.output_df)
 
     # -------------- Export --------------
     def export_excel(self):
@@ -239,9 +295,27 @@ class App(tk.Tk):
             messagebox.showwarning('No results', 'Run checks first.'); return
         out = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel Workbook','*.xlsx')])
         if out:
-            try:
-                self._log(f'Exporting findings to Excel: {out}')
-                export_findings_excel(self.output_df, out)
-                self._log('Export complete.'); messagebox.showinfo('Exported', f'Exported to:\n{out}')
-            except Exception as e:
-                self._log(f'ERROR during export: {e}'); messagebox.showerror('Error', f'Export failed:\n{e}')
+            self._log(f'Exporting findings to Excel: {out}')
+            threading.Thread(target=self._export_worker, args=(self.output_df, out), daemon=True).start()
+
+    def _export_worker(self, output_df: pd.DataFrame, out: str):
+        """Background worker: stream findings to Excel, reporting progress."""
+        from reporting import EXCEL_MAX_ROWS, export_findings_excel
+        self._set_running(True); self._set_progress(0, 'Exporting to Excel...')
+        try:
+            t0 = time.perf_counter()
+            def _on_progress(done: int, total: int):
+                self._set_progress(100 * done / max(total, 1), f'Exported {done:,}/{total:,} rows')
+            export_findings_excel(output_df, out, progress=_on_progress)
+            seconds = time.perf_counter() - t0
+            if self.profiler is not None:
+                self.profiler.add_finished('export', None, seconds)
+            sheets = -(-len(output_df) // (EXCEL_MAX_ROWS - 1)) or 1
+            self._log(f'Export complete in {seconds:.1f}s' + (f' ({sheets} Findings sheets).' if sheets > 1 else '.'))
+            self._set_progress(100, f'Exported {len(output_df):,} rows')
+            self.after(0, lambda: messagebox.showinfo('Exported', f'Exported to:\n{out}'))
+        except Exception as e:
+            self._log(f'ERROR during export: {e}'); self._set_progress(0, 'Idle')
+            self.after(0, lambda e=e: messagebox.showerror('Error', f'Export failed:\n{e}'))
+        finally:
+            self._set_running(False)
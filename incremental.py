@@ -0,0 +1,127 @@
+# Incremental validation: re-run row-level checks only on rows that changed since the last run
+from __future__ import annotations
+from typing import Dict, List, Optional
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from checks.base import BaseCheck, Tables
+from models import FindingBatch
+
+# Default directory for per-check fingerprints and findings
+DEFAULT_STATE_DIR = '.incremental'
+
+def _row_hashes(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    # One uint64 per row over exactly the columns the check reads
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+def _table_digest(df: pd.DataFrame, cols: List[str]) -> str:
+    # Order-insensitive digest of a reference table's used columns
+    return hashlib.sha1(np.sort(_row_hashes(df, cols)).tobytes()).hexdigest()
+
+class IncrementalStore:
+    """
+    Persists, per check, a fingerprint of every row it validated plus the findings it produced.
+
+    On the next run a row_local check is re-run only on rows whose key (UNITID) is new or whose
+    used columns changed; findings for unchanged keys are carried forward. Rows whose key is
+    null, blank or repeated are always re-checked. A check is run in full (and its state
+    rebuilt) when there is no usable state, its requires(), config_token() or cache_token()
+    changed, or any of its reference tables changed. Checks that are not row_local, or do not
+    declare requires(), always run in full.
+
+    Carried-forward findings come first, followed by the findings of re-checked rows, so the
+    order can differ from a full run.
+    """
+
+    def __init__(self, state_dir: str = DEFAULT_STATE_DIR, key_col: str = 'UNITID'):
+        """
+        Args:
+            state_dir: Directory holding one state file per check
+            key_col: Column identifying a row across runs
+        """
+        self.state_dir = state_dir
+        self.key_col = key_col
+        # check_id -> {'rows': total rows, 'rechecked': rows re-run, 'carried': findings carried forward}
+        self.last_stats: Dict[str, Dict[str, int]] = {}
+
+    def _path(self, check_id: str) -> str:
+        return os.path.join(self.state_dir, f'{check_id}.pkl')
+
+    def _load(self, check_id: str) -> Optional[dict]:
+        path = self._path(check_id)
+        return pd.read_pickle(path) if os.path.isfile(path) else None
+
+    def _save(self, check_id: str, state: dict) -> None:
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self._path(check_id) + '.tmp'
+        pd.to_pickle(state, tmp)
+        os.replace(tmp, self._path(check_id))
+
+    def reset(self, check_id: str | None = None) -> None:
+        """Forget the stored state of one check (or of every check)."""
+        if check_id is not None:
+            if os.path.isfile(self._path(check_id)):
+                os.remove(self._path(check_id))
+            return
+        if os.path.isdir(self.state_dir):
+            for fname in os.listdir(self.state_dir):
+                if fname.endswith('.pkl'):
+                    os.remove(os.path.join(self.state_dir, fname))
+
+    def run_check(self, check: BaseCheck, tables: Tables) -> FindingBatch:
+        """Run check incrementally against tables, updating its stored state."""
+        cid = check.check_id
+        req = check.requires()
+        usable = (check.row_local and req
+                  and all(t in tables and all(c in tables[t].columns for c in cols) for t, cols in req.items()))
+        primary = next(iter(req), None)
+        if not usable or self.key_col not in req[primary]:
+            # Unknown inputs, missing tables/columns (dataset-level findings) or no key: run in full
+            self.reset(cid)
+            batch = check.run_batch(tables)
+            self.last_stats[cid] = {'rows': len(tables.get(primary, ())), 'rechecked': len(tables.get(primary, ())), 'carried': 0}
+            return batch
+
+        df = tables[primary]
+        cols = req[primary]
+        keys = df[self.key_col].astype(str).str.strip()
+        # Rows whose key is null, blank or repeated can't be matched across runs one to one
+        unmatched = (df[self.key_col].isna() | keys.eq('') | keys.duplicated(keep=False)).to_numpy()
+        hashes = _row_hashes(df, cols)
+        context = repr((req, check.config_token(), check.cache_token(),
+                        {t: _table_digest(tables[t], c) for t, c in req.items() if t != primary}))
+
+        prev = self._load(cid)
+        if prev is None or prev['context'] != context:
+            rerun = np.ones(len(df), dtype=bool)
+            changed: set = set()
+        else:
+            cur_pairs = pd.MultiIndex.from_arrays([keys.to_numpy(), hashes])
+            prev_pairs = pd.MultiIndex.from_arrays([prev['keys'], prev['hashes']])
+            new_rows = ~cur_pairs.isin(prev_pairs)
+            gone_rows = ~prev_pairs.isin(cur_pairs)
+            # Keys that were repeated last time may carry several rows' findings; re-check them too
+            prev_dup = pd.Series(prev['keys']).duplicated(keep=False).to_numpy()
+            changed = set(keys[new_rows]) | set(prev['keys'][gone_rows | prev_dup])
+            # Rows without a usable key are always re-checked, and their old findings dropped
+            rerun = keys.isin(changed).to_numpy() | unmatched
+
+        if rerun.all():
+            batch = check.run_batch(tables)
+            carried = FindingBatch()
+        else:
+            delta_tables = dict(tables)
+            delta_tables[primary] = df[rerun]
+            batch = check.run_batch(delta_tables)
+            # Carry forward findings of keys that are still present and unchanged
+            unchanged = set(keys[~rerun])
+            prev_frame = prev['findings']
+            keep = prev_frame['unitid'].astype(str).str.strip().isin(unchanged)
+            carried = FindingBatch(prev_frame[keep])
+        result = FindingBatch.concat([carried, batch])
+
+        self._save(cid, {'context': context, 'keys': keys.to_numpy(), 'hashes': hashes,
+                         'findings': result.frame.reset_index(drop=True)})
+        self.last_stats[cid] = {'rows': len(df), 'rechecked': int(rerun.sum()), 'carried': len(carried)}
+        return result
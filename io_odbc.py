@@ -1,33 +1,142 @@
 # Module for reading data from ODBC-compliant databases
 from __future__ import annotations
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
-import pyodbc
+
+# Rows fetched per cursor.fetchmany() round trip when streaming; large enough to keep
+# driver round trips cheap, small enough that one batch is a small fraction of a big table
+DEFAULT_CHUNKSIZE = 20_000
+
+def _connect(conn_str: str):
+    # pyodbc is imported on first use so the streaming helpers below work with any
+    # DB-API connection (and the module imports without the ODBC driver manager)
+    import pyodbc
+    return pyodbc.connect(conn_str)
+
+def _column_buffer(values: Sequence[Any]) -> pd.Series:
+    """Turn one column of a fetched batch into a typed 1-D buffer (int/float/datetime/str)."""
+    first = next((v for v in values if v is not None), None)
+    # DECIMAL/NUMERIC columns arrive as Decimal objects; store them as floats like read_sql(coerce_float=True)
+    if isinstance(first, Decimal):
+        return pd.Series(values, dtype='float64')
+    return pd.Series(values)
+
+def _rows_to_columns(rows: Sequence[Sequence[Any]], n_cols: int) -> List[pd.Series]:
+    """Transpose a batch of row tuples straight into one independent buffer per column."""
+    if not rows:
+        return [pd.Series([], dtype=object) for _ in range(n_cols)]
+    return [_column_buffer(col) for col in zip(*rows)]
+
+def _frame_from_columns(columns: Sequence[str], buffers: Sequence[pd.Series]) -> pd.DataFrame:
+    # Positional keys first so duplicate column names from joins survive
+    df = pd.DataFrame({i: buf for i, buf in enumerate(buffers)}, copy=False)
+    df.columns = list(columns)
+    return df
+
+def _iter_column_batches(conn, sql: str, chunksize: int) -> Iterator[Tuple[List[str], List[pd.Series]]]:
+    # Pull rows with cursor.fetchmany (cursor.arraysize set to match) and transpose each
+    # batch directly into typed per-column buffers
+    cursor = conn.cursor()
+    try:
+        cursor.arraysize = chunksize
+        cursor.execute(sql)
+        columns = [d[0] for d in cursor.description]
+        fetched = False
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            fetched = True
+            yield columns, _rows_to_columns(rows, len(columns))
+            del rows
+        # An empty result still yields one empty batch so callers see the column names
+        if not fetched:
+            yield columns, _rows_to_columns([], len(columns))
+    finally:
+        cursor.close()
+
+def _align_null_parts(col_parts: List[pd.Series]) -> List[pd.Series]:
+    # A batch in which a column is entirely NULL is typed object; cast it to the column's
+    # real dtype so one all-NULL batch does not turn a float/datetime/str column into object.
+    # Only into dtypes that can hold the NULLs: ints become float64 (as read_sql does) and
+    # BIT/bool columns nullable boolean, instead of the NULLs being cast to False.
+    dtype = next((p.dtype for p in col_parts if not p.isna().all()), None)
+    if dtype is None:
+        return col_parts
+    if pd.api.types.is_bool_dtype(dtype):
+        return [p.astype('boolean') for p in col_parts]
+    if pd.api.types.is_integer_dtype(dtype):
+        dtype = 'float64'
+    elif isinstance(dtype, np.dtype) and dtype.kind not in 'fmMO':
+        return col_parts
+    return [p.astype(dtype) if p.dtype == object and p.isna().all() else p for p in col_parts]
+
+def _concat_column_batches(batches: Iterable[Tuple[List[str], List[pd.Series]]]) -> pd.DataFrame:
+    # Each column's chunk buffers are independent of the other columns, so the final columns
+    # are assembled one at a time and their chunk buffers released as soon as each is built.
+    # Peak memory stays near the size of the final table instead of the 2x of concatenating
+    # whole chunk DataFrames at the end.
+    columns: List[str] | None = None
+    parts: List[List[pd.Series]] = []
+    for columns, buffers in batches:
+        if not parts:
+            parts = [[] for _ in columns]
+        for i, buf in enumerate(buffers):
+            parts[i].append(buf)
+    if columns is None:
+        return pd.DataFrame()
+    built: List[pd.Series] = []
+    for i in range(len(columns)):
+        col_parts, parts[i] = parts[i], []
+        built.append(col_parts[0] if len(col_parts) == 1 else pd.concat(_align_null_parts(col_parts), ignore_index=True))
+        del col_parts
+    return _frame_from_columns(columns, built)
+
+def iter_query_chunks(conn, sql: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Execute SQL on an open DB-API connection and yield the result as DataFrame chunks.
+
+    Args:
+        conn: Open DB-API 2.0 connection (pyodbc, sqlite3, ...)
+        sql: SQL query to execute
+        chunksize: Rows per cursor.fetchmany() batch and per yielded chunk
+
+    An empty result yields a single empty chunk carrying the column names.
+    """
+    for columns, buffers in _iter_column_batches(conn, sql, chunksize):
+        yield _frame_from_columns(columns, buffers)
+
+def read_query_chunked(conn, sql: str, chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Execute SQL on an open DB-API connection, streaming it in batches into a single DataFrame."""
+    return _concat_column_batches(_iter_column_batches(conn, sql, chunksize))
+
+def iter_dataset_odbc(conn_str: str, sql: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Open an ODBC connection and stream the query result as DataFrame chunks (see iter_query_chunks)."""
+    with _connect(conn_str) as conn:
+        yield from iter_query_chunks(conn, sql, chunksize)
 
 def load_dataset_odbc(conn_str: str, sql: str, chunksize: Optional[int] = None) -> pd.DataFrame:
     """
     Execute SQL query against an ODBC database and return results as a DataFrame.
-    
+
     Args:
         conn_str: Connection string for ODBC database (e.g., "Driver={SQL Server};...")
         sql: SQL query to execute
         chunksize: Optional chunk size for reading large datasets in memory-efficient batches.
-                   If None, reads entire dataset at once. If specified, reads and concatenates
-                   data in chunks to reduce memory usage for large tables.
-    
+                   If None, reads entire dataset at once. If specified, streams the result with
+                   cursor.fetchmany(chunksize) into per-column buffers, so peak memory stays close
+                   to the size of the final DataFrame.
+
     Returns:
         DataFrame containing the query results. Returns empty DataFrame if no results or chunksize
         processing yields no chunks.
     """
     # Establish ODBC connection using context manager to ensure proper cleanup
-    with pyodbc.connect(conn_str) as conn:
-        # If chunksize is specified, read data in chunks for memory efficiency
-        #if chunksize:
-        #    parts = []
-        #    # Read SQL query in chunks and accumulate them in a list
-        #    for chunk in pd.read_sql(sql, conn, chunksize=chunksize):
-        #        parts.append(chunk)
-        #    # Concatenate all chunks into a single DataFrame, resetting index; return empty DataFrame if no chunks
-        #    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
-        ## If no chunksize specified, read entire query result into memory at once
+    with _connect(conn_str) as conn:
+        # If chunksize is specified, stream the data in chunks for memory efficiency
+        if chunksize:
+            return read_query_chunked(conn, sql, chunksize)
+        # If no chunksize specified, read entire query result into memory at once
         return pd.read_sql(sql, conn)
@@ -0,0 +1,189 @@
+# Loading of the registered source tables, independent of the GUI so headless runners can use it
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+import re
+import time
+import pandas as pd
+from compaction import CompactionReport, CompactionSpec, compact_frame
+from io_odbc import DEFAULT_CHUNKSIZE, load_dataset_odbc
+import sql_defs
+
+# Callable used to fetch one table: (conn_str, sql) -> DataFrame
+Loader = Callable[[str, str], pd.DataFrame]
+
+@dataclass(frozen=True)
+class TableLoad:
+    """One table that finished loading, with how long the load took (compaction included)."""
+    name: str
+    frame: pd.DataFrame
+    seconds: float
+    compaction: Optional[CompactionReport] = None
+
+def default_loader(chunksize: Optional[int] = DEFAULT_CHUNKSIZE) -> Loader:
+    """Streaming ODBC loader; each call opens its own connection."""
+    def _load(conn_str: str, sql: str) -> pd.DataFrame:
+        return load_dataset_odbc(conn_str, sql, chunksize=chunksize)
+    return _load
+
+# Tables/columns read by a set of checks: {table: [columns]}; None means "everything"
+Requirements = Optional[Dict[str, List[str]]]
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_SELECT_STAR = re.compile(r'select\s+\*', re.IGNORECASE)
+
+def merge_requirements(*reqs: Requirements) -> Requirements:
+    """Union of several requirement dicts; None (unknown) anywhere makes the result None."""
+    out: Dict[str, List[str]] = {}
+    for req in reqs:
+        if req is None:
+            return None
+        for table, cols in req.items():
+            merged = out.setdefault(table, [])
+            merged.extend(c for c in cols if c not in merged)
+    return out
+
+def narrow_select_star(sql: str, columns: List[str]) -> str:
+    """
+    Replace the innermost 'SELECT *' of sql with an explicit column list.
+
+    For openquery() wrappers the innermost SELECT * is the remote query, so the narrowing
+    happens on the linked server. SQL without SELECT *, or column names that are not plain
+    identifiers, is returned unchanged.
+    """
+    matches = list(_SELECT_STAR.finditer(sql))
+    if not matches or not columns or not all(_IDENTIFIER.match(c) for c in columns):
+        return sql
+    last = matches[-1]
+    return sql[:last.start()] + 'SELECT ' + ', '.join(columns) + sql[last.end():]
+
+def plan_tables(required: Requirements, table_sql: Dict[str, str] | None = None,
+                table_columns: Dict[str, Optional[List[str]]] | None = None) -> Dict[str, str]:
+    """
+    Tables to load for the given requirements, with each SQL narrowed to the needed columns.
+
+    Tables no check reads are skipped entirely. Columns a table is known not to return
+    (sql_defs.TABLE_COLUMNS) are left out of the narrowed query so the check still reports
+    them as missing instead of the query failing.
+    """
+    table_sql = sql_defs.ALL_TABLE_SQL if table_sql is None else table_sql
+    table_columns = sql_defs.TABLE_COLUMNS if table_columns is None else table_columns
+    if required is None:
+        return dict(table_sql)
+    plan: Dict[str, str] = {}
+    for name, sql in table_sql.items():
+        if name not in required:
+            continue
+        cols = required[name]
+        known = table_columns.get(name)
+        if known is not None:
+            cols = [c for c in cols if c in known]
+        plan[name] = narrow_select_star(sql, cols) if cols else sql
+    return plan
+
+def _timed_load(loader: Loader, conn_str: str, name: str, sql: str, fallback_sql: str | None = None,
+                compaction: CompactionSpec | None = None) -> TableLoad:
+    t0 = time.perf_counter()
+    try:
+        df = loader(conn_str, sql)
+    except Exception:
+        # A narrowed query can fail if a column isn't there; retry with the original SQL
+        if not fallback_sql or fallback_sql == sql:
+            raise
+        df = loader(conn_str, fallback_sql)
+    report = None
+    if compaction is not None:
+        # Compacted on the loading thread, so tables are compacted in parallel as they arrive
+        df, report = compact_frame(df, compaction, table=name)
+    return TableLoad(name, df, time.perf_counter() - t0, report)
+
+def iter_table_loads(conn_str: str, table_sql: Dict[str, str] | None = None, max_workers: int | None = None,
+                     loader: Loader | None = None, fallback_sql: Dict[str, str] | None = None,
+                     compaction: Dict[str, CompactionSpec] | None = None) -> Iterator[TableLoad]:
+    """
+    Load every table concurrently and yield each one as soon as it finishes.
+
+    Args:
+        conn_str: ODBC connection string
+        table_sql: Mapping of table name -> SQL (default: sql_defs.ALL_TABLE_SQL)
+        max_workers: Concurrent loads (default: one per table)
+        loader: Function used to fetch a table (default: default_loader())
+        fallback_sql: Per-table SQL to retry with if a (narrowed) query fails
+        compaction: Per-table compaction specs (see compaction.compact_frame); tables
+            without a spec are returned as loaded
+
+    Yields:
+        TableLoad objects in completion order. If any load fails, pending loads are
+        cancelled and the error is re-raised with the table name.
+    """
+    table_sql = sql_defs.ALL_TABLE_SQL if table_sql is None else table_sql
+    loader = loader or default_loader()
+    if not table_sql:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers or len(table_sql), thread_name_prefix='load') as pool:
+        fallback_sql = fallback_sql or {}
+        compaction = compaction or {}
+        pending = {pool.submit(_timed_load, loader, conn_str, name, sql, fallback_sql.get(name), compaction.get(name)): name
+                   for name, sql in table_sql.items()}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = pending.pop(fut)
+                    try:
+                        yield fut.result()
+                    except Exception as e:
+                        raise RuntimeError(f'Failed to load {name}: {e}') from e
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+def load_all_tables(conn_str: str, table_sql: Dict[str, str] | None = None, max_workers: int | None = None,
+                    loader: Loader | None = None,
+                    progress: Callable[[TableLoad, int, int], None] | None = None,
+                    fallback_sql: Dict[str, str] | None = None,
+                    compaction: Dict[str, CompactionSpec] | None = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load every table concurrently (see iter_table_loads) and return them by name.
+
+    progress(load, done, total) is called as each table finishes. The returned dict
+    keeps the registration order of table_sql, whatever order the loads finish in.
+    """
+    table_sql = sql_defs.ALL_TABLE_SQL if table_sql is None else table_sql
+    loaded: Dict[str, pd.DataFrame] = {}
+    for load in iter_table_loads(conn_str, table_sql, max_workers=max_workers, loader=loader, fallback_sql=fallback_sql,
+                                 compaction=compaction):
+        loaded[load.name] = load.frame
+        if progress:
+            progress(load, len(loaded), len(table_sql))
+    return {name: loaded[name] for name in table_sql}
+
+def load_required_tables(conn_str: str, required: Requirements, max_workers: int | None = None,
+                         loader: Loader | None = None,
+                         progress: Callable[[TableLoad, int, int], None] | None = None,
+                         compact: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Load only the tables in required, narrowed to the needed columns (see plan_tables), and
+    compact them per sql_defs.TABLE_COMPACTION unless compact=False.
+    """
+    plan = plan_tables(required)
+    return load_all_tables(conn_str, plan, max_workers=max_workers, loader=loader, progress=progress,
+                           fallback_sql=sql_defs.ALL_TABLE_SQL,
+                           compaction=sql_defs.TABLE_COMPACTION if compact else None)
+
+def iter_required_loads(conn_str: str, required: Requirements, max_workers: int | None = None,
+                        loader: Loader | None = None,
+                        progress: Callable[[TableLoad, int, int], None] | None = None,
+                        compact: bool = True) -> Iterator[TableLoad]:
+    """
+    load_required_tables() as a stream: yield each TableLoad as soon as it finishes (e.g. for
+    engine.run_pipelined), calling progress(load, done, total) first.
+    """
+    plan = plan_tables(required)
+    loads = iter_table_loads(conn_str, plan, max_workers=max_workers, loader=loader, fallback_sql=sql_defs.ALL_TABLE_SQL,
+                             compaction=sql_defs.TABLE_COMPACTION if compact else None)
+    for done, load in enumerate(loads, 1):
+        if progress:
+            progress(load, done, len(plan))
+        yield load
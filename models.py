@@ -1,8 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
 
-@dataclass(frozen=True)
+# Slotted: no per-instance __dict__ for callers that still build lists of findings
+@dataclass(frozen=True, slots=True)
 class Finding:
     unitid: str
     check_id: str
@@ -11,3 +15,119 @@ class Finding:
     field: Optional[str] = None
     current_value: Optional[str] = None
     expected: Optional[str] = None
+
+# Column layout shared by FindingBatch and reporting.findings_to_dataframe
+FINDING_COLUMNS = ['unitid','check_id','severity','message','field','current_value','expected']
+# Columns that are per-check constants (or nearly so); a batch stores them dictionary-encoded as
+# categoricals, i.e. each distinct string once plus a 1-byte code per finding. current_value is
+# encoded too when a check passes one value for every finding.
+DICT_COLUMNS = ('check_id','severity','message','field','expected')
+
+def _constant(value, n: int) -> pd.Categorical:
+    # n rows of one value, built straight from codes (nothing to hash); None -> all missing
+    if value is None:
+        return pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8), categories=pd.Index([], dtype='str'))
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+def _encode(frame: pd.DataFrame) -> pd.DataFrame:
+    # Dictionary-encode the DICT_COLUMNS that aren't already (e.g. frames built from Finding rows)
+    todo = [c for c in DICT_COLUMNS if not isinstance(frame[c].dtype, pd.CategoricalDtype)]
+    return frame.astype({c: 'category' for c in todo}) if todo else frame
+
+def _decode(s: pd.Series) -> pd.Series:
+    return s.astype(s.cat.categories.dtype) if isinstance(s.dtype, pd.CategoricalDtype) else s
+
+def _concat_column(parts: List[pd.Series]) -> pd.Series:
+    if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+        try:
+            # Merged dictionaries stay sorted, so sorting by these columns is still alphabetical
+            return pd.Series(union_categoricals([p.array for p in parts], sort_categories=True))
+        except TypeError:
+            # Categories of different types (e.g. a non-str expected value)
+            return pd.concat([p.astype(object) for p in parts], ignore_index=True).astype('category')
+    return pd.concat([_decode(p) for p in parts], ignore_index=True)
+
+class FindingBatch:
+    """
+    Columnar collection of findings backed by a DataFrame with FINDING_COLUMNS.
+
+    Checks build batches straight from boolean masks, so no per-row objects are created.
+    The per-check constants (DICT_COLUMNS) are dictionary-encoded, so a finding costs its
+    UNITID and current value plus a few bytes of codes. Iterating a batch still yields
+    Finding objects for callers of the list-based API.
+    """
+    __slots__ = ('frame',)
+
+    def __init__(self, frame: pd.DataFrame | None = None):
+        self.frame = _encode(pd.DataFrame(columns=FINDING_COLUMNS) if frame is None else frame[FINDING_COLUMNS])
+
+    @classmethod
+    def from_mask(cls, unitids: pd.Series, mask: pd.Series | None, check_id: str, severity: str, message: str,
+                  field: Optional[str] = None, current_value=None, expected: Optional[str] = None) -> 'FindingBatch':
+        """
+        Build a batch with one finding per selected row.
+
+        Args:
+            unitids: Series of UNITID strings, aligned with mask
+            mask: Boolean Series selecting the failing rows (None selects every row)
+            check_id, severity, message, field, expected: Values repeated on every finding
+            current_value: Scalar repeated on every finding, or a Series aligned with unitids
+        """
+        if mask is not None:
+            unitids = unitids[mask]
+            if isinstance(current_value, pd.Series):
+                current_value = current_value[mask]
+        n = len(unitids)
+        if isinstance(current_value, pd.Series):
+            current_value = current_value.to_numpy()
+        elif current_value is None or isinstance(current_value, str):
+            current_value = _constant(current_value, n)
+        return cls(pd.DataFrame({
+            'unitid': unitids.to_numpy(),
+            'check_id': _constant(check_id, n),
+            'severity': _constant(severity, n),
+            'message': _constant(message, n),
+            'field': _constant(field, n),
+            'current_value': current_value,
+            'expected': _constant(expected, n),
+        }, columns=FINDING_COLUMNS))
+
+    @classmethod
+    def dataset_error(cls, check_id: str, message: str, field: Optional[str] = None) -> 'FindingBatch':
+        """Single '(DATASET)' level ERROR finding, used for missing tables and columns."""
+        return cls.from_findings([Finding('(DATASET)', check_id, 'ERROR', message, field=field)])
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[Finding]) -> 'FindingBatch':
+        rows = [(f.unitid, f.check_id, f.severity, f.message, f.field, f.current_value, f.expected) for f in findings]
+        return cls(pd.DataFrame(rows, columns=FINDING_COLUMNS)) if rows else cls()
+
+    @classmethod
+    def concat(cls, batches: Iterable['FindingBatch']) -> 'FindingBatch':
+        frames = [b.frame for b in batches if len(b)]
+        if not frames:
+            return cls()
+        if len(frames) == 1:
+            return cls(frames[0])
+        # Column by column so the dictionary-encoded columns merge their dictionaries instead of decoding
+        return cls(pd.DataFrame({c: _concat_column([f[c] for f in frames]) for c in FINDING_COLUMNS}))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __iter__(self) -> Iterator[Finding]:
+        data = self.frame.astype(object)
+        data = data.where(data.notna(), None)
+        for row in data.itertuples(index=False, name=None):
+            yield Finding(*row)
+
+    def to_findings(self) -> List[Finding]:
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The findings as a plain DataFrame, with the dictionary-encoded columns decoded."""
+        return pd.DataFrame({c: _decode(self.frame[c]) for c in FINDING_COLUMNS})
+
+    def memory_bytes(self) -> int:
+        """Memory held by the batch's columns (strings included)."""
+        return int(self.frame.memory_usage(deep=True, index=False).sum())
@@ -0,0 +1,86 @@
+# Partitioned execution helpers: split the validated table into partitions by a key column and
+# share the reference tables with worker processes as memory-mapped Arrow files
+from __future__ import annotations
+from typing import Dict, List, Mapping, Tuple
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from run_context import RunContext
+
+# Column the validated table is partitioned on by default (e.g. STREETID keeps each street together)
+DEFAULT_PARTITION_KEY = 'UNITID'
+# Default partitions per worker, so a slow partition doesn't leave the other workers idle
+PARTITIONS_PER_WORKER = 2
+
+def partition_rows(keys: pd.Series, partitions: int) -> List[np.ndarray]:
+    """
+    Row positions of each of the partitions of a table, given its (stripped) key column.
+    Rows with the same key always land in the same partition (null keys all in one), and
+    keep their order within it; partitions can be empty.
+    """
+    if partitions <= 1:
+        return [np.arange(len(keys))]
+    # Distinct keys are numbered in order of first appearance (factorize: one pass, several
+    # times faster than hashing each row's string) and dealt round-robin, which also spreads
+    # them evenly. Not a hash: the same key can land in another partition in another table.
+    codes = pd.factorize(keys, use_na_sentinel=True)[0] % partitions
+    order = np.argsort(codes, kind='stable')
+    return np.split(order, np.cumsum(np.bincount(codes, minlength=partitions))[:-1])
+
+def _read_shared(path: str) -> pd.DataFrame:
+    if path.endswith('.feather'):
+        return feather.read_table(path, memory_map=True).to_pandas()
+    return pd.read_pickle(path)
+
+class SharedTables:
+    """
+    Tables written once to a temporary directory for worker processes to open, instead of
+    pickling them into every task. Arrow files are memory-mapped, so the operating system
+    shares their pages between workers; tables Arrow can't hold (mixed-type object columns)
+    are pickled there instead and read once per worker. The files are removed on close().
+    """
+
+    def __init__(self, tables: Mapping[str, pd.DataFrame], root: str | None = None):
+        self.dir = tempfile.mkdtemp(prefix='mayrise-shared-', dir=root)
+        self.paths: Dict[str, str] = {}
+        try:
+            for name, df in tables.items():
+                path = os.path.join(self.dir, f'{name}.feather')
+                try:
+                    feather.write_feather(df.reset_index(drop=True), path, compression='uncompressed')
+                except (pa.ArrowException, TypeError, ValueError):
+                    path = os.path.join(self.dir, f'{name}.pkl')
+                    df.to_pickle(path)
+                self.paths[name] = path
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedTables':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# The shared tables of the current run in this worker process, kept across its tasks
+_WORKER_CONTEXT: Dict[Tuple[Tuple[str, str], ...], RunContext] = {}
+
+def worker_context(paths: Dict[str, str]) -> RunContext:
+    """
+    RunContext over the SharedTables at paths, opened once per worker process and reused by
+    all its tasks, so reference key indexes are also built once per worker.
+    """
+    key = tuple(sorted(paths.items()))
+    ctx = _WORKER_CONTEXT.get(key)
+    if ctx is None:
+        # A new run: drop the previous run's tables (and their memory maps)
+        _WORKER_CONTEXT.clear()
+        ctx = _WORKER_CONTEXT[key] = RunContext({name: _read_shared(path) for name, path in paths.items()})
+    return ctx
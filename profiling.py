@@ -0,0 +1,183 @@
+# Run instrumentation: stage timing spans, pre/post-check hooks and optional per-check cProfile
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+
+if TYPE_CHECKING:
+    from models import FindingBatch
+    from telemetry import CheckStats
+
+# Top-level stages of a run, in the order they are reported
+STAGES = ('load', 'check', 'reporting', 'export')
+
+PreCheckHook = Callable[[str], None]
+PostCheckHook = Callable[[str, 'FindingBatch', 'CheckStats'], None]
+
+@dataclass
+class Span:
+    """One timed interval; name is None for a whole stage, else the table/check inside it."""
+    stage: str
+    name: Optional[str]
+    start: float   # time.perf_counter() values
+    end: float
+    thread: str
+    pid: int
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+class _PStatsHolder:
+    # Minimal stand-in for a Profile so pstats.Stats can merge raw stats dicts
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+class CheckProfile:
+    """
+    Wraps one check: records its span and, with cprofile=True, its cProfile stats.
+
+    Runs wherever the check runs (thread or process worker) and is returned to the caller
+    as plain data, since cProfile objects don't pickle.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cprofile
+        self.start = self.end = 0.0
+        self.thread = ''
+        self.pid = 0
+        self.pstats: Optional[dict] = None
+
+    def __enter__(self) -> 'CheckProfile':
+        self.thread, self.pid = threading.current_thread().name, os.getpid()
+        self._prof = cProfile.Profile() if self.cprofile else None
+        self.start = time.perf_counter()
+        if self._prof is not None:
+            try:
+                self._prof.enable()
+            except ValueError:
+                self._prof = None  # another profiler is active (one per process on 3.12+)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._prof is not None:
+            self._prof.disable()
+            self._prof.create_stats()
+            self.pstats = self._prof.stats
+        self.end = time.perf_counter()
+        self._prof = None
+
+class Profiler:
+    """
+    Instrumentation for one run, passed to engine.run_selected_batches (and used by the GUI
+    and CLI around loading, reporting and export).
+
+    - span(stage[, name]) times a block; stage_totals()/breakdown_lines() summarize them
+    - pre-check hooks get the check id before the check is submitted; post-check hooks get
+      (check_id, batch, stats) as results are collected. Both run on the calling thread.
+    - cprofile=True profiles every check; track_memory=True adds tracemalloc peaks to stats
+    - dump_trace() writes a Chrome trace-event JSON (flame chart in Perfetto/speedscope);
+      dump_pstats() writes the merged cProfile stats (snakeviz, flameprof, pstats)
+    """
+
+    def __init__(self, cprofile: bool = False, track_memory: bool = False):
+        self.cprofile = cprofile
+        self.track_memory = track_memory
+        self.pre_check_hooks: List[PreCheckHook] = []
+        self.post_check_hooks: List[PostCheckHook] = []
+        self.spans: List[Span] = []
+        self._pstats: List[dict] = []
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def add_hook(self, pre: PreCheckHook | None = None, post: PostCheckHook | None = None) -> None:
+        if pre is not None:
+            self.pre_check_hooks.append(pre)
+        if post is not None:
+            self.post_check_hooks.append(post)
+
+    def add_span(self, stage: str, name: Optional[str], start: float, end: float,
+                 thread: str | None = None, pid: int | None = None) -> None:
+        span = Span(stage, name, start, end, thread or threading.current_thread().name, pid or os.getpid())
+        with self._lock:
+            self.spans.append(span)
+
+    def add_finished(self, stage: str, name: Optional[str], seconds: float) -> None:
+        """Record a span that just ended after `seconds` (e.g. a TableLoad reported by a loader)."""
+        end = time.perf_counter()
+        self.add_span(stage, name, end - seconds, end)
+
+    @contextmanager
+    def span(self, stage: str, name: Optional[str] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(stage, name, start, time.perf_counter())
+
+    # Engine side
+
+    def before_check(self, check_id: str) -> None:
+        for hook in self.pre_check_hooks:
+            hook(check_id)
+
+    def after_check(self, check_id: str, batch: 'FindingBatch', stats: 'CheckStats', prof: CheckProfile | None) -> None:
+        if prof is not None:
+            self.add_span('check', check_id, prof.start, prof.end, prof.thread, prof.pid)
+            if prof.pstats:
+                with self._lock:
+                    self._pstats.append(prof.pstats)
+        for hook in self.post_check_hooks:
+            hook(check_id, batch, stats)
+
+    # Summaries and dumps
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Seconds per stage (whole-stage spans only), in STAGES order then first-seen order."""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            if s.name is None:
+                totals[s.stage] = totals.get(s.stage, 0.0) + s.seconds
+        order = [st for st in STAGES if st in totals] + [st for st in totals if st not in STAGES]
+        return {st: totals[st] for st in order}
+
+    def breakdown_lines(self, top_checks: int = 5) -> List[str]:
+        """Human-readable per-stage breakdown, with the slowest checks, for the run log."""
+        totals = self.stage_totals()
+        grand = sum(totals.values()) or 1.0
+        lines = [f'{st:<10} {sec:8.2f}s {100 * sec / grand:5.1f}%' for st, sec in totals.items()]
+        checks = sorted((s for s in self.spans if s.stage == 'check' and s.name), key=lambda s: -s.seconds)
+        lines += [f'  {s.name}: {s.seconds:.2f}s' for s in checks[:top_checks]]
+        return lines
+
+    def dump_trace(self, path: str) -> None:
+        """Write the spans as Chrome trace events ('X' complete events, microseconds)."""
+        events = [{'name': s.name or s.stage, 'cat': s.stage, 'ph': 'X', 'ts': round((s.start - self._t0) * 1e6),
+                   'dur': round(s.seconds * 1e6), 'pid': s.pid, 'tid': s.thread} for s in self.spans]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def merged_pstats(self) -> Optional[pstats.Stats]:
+        if not self._pstats:
+            return None
+        st = pstats.Stats(_PStatsHolder(self._pstats[0]))
+        for raw in self._pstats[1:]:
+            st.add(_PStatsHolder(raw))
+        return st
+
+    def dump_pstats(self, path: str) -> bool:
+        """Write the merged per-check cProfile stats in pstats format; False if nothing was profiled."""
+        st = self.merged_pstats()
+        if st is None:
+            return False
+        st.dump_stats(path)
+        return True
@@ -0,0 +1,154 @@
+# SQL pushdown: checks that can express their filter as SQL fetch only their candidate rows from the source
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+import re
+import pandas as pd
+from checks.base import BaseCheck
+from loading import Loader, default_loader, load_all_tables
+from models import FindingBatch
+from run_context import RunContext
+from telemetry import CheckStats, CheckTimer, RunTelemetry
+import sql_defs
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# Characters str.strip() (and pandas' .str.strip()) removes besides the space; the last is U+3000
+_WHITESPACE = [i for i in range(0x3001) if chr(i).isspace() and chr(i) != ' ']
+
+@dataclass(frozen=True)
+class SqlDialect:
+    """
+    The few SQL fragments pushdown queries need, per database. Checks build their queries
+    through these so one definition runs on SQL Server and on a SQLite stand-in.
+
+    The database can't compare text exactly as pandas does (Unicode whitespace, casefold(),
+    pd.to_datetime), so pushdown predicates are built to err towards fetching more rows:
+    run_batch() re-checks every row fetched.
+    """
+    name: str
+    quote: str                 # identifier quoting, e.g. '[]' (SQLite reads an unknown "NAME" as a string)
+    trim_template: str         # strips spaces (and maybe tabs/line breaks) from the ends only, a subset of str.strip()
+    strip_all_template: str    # see strip_all()
+    datetime_template: str     # parses a column to a datetime, NULL if it can't
+    timestamp_format: str      # literal format of a datetime compared against datetime_template
+    text_template: str         # a column as text; datetimes in ISO 8601 form
+    match_template: str        # {0} matches the pattern {1} (GLOB syntax, any_chars for *; code point order)
+    exact_template: str        # {0} compared byte for byte (case- and accent-sensitive)
+    first_row_template: str    # the first row of {0} (alias {1}) matching {2}, ordered by {3}
+    any_chars: str = '*'
+
+    def ident(self, name: str, alias: str | None = None) -> Optional[str]:
+        """Quoted column reference, or None for names that aren't plain identifiers."""
+        if not _IDENTIFIER.match(name or ''):
+            return None
+        quoted = f'{self.quote[0]}{name}{self.quote[-1]}'
+        return f'{alias}.{quoted}' if alias else quoted
+
+    def trim(self, expr: str) -> str:
+        return self.trim_template.format(expr)
+
+    def strip_all(self, expr: str) -> str:
+        """
+        str.strip() or looser: strips every whitespace character str.strip() knows (SQL Server
+        first turns them all into spaces, inner ones too). Values str.strip() makes equal (or
+        blank) are always equal (or blank) here; the reverse needn't hold.
+        """
+        return self.strip_all_template.format(expr)
+
+    def as_datetime(self, expr: str) -> str:
+        return self.datetime_template.format(expr)
+
+    def as_text(self, expr: str) -> str:
+        return self.text_template.format(expr)
+
+    def matches(self, expr: str, pattern: str) -> str:
+        """expr matches a GLOB-style pattern ('*' any characters, [a-z] classes, [^...] negated)."""
+        return '(' + self.match_template.format(expr, self.literal(pattern.replace('*', self.any_chars))) + ')'
+
+    def exact(self, expr: str) -> str:
+        return self.exact_template.format(expr)
+
+    def literal(self, value) -> str:
+        if isinstance(value, pd.Timestamp):
+            value = value.strftime(self.timestamp_format)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return repr(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def select_where(self, source_sql: str, condition: str, alias: str = 'src') -> str:
+        """Rows of the source query (a derived table) matching condition."""
+        return f'SELECT * FROM ({source_sql}) {alias} WHERE {condition}'
+
+    def first_row(self, source_sql: str, condition: str, order: str, alias: str = 'src') -> str:
+        """The first row of the source query matching condition, in an explicit order (ORDER BY list)."""
+        return self.first_row_template.format(source_sql, alias, condition, order)
+
+DIALECTS: Dict[str, SqlDialect] = {
+    'mssql': SqlDialect('mssql', '[]', 'LTRIM(RTRIM({0}))',
+                        'LTRIM(RTRIM(TRANSLATE({0}, ' + '+'.join(f'NCHAR({i})' for i in _WHITESPACE)
+                        + f', SPACE({len(_WHITESPACE)}))))',
+                        'TRY_CONVERT(datetime2, {0})', '%Y-%m-%dT%H:%M:%S', 'CONVERT(nvarchar(33), {0}, 126)',
+                        '{0} COLLATE Latin1_General_BIN LIKE {1}', '{0} COLLATE Latin1_General_BIN2',
+                        'SELECT TOP 1 * FROM ({0}) {1} WHERE {2} ORDER BY {3}', any_chars='%'),
+    'sqlite': SqlDialect('sqlite', '[]', "TRIM({0}, ' ' || char(9) || char(10) || char(13))",
+                         "TRIM({0}, ' ' || char(" + ', '.join(map(str, _WHITESPACE)) + '))',
+                         'datetime({0})', '%Y-%m-%d %H:%M:%S', '{0}', '{0} GLOB {1}', '{0}',
+                         'SELECT * FROM ({0}) {1} WHERE {2} ORDER BY {3} LIMIT 1'),
+}
+
+@dataclass
+class PushdownResult:
+    """Findings of the checks that ran in the database, and the checks that still need the full tables."""
+    batches: Dict[str, FindingBatch] = field(default_factory=dict)
+    # Candidate rows fetched per table, across all pushed checks (e.g. for enriching the findings)
+    tables: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    fallback: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def rows_fetched(self) -> int:
+        return sum(len(df) for df in self.tables.values())
+
+def run_pushdown(conn_str: str, checks: Sequence[Tuple[str, Type[BaseCheck]]], loader: Loader | None = None,
+                 table_sql: Dict[str, str] | None = None, dialect: str | SqlDialect = 'mssql',
+                 telemetry: RunTelemetry | None = None) -> PushdownResult:
+    """
+    Run every check that supports pushdown against the database and return its findings.
+
+    For each check, its pushdown_sql() queries fetch only the candidate rows (through loader,
+    default: the streaming io_odbc loader) and the check's own run_batch() then runs on them,
+    so findings are the same as a full in-memory run. Checks whose pushdown_sql() is None, or
+    whose query fails (e.g. a missing column), are listed in result.fallback for the normal
+    in-memory path. Per-check stats are recorded on telemetry (not flushed).
+    """
+    table_sql = sql_defs.ALL_TABLE_SQL if table_sql is None else table_sql
+    dialect = DIALECTS[dialect] if isinstance(dialect, str) else dialect
+    loader = loader or default_loader()
+    result = PushdownResult()
+    fetched: Dict[str, List[pd.DataFrame]] = {}
+    for cid, cls in checks:
+        chk = cls()
+        queries = chk.pushdown_sql(table_sql, dialect)
+        if not queries:
+            result.fallback.append(cid)
+            continue
+        with CheckTimer() as t:
+            try:
+                candidates = load_all_tables(conn_str, queries, loader=loader)
+            except Exception as e:
+                result.errors[cid] = str(e)
+                candidates = None
+            if candidates is not None:
+                batch = chk.run_batch(RunContext(candidates))
+        if candidates is None:
+            result.fallback.append(cid)
+            continue
+        result.batches[cid] = batch
+        for name, df in candidates.items():
+            fetched.setdefault(name, []).append(df)
+        if telemetry is not None:
+            rows = sum(len(df) for df in candidates.values())
+            telemetry.record(CheckStats(cid, t.started_at, t.wall_s, t.cpu_s, rows, len(batch), t.peak_mem_bytes))
+    result.tables = {name: pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+                     for name, parts in fetched.items()}
+    return result
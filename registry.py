@@ -0,0 +1,228 @@
+# Lazy check registry: check metadata from a cached source manifest, imports only on demand
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Type
+import ast
+import importlib
+import importlib.util
+import json
+import os
+import re
+import threading
+
+CHECKS_PACKAGE = 'checks'
+# Name of the root check class the manifest resolves inheritance against
+BASE_CLASS = 'BaseCheck'
+MANIFEST_NAME = 'check_manifest.json'
+# Module of the checks compiled from the declarative rules file
+RULES_MODULE = 'rules'
+# Rules file compiled into checks by rules.rule_checks() (MAYRISE_RULES overrides it)
+RULES_PATH = os.environ.get('MAYRISE_RULES') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checks', 'rules.toml')
+
+@dataclass(frozen=True)
+class CheckInfo:
+    """Metadata of one check, available without importing its module."""
+    check_id: str
+    name: str
+    description: str
+    module: str
+    class_name: str
+
+_lock = threading.Lock()
+_cache: Dict[str, object] = {}
+
+def _package_dir() -> str:
+    spec = importlib.util.find_spec(CHECKS_PACKAGE)
+    return list(spec.submodule_search_locations)[0]
+
+def _fingerprint(pkg_dir: str) -> List[list]:
+    # (file, mtime, size) of every module; any edit, addition or removal changes it
+    out = []
+    for fname in sorted(os.listdir(pkg_dir)):
+        if fname.endswith('.py'):
+            st = os.stat(os.path.join(pkg_dir, fname))
+            out.append([fname, st.st_mtime_ns, st.st_size])
+    return out
+
+def _literal_attrs(node: ast.ClassDef) -> Dict[str, Optional[str]]:
+    # Class-level string attributes; non-literal values are recorded as None
+    attrs: Dict[str, Optional[str]] = {}
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign):
+            targets, value = stmt.targets, stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+            targets, value = [stmt.target], stmt.value
+        else:
+            continue
+        for t in targets:
+            if isinstance(t, ast.Name) and t.id in ('check_id', 'name', 'description'):
+                attrs[t.id] = value.value if isinstance(value, ast.Constant) and isinstance(value.value, str) else None
+    return attrs
+
+def _base_names(node: ast.ClassDef) -> List[str]:
+    names = []
+    for b in node.bases:
+        if isinstance(b, ast.Name):
+            names.append(b.id)
+        elif isinstance(b, ast.Attribute):
+            names.append(b.attr)
+    return names
+
+def build_manifest(pkg_dir: str | None = None) -> dict:
+    """
+    Parse (not import) every module of the checks package and list the check classes.
+
+    A class is a check if it derives, directly or through other classes in the package,
+    from BaseCheck and assigns its own check_id. name/description may be inherited.
+    Modules whose checks use non-literal attributes are listed under 'dynamic_modules'
+    and are imported when the registry is read.
+    """
+    pkg_dir = pkg_dir or _package_dir()
+    classes: Dict[str, dict] = {}
+    for fname, _, _ in _fingerprint(pkg_dir):
+        modname = f'{CHECKS_PACKAGE}.{fname[:-3]}'
+        with open(os.path.join(pkg_dir, fname), encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=fname)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                classes[node.name] = {'module': modname, 'bases': _base_names(node), 'attrs': _literal_attrs(node)}
+
+    def _is_check(name: str, seen: frozenset = frozenset()) -> bool:
+        if name == BASE_CLASS:
+            return True
+        cls = classes.get(name)
+        if cls is None or name in seen:
+            return False
+        return any(_is_check(b, seen | {name}) for b in cls['bases'])
+
+    def _inherited(name: str, attr: str) -> Optional[str]:
+        cls = classes.get(name)
+        if cls is None:
+            return None
+        if attr in cls['attrs']:
+            return cls['attrs'][attr]
+        for b in cls['bases']:
+            val = _inherited(b, attr)
+            if val is not None:
+                return val
+        return None
+
+    entries, dynamic = [], set()
+    for cname, cls in classes.items():
+        if cname == BASE_CLASS or not _is_check(cname) or 'check_id' not in cls['attrs']:
+            continue
+        cid = cls['attrs']['check_id']
+        if cid is None:
+            dynamic.add(cls['module'])
+            continue
+        entries.append(asdict(CheckInfo(cid, _inherited(cname, 'name') or cid, _inherited(cname, 'description') or '',
+                                        cls['module'], cname)))
+    return {'fingerprint': _fingerprint(pkg_dir), 'checks': entries, 'dynamic_modules': sorted(dynamic)}
+
+def _manifest_path(pkg_dir: str) -> str:
+    return os.path.join(pkg_dir, '__pycache__', MANIFEST_NAME)
+
+def _load_manifest(pkg_dir: str) -> dict:
+    # In-memory copy first, then the on-disk cache, rebuilding whenever the package changed
+    fp = _fingerprint(pkg_dir)
+    cached = _cache.get('manifest')
+    if cached is not None and cached['fingerprint'] == fp:
+        return cached
+    path = _manifest_path(pkg_dir)
+    manifest = None
+    if os.path.isfile(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+    if manifest is None or manifest.get('fingerprint') != fp:
+        manifest = build_manifest(pkg_dir)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass  # read-only install: keep the manifest in memory only
+    _cache['manifest'] = manifest
+    return manifest
+
+def read_rule_specs(path: str) -> List[dict]:
+    """Rule mappings of a .toml file ([[rule]] tables) or a .yaml/.yml file (a 'rules' list), unvalidated."""
+    if path.lower().endswith(('.yaml', '.yml')):
+        # PyYAML is only needed for YAML rule files, so it is imported on first use
+        import yaml
+        with open(path, encoding='utf-8') as f:
+            doc = yaml.safe_load(f) or {}
+    else:
+        import tomllib
+        with open(path, 'rb') as f:
+            doc = tomllib.load(f)
+    specs = doc.get('rule', doc.get('rules', [])) if isinstance(doc, dict) else doc
+    return list(specs or [])
+
+def rule_class_name(rule_id: str) -> str:
+    return 'Rule_' + re.sub(r'\W', '_', rule_id)
+
+def rule_description(rtype: str, table: str, columns) -> str:
+    # Description of a rule that doesn't set its own
+    return f'{rtype} rule on {table}.{", ".join(columns)}'
+
+def _rule_infos(path: str) -> List[CheckInfo]:
+    # Metadata straight from the rules file, so listing checks doesn't import rules (and pandas);
+    # the rules are validated when one is loaded (rules.parse_rule)
+    if not os.path.isfile(path):
+        return []
+    st = os.stat(path)
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    cached = _cache.get('rules')
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    infos = []
+    for spec in read_rule_specs(path):
+        rid = spec.get('id') if isinstance(spec, dict) else None
+        if not rid or not isinstance(rid, str):
+            continue
+        columns = spec.get('columns') or ([spec['column']] if spec.get('column') else [])
+        if spec.get('type') == 'exists':
+            columns = columns or [spec.get('key', 'UNITID')]
+        description = spec.get('description') or rule_description(spec.get('type'), spec.get('table'), columns)
+        infos.append(CheckInfo(rid, spec.get('name') or rid, description, RULES_MODULE, rule_class_name(rid)))
+    _cache['rules'] = (stamp, infos)
+    return infos
+
+def list_checks() -> Dict[str, CheckInfo]:
+    """
+    Metadata of every check in the checks package, without importing check modules.
+    Raises ValueError if a rule in the rules file has the id of a Python check.
+    """
+    with _lock:
+        manifest = _load_manifest(_package_dir())
+    found = {e['check_id']: CheckInfo(**e) for e in manifest['checks']}
+    for modname in manifest['dynamic_modules']:
+        mod = importlib.import_module(modname)
+        for cls in vars(mod).values():
+            cid = getattr(cls, 'check_id', None) if isinstance(cls, type) else None
+            if cid and getattr(cls, '__module__', None) == modname and 'check_id' in vars(cls):
+                found[cid] = CheckInfo(cid, cls.name, cls.description, modname, cls.__name__)
+    # Declarative rules are read from the rules file (parsed, not compiled: no pandas import)
+    with _lock:
+        rule_infos = _rule_infos(RULES_PATH)
+    for info in rule_infos:
+        if info.check_id in found:
+            # Same error as engine.discover_checks, so listing and running all never disagree
+            raise ValueError(f'Rule {info.check_id} has the same id as the check {found[info.check_id].class_name}')
+        found[info.check_id] = info
+    return found
+
+def load_check(check_id: str) -> Optional[Type]:
+    """Import the module of one check and return its class (None if the id is unknown)."""
+    info = list_checks().get(check_id)
+    if info is None:
+        return None
+    if info.module == RULES_MODULE:
+        # Compiling the rules (and importing pandas) only happens once a rule is asked for
+        from rules import rule_checks
+        return rule_checks().get(check_id)
+    return getattr(importlib.import_module(info.module), info.class_name)
@@ -1,11 +1,16 @@
 from __future__ import annotations
+from typing import Callable, Dict, Tuple
+import numpy as np
 import pandas as pd
-from models import Finding
+from models import FINDING_COLUMNS, Finding, FindingBatch
 
 # Build a flat DataFrame from findings and enrich with asset fields
 
-def findings_to_dataframe(findings: list[Finding]) -> pd.DataFrame:
-    cols = ['unitid','check_id','severity','message','field','current_value','expected']
+def findings_to_dataframe(findings: list[Finding] | FindingBatch) -> pd.DataFrame:
+    cols = FINDING_COLUMNS
+    # Columnar batches are already in the right shape; no per-row conversion needed
+    if isinstance(findings, FindingBatch):
+        return findings.to_frame().reset_index(drop=True)
     if not findings:
         return pd.DataFrame(columns=cols)
     return pd.DataFrame([{
@@ -18,23 +23,147 @@ def findings_to_dataframe(findings: list[Finding]) -> pd.DataFrame:
         'expected': f.expected,
     } for f in findings], columns=cols)
 
+# ASSETS columns joined onto every finding by default
+OUTPUT_ASSET_COLS = ("UNITID","UNITNO","STREET")
+
 # Optionally join to asset details
 
-def build_output(findings_df: pd.DataFrame, assets_df: pd.DataFrame, asset_cols=("UNITID","UNITNO","STREET")) -> pd.DataFrame:
+OUTPUT_FINDING_COLS = ["check_id","severity","message","field","current_value","expected"]
+
+class AssetIndex:
+    """
+    Positional lookup of ASSETS rows by UNITID (as str), built once per loaded dataset.
+
+    Holds a reference to the assets frame (no copy) and a unique index of its UNITIDs; the
+    first row wins for duplicate UNITIDs, as drop_duplicates did. Looking up findings
+    factorizes their UNITIDs first, so each distinct id is hashed once, and columns are
+    then gathered with a vectorized take.
+    """
+
+    def __init__(self, assets_df: pd.DataFrame, key: str = 'UNITID'):
+        self.assets = assets_df
+        self.key = key
+        keys = assets_df[key].astype(str)
+        first = ~keys.duplicated().to_numpy()
+        self._index = pd.Index(keys.array[first])
+        self._rows = np.flatnonzero(first)
+
+    def positions(self, unitids: pd.Series) -> np.ndarray:
+        """Row position in the assets frame of each UNITID, -1 where there is no such asset."""
+        codes, uniques = pd.factorize(unitids.astype(str), use_na_sentinel=True)
+        found = self._index.get_indexer(uniques)
+        rows = np.where(found >= 0, self._rows[found], -1)
+        return np.append(rows, -1)[codes]
+
+    def take(self, positions: np.ndarray, columns) -> pd.DataFrame:
+        """Asset columns for the given positions (missing assets give nulls)."""
+        return pd.DataFrame({c: self.assets[c].array.take(positions, allow_fill=True) for c in columns})
+
+class _OneOffAssets(AssetIndex):
+    # For a single lookup, hashing the few distinct finding UNITIDs and probing every asset
+    # once is cheaper than indexing all assets
+    def __init__(self, assets_df: pd.DataFrame, key: str = 'UNITID'):
+        self.assets = assets_df
+        self.key = key
+
+    def positions(self, unitids: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(unitids.astype(str), use_na_sentinel=True)
+        hit = pd.Index(uniques).get_indexer(self.assets[self.key].astype(str))
+        matched = np.flatnonzero(hit >= 0)[::-1]
+        rows = np.full(len(uniques) + 1, -1)
+        rows[hit[matched]] = matched  # reversed, so the first asset row wins for duplicates
+        return rows[codes]
+
+class AssetEnricher:
+    """
+    Joins asset columns onto findings by UNITID using an AssetIndex. The same enricher can be
+    applied to each batch a streaming sink receives, with the same result as build_output.
+    extra_cols adds more asset columns (e.g. LOCATION, SERVICEOWN) on top of asset_cols.
+    """
+
+    def __init__(self, assets: pd.DataFrame | AssetIndex, asset_cols=OUTPUT_ASSET_COLS, extra_cols=()):
+        self.index = assets if isinstance(assets, AssetIndex) else AssetIndex(assets)
+        self.asset_cols = list(dict.fromkeys([*asset_cols, *extra_cols]))
+
+    @property
+    def columns(self) -> list[str]:
+        return self.asset_cols + OUTPUT_FINDING_COLS
+
+    def __call__(self, findings_df: pd.DataFrame) -> pd.DataFrame:
+        if findings_df.empty:
+            return pd.DataFrame(columns=self.columns)
+        unitids = findings_df['unitid'].astype(str).reset_index(drop=True)
+        out = self.index.take(self.index.positions(unitids), [c for c in self.asset_cols if c != self.index.key])
+        if self.index.key in self.asset_cols:
+            out[self.index.key] = unitids
+        for c in OUTPUT_FINDING_COLS:
+            out[c] = findings_df[c].reset_index(drop=True)
+        return out[self.columns]
+
+    def add_columns(self, output_df: pd.DataFrame, cols) -> pd.DataFrame:
+        """output_df (from this enricher) with more asset columns appended, looked up via the index."""
+        new = [c for c in cols if c not in output_df.columns]
+        if not new:
+            return output_df
+        extra = self.index.take(self.index.positions(output_df[self.index.key]), new)
+        extra.index = output_df.index
+        return pd.concat([output_df, extra], axis=1)
+
+def build_output(findings_df: pd.DataFrame, assets: pd.DataFrame | AssetIndex, asset_cols=OUTPUT_ASSET_COLS,
+                 extra_cols=()) -> pd.DataFrame:
     if findings_df.empty:
-        return pd.DataFrame(columns=list(asset_cols)+["check_id","severity","message","field","current_value","expected"])
-    a = assets_df.copy(); a['UNITID'] = a['UNITID'].astype(str)
-    f = findings_df.copy(); f['UNITID'] = f['unitid'].astype(str)
-    out = f.merge(a[list(asset_cols)].drop_duplicates('UNITID'), on='UNITID', how='left')
-    return out[list(asset_cols)+["check_id","severity","message","field","current_value","expected"]]
+        return pd.DataFrame(columns=list(dict.fromkeys([*asset_cols, *extra_cols]))+OUTPUT_FINDING_COLS)
+    if not isinstance(assets, AssetIndex):
+        assets = _OneOffAssets(assets)
+    return AssetEnricher(assets, asset_cols, extra_cols)(findings_df)
 
 # Excel export (Findings + Summary)
+#
+# Streams rows through openpyxl's write-only workbook, so memory stays flat however many
+# findings there are. Findings that don't fit one sheet (Excel's 1,048,576-row limit,
+# header included) roll over to Findings_2, Findings_3, ... The Summary counts per
+# (check_id, severity) are accumulated chunk by chunk while the rows are written.
+# progress(rows_written, total_rows) is called after every chunk.
+
+EXCEL_MAX_ROWS = 1_048_576
+EXPORT_CHUNK_ROWS = 20_000
+
+def _excel_rows(chunk: pd.DataFrame):
+    # Plain Python values; NaN/NaT/pd.NA become empty cells
+    obj = chunk.astype(object)
+    return obj.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+def export_findings_excel(output_df: pd.DataFrame, out_path: str, max_rows_per_sheet: int = EXCEL_MAX_ROWS - 1,
+                          chunk_rows: int = EXPORT_CHUNK_ROWS,
+                          progress: Callable[[int, int], None] | None = None) -> None:
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    header = [str(c) for c in output_df.columns]
+    total = len(output_df)
+    counts: Dict[Tuple, int] = {}
+    has_keys = 'check_id' in output_df.columns and 'severity' in output_df.columns
+
+    sheet_no, in_sheet, written = 1, 0, 0
+    ws = wb.create_sheet('Findings'); ws.append(header)
+    while written < total:
+        if in_sheet >= max_rows_per_sheet:
+            sheet_no += 1
+            ws = wb.create_sheet(f'Findings_{sheet_no}'); ws.append(header)
+            in_sheet = 0
+        chunk = output_df.iloc[written:written + min(chunk_rows, max_rows_per_sheet - in_sheet)]
+        for row in _excel_rows(chunk):
+            ws.append(row)
+        if has_keys:
+            for key, n in chunk.groupby(['check_id', 'severity'], dropna=False, sort=False).size().items():
+                key = tuple(None if pd.isna(k) else k for k in key)
+                counts[key] = counts.get(key, 0) + int(n)
+        in_sheet += len(chunk); written += len(chunk)
+        if progress:
+            progress(written, total)
 
-def export_findings_excel(output_df: pd.DataFrame, out_path: str) -> None:
-    with pd.ExcelWriter(out_path, engine='openpyxl') as w:
-        output_df.to_excel(w, index=False, sheet_name='Findings')
-        if not output_df.empty:
-            summary = (output_df.groupby(["check_id","severity"], dropna=False)
-                       .size().reset_index(name='count')
-                       .sort_values(["check_id","severity"]))
-            summary.to_excel(w, index=False, sheet_name='Summary')
+    if counts:
+        summary = wb.create_sheet('Summary')
+        summary.append(['check_id', 'severity', 'count'])
+        for (cid, sev), n in sorted(counts.items(), key=lambda kv: tuple((k is None, str(k)) for k in kv[0])):
+            summary.append([cid, sev, n])
+    wb.save(out_path)
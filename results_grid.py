@@ -0,0 +1,217 @@
+# Virtualized results grid: only the visible rows exist as Treeview items; filter/sort run off the Tk thread
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import threading
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+
+ALL = '(all)'
+
+class GridModel:
+    """
+    Row source for the grid: the findings frame plus the current view (row positions after
+    filtering and sorting). query() only reads the frame, so it can run on a worker thread;
+    set_view() and rows() are called from the Tk thread.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.view = np.arange(len(df))
+        self._haystack: Optional[pd.Series] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def distinct(self, column: str) -> List[str]:
+        """Sorted distinct non-null values of a column (for the filter drop-downs)."""
+        if column not in self.df.columns:
+            return []
+        return sorted(str(v) for v in self.df[column].dropna().unique())
+
+    def _search_text(self) -> pd.Series:
+        # All columns joined and casefolded once, then reused by every text search
+        with self._lock:
+            if self._haystack is None:
+                parts = [self.df[c].astype(str).where(self.df[c].notna(), '') for c in self.df.columns]
+                joined = parts[0].str.cat(parts[1:], sep='\x1f') if len(parts) > 1 else parts[0]
+                self._haystack = joined.str.casefold().reset_index(drop=True)
+            return self._haystack
+
+    def query(self, filters: Dict[str, str] | None = None, text: str = '', sort_col: str | None = None,
+              ascending: bool = True) -> np.ndarray:
+        """
+        Row positions matching every {column: value} filter (ALL or '' = no filter) and, if
+        text is given, containing it (case-insensitive) in any column, sorted by sort_col.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        for col, value in (filters or {}).items():
+            if value and value != ALL and col in self.df.columns:
+                mask &= (self.df[col].astype(str) == value).to_numpy(dtype=bool, na_value=False)
+        if text:
+            mask &= self._search_text().str.contains(text.casefold(), regex=False).to_numpy(dtype=bool, na_value=False)
+        positions = np.flatnonzero(mask)
+        if sort_col and sort_col in self.df.columns and len(positions):
+            values = self.df[sort_col].iloc[positions].reset_index(drop=True)
+            try:
+                order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+            except TypeError:
+                # Mixed types can't be compared; fall back to their text
+                order = values.astype(str).sort_values(ascending=ascending, kind='stable').index.to_numpy()
+            positions = positions[order]
+        return positions
+
+    def set_view(self, positions: np.ndarray) -> None:
+        self.view = positions
+
+    def rows(self, start: int, count: int) -> List[Tuple[str, ...]]:
+        """Display strings for view rows [start, start + count); nulls show as ''."""
+        page = self.df.iloc[self.view[start:start + count]]
+        cells = page.astype(object).where(page.notna(), '')
+        return [tuple(str(v) for v in row) for row in cells.itertuples(index=False, name=None)]
+
+class ResultsGrid(tk.Toplevel):
+    """
+    Findings viewer that scales to large results: the Treeview holds only as many items as
+    fit on screen and their values are swapped as the user scrolls. Filtering by check_id /
+    severity, text search and sorting (click a heading) are computed on a worker thread and
+    applied when done; a newer request supersedes an older one still running.
+    """
+
+    ROW_HEIGHT = 20
+    SEARCH_DELAY_MS = 250
+
+    def __init__(self, master: tk.Misc, df: pd.DataFrame, title: str = 'Results grid'):
+        super().__init__(master)
+        self.model = GridModel(df)
+        self.columns = [str(c) for c in df.columns]
+        self.title(f'{title} - {len(df):,} rows')
+        self.geometry('1120x560')
+        self._top = 0
+        self._sort: Tuple[str | None, bool] = (None, True)
+        self._generation = 0
+        self._search_job = None
+
+        bar = tk.Frame(self); bar.pack(fill='x')
+        self.check_var = tk.StringVar(value=ALL)
+        self.severity_var = tk.StringVar(value=ALL)
+        self.search_var = tk.StringVar()
+        self.status = tk.StringVar()
+        for label, var, col in (('Check:', self.check_var, 'check_id'), ('Severity:', self.severity_var, 'severity')):
+            tk.Label(bar, text=label).pack(side='left', padx=(8, 2), pady=6)
+            box = ttk.Combobox(bar, textvariable=var, values=[ALL] + self.model.distinct(col), state='readonly',
+                               width=36 if col == 'check_id' else 10)
+            box.pack(side='left')
+            box.bind('<<ComboboxSelected>>', lambda e: self._requery())
+        tk.Label(bar, text='Search:').pack(side='left', padx=(12, 2))
+        entry = tk.Entry(bar, textvariable=self.search_var, width=30); entry.pack(side='left')
+        self.search_var.trace_add('write', lambda *a: self._schedule_search())
+        tk.Label(bar, textvariable=self.status, anchor='w').pack(side='left', padx=12)
+
+        container = tk.Frame(self); container.pack(fill='both', expand=True)
+        self.tree = ttk.Treeview(container, columns=self.columns, show='headings', selectmode='browse')
+        self.vsb = ttk.Scrollbar(container, orient='vertical', command=self._on_scrollbar)
+        hsb = ttk.Scrollbar(container, orient='horizontal', command=self.tree.xview)
+        self.tree.configure(xscrollcommand=hsb.set)
+        for col in self.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self._sort_by(c))
+        self._autosize(df)
+        self.tree.grid(row=0, column=0, sticky='nsew'); self.vsb.grid(row=0, column=1, sticky='ns'); hsb.grid(row=1, column=0, sticky='ew')
+        container.grid_rowconfigure(0, weight=1); container.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', lambda e: self._render())
+        self.tree.bind('<MouseWheel>', lambda e: self._scroll(-1 if e.delta > 0 else 1, 'units') or 'break')
+        self.tree.bind('<Button-4>', lambda e: self._scroll(-1, 'units') or 'break')
+        self.tree.bind('<Button-5>', lambda e: self._scroll(1, 'units') or 'break')
+        for key, args in (('<Prior>', (-1, 'pages')), ('<Next>', (1, 'pages')), ('<Up>', (-1, 'units')), ('<Down>', (1, 'units'))):
+            self.tree.bind(key, lambda e, a=args: self._scroll(*a) or 'break')
+        self.tree.bind('<Home>', lambda e: self._goto(0) or 'break')
+        self.tree.bind('<End>', lambda e: self._goto(len(self.model)) or 'break')
+        self._update_status()
+
+    # -------------- Rendering --------------
+    def _autosize(self, df: pd.DataFrame) -> None:
+        sample = df.head(200)
+        for col, name in zip(df.columns, self.columns):
+            maxlen = max([len(str(x)) for x in sample[col].tolist()] + [len(name)])
+            self.tree.column(name, width=min(380, max(100, int(maxlen * 7))), anchor='w')
+
+    def _visible_rows(self) -> int:
+        return max(1, self.tree.winfo_height() // self.ROW_HEIGHT - 1)
+
+    def _render(self) -> None:
+        n_visible, total = self._visible_rows(), len(self.model)
+        self._top = max(0, min(self._top, total - n_visible))
+        rows = self.model.rows(self._top, n_visible)
+        items = self.tree.get_children()
+        for iid in items[len(rows):]:
+            self.tree.delete(iid)
+        for i, values in enumerate(rows):
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert('', 'end', values=values)
+        if total:
+            self.vsb.set(self._top / total, min(1.0, (self._top + len(rows)) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _goto(self, top: int) -> None:
+        self._top = top
+        self._render()
+
+    def _scroll(self, amount: int, what: str) -> None:
+        step = self._visible_rows() if what == 'pages' else 3 if what == 'units' else 1
+        self._goto(self._top + int(amount) * step)
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        if action == 'moveto':
+            self._goto(int(float(args[0]) * len(self.model)))
+        elif action == 'scroll':
+            self._scroll(int(args[0]), args[1])
+
+    # -------------- Filter / sort (worker thread) --------------
+    def _update_status(self, busy: bool = False) -> None:
+        total = len(self.model.df)
+        shown = len(self.model)
+        self.status.set('Working...' if busy else (f'{shown:,} of {total:,} rows' if shown != total else f'{total:,} rows'))
+
+    def _schedule_search(self) -> None:
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._requery)
+
+    def _sort_by(self, col: str) -> None:
+        current, ascending = self._sort
+        self._sort = (col, not ascending if current == col else True)
+        for c in self.columns:
+            arrow = (' ▲' if self._sort[1] else ' ▼') if c == col else ''
+            self.tree.heading(c, text=c + arrow)
+        self._requery()
+
+    def _requery(self) -> None:
+        self._search_job = None
+        self._generation += 1
+        gen = self._generation
+        filters = {'check_id': self.check_var.get(), 'severity': self.severity_var.get()}
+        text, (sort_col, ascending) = self.search_var.get().strip(), self._sort
+        self._update_status(busy=True)
+
+        def _work():
+            try:
+                positions = self.model.query(filters, text, sort_col, ascending)
+            except Exception as e:
+                self.after(0, lambda e=e: self.status.set(f'Error: {e}'))
+                return
+            self.after(0, lambda: self._apply(gen, positions))
+        threading.Thread(target=_work, daemon=True).start()
+
+    def _apply(self, gen: int, positions: np.ndarray) -> None:
+        if gen != self._generation or not self.winfo_exists():
+            return  # superseded by a newer request, or the window was closed
+        self.model.set_view(positions)
+        self._top = 0
+        self._render()
+        self._update_status()
@@ -0,0 +1,303 @@
+# Declarative rules: checks defined in a TOML (or YAML) file and compiled to vectorized mask checks
+from __future__ import annotations
+from abc import ABCMeta
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+import copyreg
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+from checks.base import BaseCheck, Tables
+from models import FindingBatch
+import registry
+from registry import read_rule_specs, rule_class_name, rule_description
+from run_context import RunContext
+
+# Type-specific settings each rule type accepts, with their defaults
+RULE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    'not_null': {},
+    'regex': {'pattern': None, 'ignore_case': True, 'allow_blank': False},
+    'date_range': {'min': None, 'max': None},
+    'allowed_values': {'values': None, 'ignore_case': True, 'allow_blank': True},
+    'exists': {'ref_table': None, 'ref_column': None, 'min_count': 1, 'require': True},
+}
+_COMMON_KEYS = {'id', 'table', 'type', 'column', 'columns', 'severity', 'message', 'name', 'description',
+                'key', 'expected', 'where'}
+
+@dataclass(frozen=True)
+class Rule:
+    """One rule from a rules file (see checks/rules.toml for the format)."""
+    id: str
+    table: str
+    type: str
+    columns: Tuple[str, ...]
+    severity: str = 'ERROR'
+    message: str = ''
+    name: str = ''
+    description: str = ''
+    key: str = 'UNITID'
+    expected: Optional[str] = None
+    where_col: Optional[str] = None
+    where_values: Tuple[str, ...] = ()
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    def option(self, name: str) -> Any:
+        return dict(self.options).get(name, RULE_OPTIONS[self.type].get(name))
+
+def _frozen(value: Any) -> Any:
+    # Lists from the file become tuples so rules stay hashable
+    return tuple(_frozen(v) for v in value) if isinstance(value, (list, tuple)) else value
+
+def parse_rule(spec: Dict[str, Any]) -> Rule:
+    """Validate one rule mapping from a rules file and return it as a Rule."""
+    rid = spec.get('id')
+    if not rid or not isinstance(rid, str):
+        raise ValueError(f'Rule without an id: {spec!r}')
+    rtype = spec.get('type')
+    if rtype not in RULE_OPTIONS:
+        raise ValueError(f"Rule {rid}: unknown type {rtype!r} (expected one of {', '.join(RULE_OPTIONS)})")
+    if not spec.get('table'):
+        raise ValueError(f'Rule {rid}: table is required')
+    unknown = set(spec) - _COMMON_KEYS - set(RULE_OPTIONS[rtype])
+    if unknown:
+        raise ValueError(f"Rule {rid}: unknown setting(s) for a {rtype} rule: {', '.join(sorted(unknown))}")
+    key = spec.get('key', 'UNITID')
+    columns = _frozen(spec.get('columns') or ([spec['column']] if spec.get('column') else []))
+    if rtype == 'exists':
+        columns = columns or (key,)
+    if not columns:
+        raise ValueError(f'Rule {rid}: column or columns is required')
+    options = {k: _frozen(spec[k]) for k in RULE_OPTIONS[rtype] if k in spec}
+    missing = [k for k, default in RULE_OPTIONS[rtype].items() if default is None and k not in options
+               and not (rtype == 'date_range' and ('min' in options or 'max' in options))]
+    if missing:
+        raise ValueError(f"Rule {rid}: {rtype} rules need {', '.join(missing)}")
+    if rtype == 'regex':
+        for p in ([options['pattern']] if isinstance(options['pattern'], str) else options['pattern']):
+            re.compile(p)
+    if rtype == 'date_range':
+        # Bounds are parsed again at run time, so a typo fails here rather than mid-run
+        for bound in ('min', 'max'):
+            try:
+                _date_bound(options.get(bound))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f'Rule {rid}: invalid {bound} date {options[bound]!r} ({e})') from None
+    where = spec.get('where') or {}
+    if where and (not where.get('column') or 'values' not in where):
+        raise ValueError(f'Rule {rid}: where needs a column and values')
+    return Rule(rid, spec['table'], rtype, columns, severity=spec.get('severity', 'ERROR'),
+                message=spec.get('message') or f'{rtype} rule {rid} failed.', name=spec.get('name', ''),
+                description=spec.get('description', ''), key=key, expected=spec.get('expected'),
+                where_col=where.get('column'), where_values=_frozen(where.get('values', ())),
+                options=tuple(sorted(options.items())))
+
+def read_rules_file(path: str) -> List[Rule]:
+    """Rules from a .toml file ([[rule]] tables) or a .yaml/.yml file (a 'rules' list)."""
+    return [parse_rule(s) for s in read_rule_specs(path)]
+
+# -------------- Vectorized evaluation --------------
+
+# One rule's result on one column: (field, failing-row mask, current values or None)
+Hit = Tuple[str, np.ndarray, Optional[pd.Series]]
+
+def _date_bound(value: str | None) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    return pd.Timestamp.today().normalize() if str(value).lower() == 'today' else pd.Timestamp(value)
+
+def _not_null(ctx: RunContext, rule: Rule, col: str) -> Hit:
+    return col, ctx.view(rule.table, col, 'blank').to_numpy(dtype=bool), None
+
+def _regex(ctx: RunContext, rule: Rule, col: str) -> Hit:
+    from checks.check_unitno_format import match_any_pattern
+    patterns = rule.option('pattern')
+    patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+    valid, normalized = match_any_pattern(ctx[rule.table][col], patterns, re.IGNORECASE if rule.option('ignore_case') else 0)
+    bad = ~valid
+    if rule.option('allow_blank'):
+        bad &= normalized != ''
+    return col, bad, pd.Series(np.where(normalized == '', None, normalized))
+
+def _date_range(ctx: RunContext, rule: Rule, col: str) -> Hit:
+    # Nulls and unparseable dates are not flagged, as in INSTALL_DATE_FUTURE (use not_null for those)
+    dates = ctx.view(rule.table, col, 'datetime')
+    lo, hi = _date_bound(rule.option('min')), _date_bound(rule.option('max'))
+    bad = pd.Series(False, index=dates.index)
+    if lo is not None:
+        bad |= dates < lo
+    if hi is not None:
+        bad |= dates > hi
+    return col, (bad & dates.notna()).to_numpy(dtype=bool), ctx.view(rule.table, col, 'str')
+
+def _allowed_values(ctx: RunContext, rule: Rule, col: str) -> Hit:
+    fold = rule.option('ignore_case')
+    allowed = [str(v).strip().casefold() if fold else str(v).strip() for v in rule.option('values')]
+    values = ctx.view(rule.table, col, 'casefold' if fold else 'strip')
+    bad = ~values.isin(allowed).to_numpy(dtype=bool, na_value=False)
+    if rule.option('allow_blank'):
+        bad &= ~ctx.view(rule.table, col, 'blank').to_numpy(dtype=bool)
+    return col, bad, ctx.view(rule.table, col, 'strip')
+
+def _exists(ctx: RunContext, rule: Rule, col: str) -> Hit:
+    counts = ctx.match_counts(rule.table, col, rule.option('ref_table'), rule.option('ref_column'))
+    n = rule.option('min_count')
+    return col, counts < n if rule.option('require') else counts >= n, None
+
+EVALUATORS = {'not_null': _not_null, 'regex': _regex, 'date_range': _date_range,
+              'allowed_values': _allowed_values, 'exists': _exists}
+
+def _expected(rule: Rule) -> Optional[str]:
+    if rule.expected is not None or rule.type == 'not_null':
+        return rule.expected
+    if rule.type == 'regex':
+        p = rule.option('pattern')
+        return p if isinstance(p, str) else ' | '.join(p)
+    if rule.type == 'date_range':
+        return ' .. '.join(str(rule.option(k) or '') for k in ('min', 'max'))
+    if rule.type == 'allowed_values':
+        return ', '.join(map(str, rule.option('values')))
+    return f"{'At least' if rule.option('require') else 'Fewer than'} {rule.option('min_count')} matching {rule.option('ref_table')} record(s)"
+
+def _missing(ctx: RunContext, rule: Rule) -> Optional[FindingBatch]:
+    # Same '(DATASET)' errors as the hand-written checks
+    if rule.table not in ctx:
+        return FindingBatch.dataset_error(rule.id, f'Missing table: {rule.table}', field=rule.table)
+    needed = list(dict.fromkeys([rule.key, *rule.columns, *([rule.where_col] if rule.where_col else [])]))
+    miss = [c for c in needed if c not in ctx[rule.table].columns]
+    if miss:
+        return FindingBatch.dataset_error(rule.id, 'Missing column(s): ' + ', '.join(miss), field=','.join(miss))
+    if rule.type == 'exists':
+        ref, ref_col = rule.option('ref_table'), rule.option('ref_column')
+        if ref not in ctx:
+            return FindingBatch.dataset_error(rule.id, f'Missing table: {ref}', field=ref)
+        if ref_col not in ctx[ref].columns:
+            return FindingBatch.dataset_error(rule.id, f'Missing column in {ref}: {ref_col}', field=ref_col)
+    return None
+
+def evaluate_rule(ctx: RunContext, rule: Rule) -> FindingBatch:
+    """Findings of one rule, one per failing (row, column)."""
+    missing = _missing(ctx, rule)
+    if missing is not None:
+        return missing
+    applies = None
+    if rule.where_col:
+        applies = ctx.view(rule.table, rule.where_col, 'casefold').isin(
+            [str(v).strip().casefold() for v in rule.where_values]).to_numpy(dtype=bool, na_value=False)
+        if not applies.any():
+            return FindingBatch()
+    unitids = ctx.view(rule.table, rule.key, 'strip').where(~ctx.view(rule.table, rule.key, 'isna'), '(UNKNOWN)')
+    batches = []
+    for col in rule.columns:
+        field, bad, current = EVALUATORS[rule.type](ctx, rule, col)
+        if applies is not None:
+            bad = bad & applies
+        if bad.any():
+            batches.append(FindingBatch.from_mask(unitids[bad], None, rule.id, rule.severity, rule.message, field=field,
+                                                  current_value=None if current is None else current[bad],
+                                                  expected=_expected(rule)))
+    return FindingBatch.concat(batches)
+
+def rule_tables(rule: Rule) -> Tuple[str, ...]:
+    """Tables a rule reads: its own, then the reference table of an 'exists' rule."""
+    return (rule.table, rule.option('ref_table')) if rule.type == 'exists' else (rule.table,)
+
+def evaluate_table(ctx: RunContext, table: str, rules: Tuple[Rule, ...]) -> Dict[str, FindingBatch]:
+    """
+    Evaluate every rule on one table in a single pass and memoize the results in the run context.
+
+    The first rule check of a table to run computes the findings of all its sibling rules
+    (sharing the context's normalized column views); the others pick theirs up from the memo.
+    The memo key names every table the rules read, so replacing any of them evicts it.
+    """
+    tables = tuple(dict.fromkeys(t for r in rules for t in rule_tables(r)))
+    return ctx.memo(('rules', *tables, rules), lambda: {r.id: evaluate_rule(ctx, r) for r in rules})
+
+# -------------- Compiled checks --------------
+
+class RuleCheckMeta(ABCMeta):
+    """Metaclass of compiled rule checks, so they pickle as their rule (see _reduce_rule_check)."""
+
+def _reduce_rule_check(cls: type):
+    # Compiled classes aren't importable by name; process workers rebuild them from the rule
+    if getattr(cls, 'rule', None) is None:
+        return cls.__qualname__
+    return compile_rule, (cls.rule, cls.group)
+
+copyreg.pickle(RuleCheckMeta, _reduce_rule_check)
+
+class RuleCheck(BaseCheck, metaclass=RuleCheckMeta):
+    """
+    Check compiled from a Rule. group holds every rule of the file reading the same tables
+    (rule_tables); they are evaluated together (evaluate_table), so the table is scanned once
+    for all of them, and a group never runs before all of its tables are loaded.
+    """
+    rule: Optional[Rule] = None
+    group: Tuple[Rule, ...] = ()
+    row_local = True
+
+    def requires(self) -> Dict[str, List[str]]:
+        r = self.rule
+        out = {r.table: list(dict.fromkeys([r.key, *r.columns, *([r.where_col] if r.where_col else [])]))}
+        if r.type == 'exists':
+            out.setdefault(r.option('ref_table'), []).append(r.option('ref_column'))
+        return out
+
+    def datetime_columns(self) -> List[str]:
+        # The whole group is evaluated together, so its date_range columns are all parsed
+        return list(dict.fromkeys(c for r in self.group if r.type == 'date_range' and r.table == self.rule.table
+                                  for c in r.columns))
+
+    def reference_keys(self) -> List[Tuple[str, str]]:
+        return [(self.rule.option('ref_table'), self.rule.option('ref_column'))] if self.rule.type == 'exists' else []
+
+    def cache_token(self) -> str:
+        # The rule and its group are the check's definition (edits keep the id and columns), and
+        # bounds relative to today expire at midnight
+        today = ''
+        if self.rule.type == 'date_range' and 'today' in (str(self.rule.option('min')).lower(), str(self.rule.option('max')).lower()):
+            today = pd.Timestamp.today().normalize().isoformat()
+        return repr((self.rule, self.group, today))
+
+    def run_batch(self, tables: Tables) -> FindingBatch:
+        ctx = RunContext.wrap(tables)
+        return evaluate_table(ctx, self.rule.table, self.group)[self.rule.id]
+
+def compile_rule(rule: Rule, group: Tuple[Rule, ...] = ()) -> Type[RuleCheck]:
+    """A RuleCheck subclass for one rule (group: the rules evaluated together with it)."""
+    return RuleCheckMeta(rule_class_name(rule.id), (RuleCheck,), {
+        '__module__': __name__, 'check_id': rule.id, 'name': rule.name or rule.id,
+        'description': rule.description or rule_description(rule.type, rule.table, rule.columns),
+        'severity_default': rule.severity, 'rule': rule, 'group': group or (rule,),
+    })
+
+def compile_rules(rules: Sequence[Rule]) -> Dict[str, Type[RuleCheck]]:
+    """
+    One check class per rule; rules reading the same tables are fused into one evaluation group.
+    'exists' rules form their own group per reference table, so rules on the table alone can run
+    (e.g. in engine.run_pipelined) before the reference table has loaded.
+    """
+    seen = set()
+    for r in rules:
+        if r.id in seen:
+            raise ValueError(f'Duplicate rule id: {r.id}')
+        seen.add(r.id)
+    groups = {key: tuple(r for r in rules if rule_tables(r) == key) for key in dict.fromkeys(map(rule_tables, rules))}
+    return {r.id: compile_rule(r, groups[rule_tables(r)]) for r in rules}
+
+_lock = threading.Lock()
+_compiled: Dict[str, Tuple[Tuple[int, int], Dict[str, Type[RuleCheck]]]] = {}
+
+def rule_checks(path: str | None = None) -> Dict[str, Type[RuleCheck]]:
+    """Compiled checks of a rules file (default registry.RULES_PATH), recompiled when the file changes."""
+    path = path or registry.RULES_PATH
+    if not os.path.isfile(path):
+        return {}
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        cached = _compiled.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = _compiled[path] = (stamp, compile_rules(read_rules_file(path)))
+        return dict(cached[1])
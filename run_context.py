@@ -0,0 +1,158 @@
+# Run-scoped tables plus memoized normalized column views shared by every check in a run
+from __future__ import annotations
+from typing import Callable, Dict, Hashable, Mapping, Tuple
+import threading
+import numpy as np
+import pandas as pd
+
+def _to_str(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return ctx[table][column].astype(str)
+
+def _strip(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return ctx.view(table, column, 'str').str.strip()
+
+def _casefold(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return ctx.view(table, column, 'strip').str.casefold()
+
+def _key(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    # Nulls must stay null (never a 'nan' key) whatever astype(str) makes of them
+    strip, isna = ctx.view(table, column, 'strip'), ctx.view(table, column, 'isna')
+    return strip.mask(isna) if (isna & strip.notna()).any() else strip
+
+def _datetime(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return pd.to_datetime(ctx[table][column], errors='coerce')
+
+def _isna(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return ctx[table][column].isna()
+
+def _blank(ctx: 'RunContext', table: str, column: str) -> pd.Series:
+    return ctx.view(table, column, 'isna') | (ctx.view(table, column, 'strip') == '')
+
+# Named column transforms available through RunContext.view()
+TRANSFORMS: Dict[str, Callable[['RunContext', str, str], pd.Series]] = {
+    'str': _to_str,            # astype(str)
+    'strip': _strip,           # astype(str).str.strip()
+    'casefold': _casefold,     # astype(str).str.strip().str.casefold()
+    'key': _key,               # 'strip', with the column's nulls as NaN (join keys)
+    'datetime': _datetime,     # pd.to_datetime(errors='coerce')
+    'isna': _isna,             # null mask
+    'blank': _blank,           # null or blank after stripping
+}
+
+class KeyIndex:
+    """
+    Hash index over one reference column: its distinct stripped keys and how many rows carry
+    each. Built from the column's 'key' view, whose nulls stay NaN and are left out, in a
+    single pass (a factorize), and shared by every rule that joins against that column.
+    """
+    __slots__ = ('keys', 'counts')
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        self.keys = pd.Index(uniques)
+        self.counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def count(self, values: pd.Series) -> np.ndarray:
+        """Number of reference rows matching each value (0 for nulls and unknown keys)."""
+        pos = self.keys.get_indexer(values)
+        # Trailing 0 for misses, so an empty index (no reference rows) still takes cleanly
+        return np.append(self.counts, 0)[pos]
+
+class RunContext(dict):
+    """
+    The tables of one run (a dict of name -> DataFrame) plus memoized derived views.
+
+    Checks receive it in place of the plain tables dict, so existing code keeps working.
+    view(table, column, transform) computes each normalized column once per run and shares
+    it across checks (and threads); key_index() caches reference key indexes such as the
+    CABLENOD LINK_IDs, and match_counts() the per-row match counts against them. Replacing
+    or deleting a table evicts everything derived from it; clear_views() evicts everything at
+    the end of a run.
+    """
+
+    def __init__(self, tables: Mapping[str, pd.DataFrame] | None = None):
+        super().__init__(tables or {})
+        self._views: Dict[Tuple[Hashable, ...], object] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+
+    @classmethod
+    def wrap(cls, tables: Mapping[str, pd.DataFrame]) -> 'RunContext':
+        """tables itself if it is already a RunContext, otherwise a new context over it."""
+        return tables if isinstance(tables, RunContext) else cls(tables)
+
+    def __reduce__(self):
+        # Process pools get the tables only; each worker builds its own views
+        return (RunContext, (dict(self),))
+
+    def __setitem__(self, table: str, df: pd.DataFrame) -> None:
+        super().__setitem__(table, df)
+        self._evict(table)
+
+    def __delitem__(self, table: str) -> None:
+        super().__delitem__(table)
+        self._evict(table)
+
+    def _evict(self, table: str) -> None:
+        with self._lock:
+            # Match counts depend on two tables, so any key naming the table goes
+            for key in [k for k in self._views if table in k[1:]]:
+                del self._views[key]
+
+    def _memo(self, key: Tuple[Hashable, ...], compute: Callable[[], object]):
+        with self._lock:
+            if key in self._views:
+                return self._views[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Compute outside the global lock so different views build in parallel,
+        # but only once per key even if several checks ask at the same time
+        with key_lock:
+            with self._lock:
+                if key in self._views:
+                    return self._views[key]
+            value = compute()
+            with self._lock:
+                self._views[key] = value
+            return value
+
+    def memo(self, key: Tuple[Hashable, ...], compute: Callable[[], object]):
+        """
+        compute() memoized under key for the rest of the run (built once, even across threads).
+        key[1:] should name the tables the value depends on, so replacing one evicts it.
+        """
+        return self._memo(key, compute)
+
+    def view(self, table: str, column: str, transform: str) -> pd.Series:
+        """Normalized view of tables[table][column] (see TRANSFORMS), built once per run."""
+        fn = TRANSFORMS[transform]
+        return self._memo(('view', table, column, transform), lambda: fn(self, table, column))
+
+    def set_view(self, table: str, column: str, transform: str, values: pd.Series) -> None:
+        """Provide a view computed elsewhere (e.g. over the whole column of a partitioned table)."""
+        with self._lock:
+            self._views[('view', table, column, transform)] = values
+
+    def key_values(self, table: str, column: str) -> pd.Index:
+        """Distinct stripped, non-null values of a column, for fast isin() membership tests."""
+        return self.key_index(table, column).keys
+
+    def key_index(self, table: str, column: str) -> KeyIndex:
+        """KeyIndex of a column's stripped values, built once per run."""
+        return self._memo(('keys', table, column), lambda: KeyIndex(self.view(table, column, 'key')))
+
+    def match_counts(self, table: str, column: str, ref_table: str, ref_column: str) -> np.ndarray:
+        """
+        For each row of table, how many ref_table rows have ref_column equal to its column
+        (both stripped). Shared by every rule over the same key pair, whatever its predicate.
+        """
+        return self._memo(('matches', table, column, ref_table, ref_column),
+                          lambda: self.key_index(ref_table, ref_column).count(self.view(table, column, 'key')))
+
+    def clear_views(self) -> None:
+        """Evict every cached view (called at the end of a run)."""
+        with self._lock:
+            self._views.clear()
+            self._key_locks.clear()
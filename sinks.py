@@ -0,0 +1,288 @@
+# Streaming findings sinks: the engine pushes each check's FindingBatch here as soon as it completes
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+import gzip
+import io
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from models import FINDING_COLUMNS, FindingBatch
+from reporting import AssetEnricher, findings_to_dataframe
+
+Enrich = Callable[[pd.DataFrame], pd.DataFrame]
+
+class FindingSink(ABC):
+    """
+    Receives finding batches while a run is in progress.
+
+    write() converts the batch to rows, applies the optional per-batch enrichment (e.g. an
+    AssetEnricher) and hands the frame to _write_frame(). Each write is flushed, so readers
+    can consume partial results before the run ends. Sinks are context managers; close()
+    finalizes the output (and writes an empty one with headers if nothing arrived).
+    """
+
+    def __init__(self, enrich: Enrich | None = None):
+        self.enrich = enrich
+        self.rows_written = 0
+        self.batches_written = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.enrich.columns) if isinstance(self.enrich, AssetEnricher) else list(FINDING_COLUMNS)
+
+    def write(self, batch: FindingBatch) -> None:
+        df = findings_to_dataframe(batch)
+        if self.enrich is not None:
+            df = self.enrich(df)
+        if df.empty:
+            return
+        with self._lock:
+            self._write_frame(df)
+            self.rows_written += len(df)
+            self.batches_written += 1
+
+    def check_finished(self, check_id: str, findings: int) -> None:
+        """Called once per check after its last batch (even with no findings); progress hook."""
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._close()
+
+    @abstractmethod
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        """Write one non-empty (enriched) frame of findings; called under the sink's lock."""
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'FindingSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class ParquetSink(FindingSink):
+    """
+    One Parquet file, one row group per batch. Every column is written as (nullable) string:
+    current_value/expected hold whatever the checks found (numbers, dates, text), so a schema
+    inferred from one batch would reject the next one.
+    """
+
+    def __init__(self, path: str, enrich: Enrich | None = None, compression: str = 'snappy'):
+        super().__init__(enrich)
+        self.path = path
+        self.compression = compression
+        self._writer = None
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.schema([pa.field(c, pa.string()) for c in df.columns])
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, schema, compression=self.compression)
+        cols = {c: df[c] if isinstance(df[c].dtype, pd.StringDtype) else df[c].map(str, na_action='ignore')
+                for c in df.columns}
+        self._writer.write_table(pa.Table.from_pandas(pd.DataFrame(cols), schema=schema, preserve_index=False))
+
+    def _close(self) -> None:
+        if self._writer is None:
+            pd.DataFrame({c: pd.Series(dtype='str') for c in self.columns}).to_parquet(self.path, index=False)
+        else:
+            self._writer.close()
+
+class CsvGzSink(FindingSink):
+    """Gzip-compressed CSV (plain CSV if the path doesn't end in .gz); header once, rows appended per batch."""
+
+    def __init__(self, path: str, enrich: Enrich | None = None):
+        super().__init__(enrich)
+        self.path = path
+        raw = gzip.open(path, 'wb') if path.endswith('.gz') else open(path, 'wb')
+        self._f = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        self._header = True
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        df.to_csv(self._f, index=False, header=self._header)
+        self._header = False
+        self._f.flush()
+
+    def _close(self) -> None:
+        if self._header:
+            pd.DataFrame(columns=self.columns).to_csv(self._f, index=False)
+        self._f.close()
+
+class JsonLinesSink(FindingSink):
+    """One JSON object per finding; readers can tail the file while the run is going."""
+
+    def __init__(self, path: str, enrich: Enrich | None = None):
+        super().__init__(enrich)
+        self.path = path
+        self._f = open(path, 'w', encoding='utf-8')
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        text = df.to_json(orient='records', lines=True, date_format='iso')
+        self._f.write(text if text.endswith('\n') else text + '\n')
+        self._f.flush()
+
+    def _close(self) -> None:
+        self._f.close()
+
+class SqliteSink(FindingSink):
+    """
+    Appends findings to a table of an SQLite database, committing per batch. The table is
+    replaced when the sink opens unless append=True.
+    """
+
+    def __init__(self, path: str, table: str = 'findings', enrich: Enrich | None = None, append: bool = False):
+        super().__init__(enrich)
+        self.path = path
+        self.table = table
+        # The sink may be written from another thread than the one that opened it; writes are serialized by its lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if not append:
+            self._conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._conn.commit()
+        self._created = append
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        df.to_sql(self.table, self._conn, if_exists='append', index=False)
+        self._conn.commit()
+        self._created = True
+
+    def _close(self) -> None:
+        if not self._created:
+            pd.DataFrame(columns=self.columns).to_sql(self.table, self._conn, if_exists='append', index=False)
+            self._conn.commit()
+        self._conn.close()
+
+class SummarySink(FindingSink):
+    """Keeps only counts per check and per (check_id, severity), for runs that don't keep findings."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.by_check: Dict[str, int] = {}
+        self.by_check_severity: Dict[Tuple[str, str], int] = {}
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        for (cid, sev), n in df.groupby(['check_id', 'severity'], dropna=False, sort=False).size().items():
+            self.by_check[cid] = self.by_check.get(cid, 0) + int(n)
+            self.by_check_severity[(cid, sev)] = self.by_check_severity.get((cid, sev), 0) + int(n)
+
+    @property
+    def by_severity(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for (_, sev), n in self.by_check_severity.items():
+            out[str(sev)] = out.get(str(sev), 0) + n
+        return out
+
+class ProgressSink(FindingSink):
+    """Calls on_check(check_id, findings) as each check completes; writes nothing."""
+
+    def __init__(self, on_check: Callable[[str, int], None]):
+        super().__init__(None)
+        self.on_check = on_check
+
+    def write(self, batch: FindingBatch) -> None:
+        pass
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        # Unused: write() ignores the findings
+        pass
+
+    def check_finished(self, check_id: str, findings: int) -> None:
+        self.on_check(check_id, findings)
+
+class FrameSink(FindingSink):
+    """Keeps the (enriched) findings in memory, so output is built while other checks still run."""
+
+    def __init__(self, enrich: Enrich | None = None):
+        super().__init__(enrich)
+        self._frames: List[pd.DataFrame] = []
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        self._frames.append(df)
+
+    def frame(self, check_order: List[str] | None = None) -> pd.DataFrame:
+        """
+        Everything written so far as one frame, in arrival order or, with check_order, grouped
+        by check in that order (e.g. the selected ids, to match a non-streamed run).
+        """
+        with self._lock:
+            frames = list(self._frames)
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+        if check_order:
+            rank = pd.Categorical(df['check_id'], categories=list(dict.fromkeys(check_order))).codes
+            df = df.take(np.argsort(np.where(rank < 0, len(check_order), rank), kind='stable')).reset_index(drop=True)
+        return df
+
+class DeferredSink(FindingSink):
+    """
+    Holds batches for another sink until release(), then writes them and passes every later
+    batch straight through. For pipelined runs whose enrichment needs a table that is still
+    loading: release(AssetEnricher(...)) once ASSETS has loaded. Closing releases anything
+    still held, unenriched. Counts (rows_written, ...) are the wrapped sink's.
+    """
+
+    def __init__(self, sink: FindingSink):
+        super().__init__(None)
+        self.sink = sink
+        self._held: List[FindingBatch] = []
+        self._released = False
+
+    @property
+    def columns(self) -> List[str]:
+        return self.sink.columns
+
+    def write(self, batch: FindingBatch) -> None:
+        with self._lock:
+            if not self._released:
+                self._held.append(batch)
+                return
+        self.sink.write(batch)
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        # Unused: write() hands whole batches to the wrapped sink
+        pass
+
+    def release(self, enrich: Enrich | None = None) -> None:
+        with self._lock:
+            if enrich is not None:
+                self.sink.enrich = enrich
+            self._released = True
+            held, self._held = self._held, []
+        for batch in held:
+            self.sink.write(batch)
+
+    def close(self) -> None:
+        if not self._released:
+            self.release()
+        self.sink.close()
+
+# File extension -> sink format, for open_sink()
+SINK_FORMATS = {'.parquet': 'parquet', '.gz': 'csv', '.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl',
+                '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}
+
+def sink_format(path: str) -> Optional[str]:
+    """Streaming format for a path ('parquet', 'csv', 'jsonl', 'sqlite'), or None if it has no sink."""
+    return SINK_FORMATS.get(os.path.splitext(path)[1].lower())
+
+def open_sink(path: str, fmt: str | None = None, enrich: Enrich | None = None) -> FindingSink:
+    """A sink for path, with the format taken from fmt or the file extension."""
+    fmt = fmt or sink_format(path)
+    if fmt == 'parquet':
+        return ParquetSink(path, enrich)
+    if fmt == 'csv':
+        return CsvGzSink(path, enrich)
+    if fmt == 'jsonl':
+        return JsonLinesSink(path, enrich)
+    if fmt == 'sqlite':
+        return SqliteSink(path, enrich=enrich)
+    raise ValueError(f'No streaming sink for {path!r}')
@@ -0,0 +1,116 @@
+# Local columnar snapshot cache of query results, sitting in front of load_dataset_odbc
+from __future__ import annotations
+from typing import Optional, Tuple
+import hashlib
+import json
+import os
+import time
+import warnings
+import pandas as pd
+import pyarrow.feather as feather
+from loading import Loader
+
+# Default cache location (relative to the working directory, like checks.csv)
+DEFAULT_SNAPSHOT_DIR = '.snapshots'
+# Default time-to-live of a snapshot in seconds (None = never expires)
+DEFAULT_TTL = 12 * 3600
+
+class SnapshotCache:
+    """
+    Feather snapshots of query results on local disk, keyed by connection string + SQL text.
+
+    Snapshots are written uncompressed so warm loads can memory-map them instead of going
+    back to the ODBC source. A sidecar JSON file records when each snapshot was taken.
+    """
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_DIR, ttl: Optional[float] = DEFAULT_TTL):
+        """
+        Args:
+            root: Directory holding the snapshot files
+            ttl: Maximum snapshot age in seconds before it is refetched (None = never expires)
+        """
+        self.root = root
+        self.ttl = ttl
+
+    @staticmethod
+    def key(conn_str: str, sql: str) -> str:
+        # The connection string is only hashed, never written to disk
+        return hashlib.sha256(f'{conn_str.strip()}\0{sql.strip()}'.encode('utf-8')).hexdigest()[:32]
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, key)
+        return base + '.feather', base + '.json'
+
+    def info(self, conn_str: str, sql: str) -> Optional[dict]:
+        """Metadata of the stored snapshot (created, rows, columns, sql), or None if there is none."""
+        data_path, meta_path = self._paths(self.key(conn_str, sql))
+        if not (os.path.isfile(data_path) and os.path.isfile(meta_path)):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def get(self, conn_str: str, sql: str, allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame, or None if there is no snapshot or it is older than ttl.
+
+        Args:
+            allow_stale: Ignore ttl and return whatever snapshot exists (offline use)
+        """
+        meta = self.info(conn_str, sql)
+        if meta is None:
+            return None
+        if not allow_stale and self.ttl is not None and time.time() - meta['created'] > self.ttl:
+            return None
+        data_path, _ = self._paths(self.key(conn_str, sql))
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+
+    def put(self, conn_str: str, sql: str, df: pd.DataFrame) -> None:
+        """Store df as the snapshot for (conn_str, sql), replacing any previous one atomically."""
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(self.key(conn_str, sql))
+        tmp = data_path + '.tmp'
+        feather.write_feather(df.reset_index(drop=True), tmp, compression='uncompressed')
+        os.replace(tmp, data_path)
+        meta = {'created': time.time(), 'rows': len(df), 'columns': [str(c) for c in df.columns], 'sql': sql}
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=1)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def load(self, conn_str: str, sql: str, loader: Loader, refresh: bool = False, offline: bool = False) -> pd.DataFrame:
+        """
+        Return the snapshot if it is fresh, otherwise fetch with loader and store the result.
+
+        Args:
+            loader: Function used on a cache miss: (conn_str, sql) -> DataFrame
+            refresh: Always refetch from the source and overwrite the snapshot
+            offline: Never contact the source; use the last snapshot whatever its age
+        """
+        if offline:
+            df = self.get(conn_str, sql, allow_stale=True)
+            if df is None:
+                raise LookupError('No local snapshot available for this query (offline mode)')
+            return df
+        if not refresh:
+            df = self.get(conn_str, sql)
+            if df is not None:
+                return df
+        df = loader(conn_str, sql)
+        try:
+            self.put(conn_str, sql, df)
+        except Exception as e:  # caching is best-effort; the freshly loaded data is still returned
+            warnings.warn(f'Could not write snapshot: {e}')
+        return df
+
+    def wrap(self, loader: Loader, refresh: bool = False, offline: bool = False) -> Loader:
+        """Cached version of loader, for loading.load_all_tables(loader=...)."""
+        def _load(conn_str: str, sql: str) -> pd.DataFrame:
+            return self.load(conn_str, sql, loader, refresh=refresh, offline=offline)
+        return _load
+
+    def clear(self) -> None:
+        """Delete every snapshot in the cache directory."""
+        if not os.path.isdir(self.root):
+            return
+        for fname in os.listdir(self.root):
+            if fname.endswith(('.feather', '.json')):
+                os.remove(os.path.join(self.root, fname))
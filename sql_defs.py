@@ -27,3 +27,24 @@ ALL_TABLE_SQL = {
     'ASSETS': ASSETS_SQL,
     'CABLENOD': CABLENOD_SQL,
 }
+
+# Columns each table's SQL is known to return (None = not known, e.g. SELECT *).
+# Used to narrow queries to the columns the selected checks actually read.
+TABLE_COLUMNS = {
+    'ASSETS': ['UNITID', 'UNITNO', 'LOCATION', 'STREET', 'STREETID', 'INSTALLED', 'SERVICEOWN'],
+    'CABLENOD': None,
+}
+
+# Load-time compaction per table (see compaction.compact_frame). Low-cardinality text becomes
+# categorical, identifiers Arrow-backed strings, and the install date is parsed once to datetime64.
+# Text columns not listed are chosen automatically by their distinct/rows ratio.
+TABLE_COMPACTION = {
+    'ASSETS': {
+        'category': ['SERVICEOWN', 'STREET', 'STREETID', 'LOCATION', 'UNITTYPE'],
+        'string': ['UNITID', 'UNITNO'],
+        'datetime': ['INSTALLED', 'INSTALLDATE'],
+    },
+    'CABLENOD': {
+        'string': ['LINK_ID'],
+    },
+}
@@ -0,0 +1,184 @@
+# Run-level telemetry: per-check timings buffered in memory, flushed once per run to SQLite
+from __future__ import annotations
+from dataclasses import astuple, dataclass, fields
+from datetime import datetime, timedelta
+from typing import List, Optional
+import sqlite3
+import threading
+import time
+import tracemalloc
+import uuid
+import pandas as pd
+from check_logger import log_check_executions
+
+# Default locations (working directory, next to the legacy checks.csv), looked up when a
+# RunTelemetry is created
+DEFAULT_DB_PATH = 'checks.db'
+DEFAULT_CSV_PATH = 'checks.csv'
+_DEFAULT = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY, started_at TEXT, finished_at TEXT, mode TEXT, checks INTEGER, findings INTEGER
+);
+CREATE TABLE IF NOT EXISTS check_runs (
+    run_id TEXT, check_id TEXT, started_at TEXT, wall_s REAL, cpu_s REAL,
+    rows_read INTEGER, findings INTEGER, peak_mem_bytes INTEGER,
+    PRIMARY KEY (run_id, check_id)
+);
+CREATE INDEX IF NOT EXISTS ix_check_runs_check ON check_runs (check_id, started_at);
+-- Same shape as the legacy checks.csv log
+CREATE VIEW IF NOT EXISTS checks_csv AS
+    SELECT started_at AS DateTime, check_id AS CheckID, findings AS ItemsReturned FROM check_runs ORDER BY started_at;
+"""
+
+@dataclass
+class CheckStats:
+    """Measurements for one check in one run."""
+    check_id: str
+    started_at: str
+    wall_s: float
+    cpu_s: float
+    rows_read: int
+    findings: int
+    peak_mem_bytes: Optional[int] = None
+
+class CheckTimer:
+    """
+    Context manager measuring wall time, CPU time of the current thread and, optionally,
+    peak traced memory (tracemalloc) of the code inside it.
+
+    Peak memory is only measured while tracemalloc is tracing. If it isn't and track_memory
+    is set, tracing is started for the duration of the block. The peak is process-wide (and
+    reset on entry), so it is only meaningful when nothing else in the process allocates at
+    the same time; the engine doesn't track memory for checks running on a thread pool.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.started_at = ''
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_mem_bytes: Optional[int] = None
+        self._own_trace = False
+
+    def __enter__(self) -> 'CheckTimer':
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_trace = True
+            tracemalloc.reset_peak()
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._t0 = time.perf_counter()
+        self._c0 = time.thread_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall_s = time.perf_counter() - self._t0
+        self.cpu_s = time.thread_time() - self._c0
+        if self.track_memory and tracemalloc.is_tracing():
+            self.peak_mem_bytes = tracemalloc.get_traced_memory()[1]
+            if self._own_trace:
+                tracemalloc.stop()
+
+class RunTelemetry:
+    """
+    Buffers CheckStats for one run and writes them in a single flush: one SQLite transaction
+    (runs + check_runs tables) and one append to the legacy checks.csv log.
+    """
+
+    def __init__(self, db_path: Optional[str] = _DEFAULT, csv_path: Optional[str] = _DEFAULT,
+                 run_id: Optional[str] = None, mode: str = ''):
+        """
+        Args:
+            db_path: SQLite database file (default DEFAULT_DB_PATH; None = don't write it)
+            csv_path: Legacy CSV log (default DEFAULT_CSV_PATH; None = don't write it)
+            run_id: Identifier of the run (default: a new UUID)
+            mode: Execution mode recorded with the run
+        """
+        self.db_path = DEFAULT_DB_PATH if db_path is _DEFAULT else db_path
+        self.csv_path = DEFAULT_CSV_PATH if csv_path is _DEFAULT else csv_path
+        self.run_id = run_id or uuid.uuid4().hex
+        self.mode = mode
+        self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.stats: List[CheckStats] = []
+        self._lock = threading.Lock()
+
+    def record(self, stats: CheckStats) -> None:
+        with self._lock:
+            self.stats.append(stats)
+
+    def flush(self) -> None:
+        """Write the buffered stats and clear the buffer."""
+        with self._lock:
+            stats, self.stats = self.stats, []
+        if not stats:
+            return
+        finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if self.db_path:
+            with connect(self.db_path) as conn:
+                conn.execute('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)',
+                             (self.run_id, self.started_at, finished_at, self.mode, len(stats), sum(s.findings for s in stats)))
+                conn.executemany(f'INSERT OR REPLACE INTO check_runs VALUES (?, {", ".join("?" * len(fields(CheckStats)))})',
+                                 [(self.run_id,) + astuple(s) for s in stats])
+            conn.close()
+        if self.csv_path:
+            log_check_executions([(s.started_at, s.check_id, s.findings) for s in stats], self.csv_path)
+
+def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open the telemetry database, creating the schema if needed."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+# -------------- Query helpers --------------
+
+def check_history(db_path: str = DEFAULT_DB_PATH, check_id: Optional[str] = None, since: Optional[str] = None) -> pd.DataFrame:
+    """Per-check rows (oldest first), optionally for one check and/or since a 'YYYY-MM-DD' date."""
+    sql = 'SELECT * FROM check_runs WHERE 1 = 1'
+    params: list = []
+    if check_id:
+        sql += ' AND check_id = ?'; params.append(check_id)
+    if since:
+        sql += ' AND started_at >= ?'; params.append(since)
+    conn = connect(db_path)
+    try:
+        return pd.read_sql(sql + ' ORDER BY started_at', conn, params=params)
+    finally:
+        conn.close()
+
+def monthly_trends(db_path: str = DEFAULT_DB_PATH) -> pd.DataFrame:
+    """Average wall/CPU time, rows and findings per check per calendar month."""
+    conn = connect(db_path)
+    try:
+        return pd.read_sql("""
+            SELECT check_id, substr(started_at, 1, 7) AS month, COUNT(*) AS runs,
+                   AVG(wall_s) AS avg_wall_s, AVG(cpu_s) AS avg_cpu_s,
+                   AVG(rows_read) AS avg_rows_read, AVG(findings) AS avg_findings, MAX(peak_mem_bytes) AS max_peak_mem_bytes
+            FROM check_runs GROUP BY check_id, month ORDER BY check_id, month""", conn)
+    finally:
+        conn.close()
+
+def slower_checks(db_path: str = DEFAULT_DB_PATH, days: int = 30, min_ratio: float = 1.1,
+                  now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Checks whose average wall time over the last `days` days is at least min_ratio times
+    their average over the `days` days before that ("which check got slower this month").
+    """
+    now = now or datetime.now()
+    recent_start = (now - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+    prev_start = (now - timedelta(days=2 * days)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = connect(db_path)
+    try:
+        df = pd.read_sql("""
+            SELECT check_id,
+                   AVG(CASE WHEN started_at >= :recent THEN wall_s END) AS recent_avg_wall_s,
+                   AVG(CASE WHEN started_at < :recent THEN wall_s END) AS previous_avg_wall_s
+            FROM check_runs WHERE started_at >= :prev GROUP BY check_id""",
+            conn, params={'recent': recent_start, 'prev': prev_start})
+    finally:
+        conn.close()
+    df = df.dropna()
+    df = df[df['previous_avg_wall_s'] > 0]
+    df['ratio'] = df['recent_avg_wall_s'] / df['previous_avg_wall_s']
+    return df[df['ratio'] >= min_ratio].sort_values('ratio', ascending=False).reset_index(drop=True)
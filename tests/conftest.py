@@ -1,5 +1,12 @@
 import pandas as pd
 import pytest
+import telemetry
+
+@pytest.fixture(autouse=True)
+def _telemetry_in_tmp(tmp_path, monkeypatch):
+    # Runs that don't pass a RunTelemetry log to checks.db/checks.csv; keep them out of the repo
+    monkeypatch.setattr(telemetry, "DEFAULT_DB_PATH", str(tmp_path / "checks.db"))
+    monkeypatch.setattr(telemetry, "DEFAULT_CSV_PATH", str(tmp_path / "checks.csv"))
 
 @pytest.fixture
 def assets_base_df():
@@ -0,0 +1,38 @@
+import pandas as pd
+from benchmarks.bench import Result, compare, load_baseline, run_size, save_baseline
+from engine import run_selected_batches
+from reporting import findings_to_dataframe
+from telemetry import RunTelemetry
+from benchmarks.datasets import NO_DEFECTS, DefectRates, make_mayrise_tables
+
+
+def _counts(tables):
+    fdf = findings_to_dataframe(run_selected_batches(tables, telemetry=RunTelemetry(None, None)))
+    return fdf.groupby('check_id').size().to_dict()
+
+
+def test_generator_is_seeded_and_defect_counts_are_exact():
+    rates = DefectRates(blank_unitno=0.02, blank_street=0.01, bad_unitno=0.03, future_install=0.01, missing_link=0.05)
+    a, b = make_mayrise_tables(2_000, seed=7, rates=rates), make_mayrise_tables(2_000, seed=7, rates=rates)
+    pd.testing.assert_frame_equal(a['ASSETS'], b['ASSETS'])
+    pd.testing.assert_frame_equal(a['CABLENOD'], b['CABLENOD'])
+    assert _counts(a) == {'MANDATORY_FIELDS': 60, 'UNITNO_FORMAT': 100, 'INSTALL_DATE_FUTURE': 20,
+                          'SERVICEOWN_PLUG_REQUIRES_CABLENOD': 100}
+    assert _counts(make_mayrise_tables(2_000, rates=NO_DEFECTS)) == {}
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    save_baseline(path, [Result('engine:thread', '10k', 10_000, 1.0, 1), Result('build_output', '10k', 10_000, 1.0, 1)])
+    now = [Result('engine:thread', '10k', 10_000, 1.5, 1), Result('build_output', '10k', 10_000, 1.1, 1),
+           Result('engine:thread', '1m', 1_000_000, 9.0, 1)]
+    rows = {r['size'] + '/' + r['case']: r for r in compare(now, load_baseline(path), threshold=0.25)}
+    assert rows['10k/engine:thread']['regressed']
+    assert not rows['10k/build_output']['regressed']
+    assert rows['1m/engine:thread']['baseline'] is None and not rows['1m/engine:thread']['regressed']
+
+
+def test_run_size_times_every_case():
+    cases = {r.case for r in run_size('tiny', 500, repeat=1)}
+    assert {'engine:sequential', 'engine:thread', 'build_output', 'export_findings_excel',
+            'check:UNITNO_FORMAT'} <= cases
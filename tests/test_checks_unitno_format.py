@@ -56,3 +56,38 @@ def test_unitno_flags_only_bad_rows(assets_base_df, tables_factory):
     f = findings[0]
     assert "UNITNO format" in f.message  # Check that the error message references UNITNO format
     assert f.field == "UNITNO"  # Confirm the field name in the finding
+
+
+def test_unitno_multiple_profiles_any_match_is_valid():
+    # Two unit-type profiles: lamp columns (letters+digits) and bollards (digits then 'B')
+    df = pd.DataFrame({
+        "UNITID": ["U1", "U2", "U3", "U4"],
+        "UNITNO": ["A1", "12B", "12B", "??"],
+    })
+    chk = UnitNoFormatCheck(pattern={"column": r"^[A-Z]+\d+$", "bollard": r"^\d+B$"})
+    findings = chk.run({"ASSETS": df})
+    assert [f.unitid for f in findings] == ["U4"]
+    assert findings[0].expected == r"^[A-Z]+\d+$ | ^\d+B$"
+
+
+def test_unitno_repeated_values_whitespace_and_nulls():
+    # Repeated values are validated once and broadcast; NaN/blank report no current value
+    df = pd.DataFrame({
+        "UNITID": [" U1 ", "U2", "U3", None, "U5"],
+        "UNITNO": ["  A1 ", "A_1", "A_1", "A1", "   "],
+    })
+    findings = UnitNoFormatCheck().run({"ASSETS": df})
+    assert [(f.unitid, f.current_value) for f in findings] == [("U2", "A_1"), ("U3", "A_1"), ("U5", None)]
+
+
+def test_unitno_config_token_covers_profiles_and_case():
+    # Incremental runs re-run the check in full when this token changes
+    base = UnitNoFormatCheck(pattern={"column": r"^[A-Z]+\d+$", "bollard": r"^\d+B$"})
+    assert base.config_token() == UnitNoFormatCheck(pattern={"column": r"^[A-Z]+\d+$", "bollard": r"^\d+B$"}).config_token()
+    long = "^(?:" + "|".join(f"X{i}" for i in range(100)) + ")$"
+    for other in (UnitNoFormatCheck(pattern={"column": r"^[A-Z]+\d+$", "bollard": r"^\d+C$"}),
+                  UnitNoFormatCheck(pattern={"column": r"^[A-Z]+\d+$", "bollard": r"^\d+B$"}, ignore_case=False),
+                  UnitNoFormatCheck(pattern=[r"^[A-Z]+\d+$", r"^\d+B$"])):
+        assert other.config_token() != base.config_token()
+    # Patterns differing past the point where a compiled regex's repr is cut off
+    assert UnitNoFormatCheck(pattern=long).config_token() != UnitNoFormatCheck(pattern=long[:-2] + "9)$").config_token()
@@ -0,0 +1,119 @@
+import io
+import json
+import pandas as pd
+import pytest
+import sql_defs
+from cli import EXIT_ERROR, EXIT_OK, EXIT_USAGE, EXIT_WARN, exit_code_for, main, select_checks
+from snapshot_cache import SnapshotCache
+
+
+def _events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_select_checks_by_id_and_glob():
+    ids = ["INSTALL_DATE_FUTURE", "MANDATORY_FIELDS", "UNITNO_FORMAT"]
+    assert select_checks(None, ids) == ids
+    assert select_checks(["UNITNO_FORMAT", "MANDATORY_*"], ids) == ["MANDATORY_FIELDS", "UNITNO_FORMAT"]
+    with pytest.raises(ValueError, match="NOPE"):
+        select_checks(["NOPE*"], ids)
+
+
+def test_exit_code_follows_worst_severity():
+    assert exit_code_for({}) == EXIT_OK
+    assert exit_code_for({"WARN": 2, "ERROR": 0}) == EXIT_WARN
+    assert exit_code_for({"WARN": 2, "ERROR": 1}) == EXIT_ERROR
+
+
+def test_offline_run_writes_output_and_json_progress(tmp_path):
+    conn = "DSN=TEST;"
+    cache = SnapshotCache(str(tmp_path / "snap"), ttl=None)
+    cache.put(conn, sql_defs.ALL_TABLE_SQL["ASSETS"], pd.DataFrame({
+        "UNITID": ["U1", "U2"], "UNITNO": ["A1", ""], "STREET": ["Main", "King"],
+        "SERVICEOWN": ["PL UG", "DNO"], "INSTALLED": ["2020-01-01", "2021-01-01"],
+    }))
+    cache.put(conn, sql_defs.ALL_TABLE_SQL["CABLENOD"], pd.DataFrame({"LINK_ID": ["U1"]}))
+    out = tmp_path / "findings.csv"
+    stream = io.StringIO()
+    code = main(["--conn", conn, "--checks", "MANDATORY_*", "SERVICEOWN_*", "--load", "offline", "--all-tables",
+                 "--snapshot-dir", str(tmp_path / "snap"), "--mode", "sequential", "--out", str(out)], stream=stream)
+    events = _events(stream)
+    assert code == EXIT_ERROR
+    assert [e["event"] for e in events][0] == "run_started"
+    assert {e["table"] for e in events if e["event"] == "table_loaded"} == {"ASSETS", "CABLENOD"}
+    assert events[-1] == {**events[-1], "event": "run_finished", "findings": 1, "by_severity": {"ERROR": 1}}
+    # One check_finished per check as it completes, including checks without findings
+    finished = [(e["check_id"], e["findings"]) for e in events if e["event"] == "check_finished"]
+    assert finished == [("MANDATORY_FIELDS", 1), ("SERVICEOWN_PLUG_REQUIRES_CABLENOD", 0)]
+    written = pd.read_csv(out)
+    assert written["UNITID"].tolist() == ["U2"] and written["STREET"].tolist() == ["King"]
+
+
+def test_unknown_check_pattern_is_usage_error():
+    stream = io.StringIO()
+    assert main(["--checks", "NOPE"], stream=stream) == EXIT_USAGE
+    assert _events(stream)[-1]["event"] == "run_failed"
+
+
+def test_offline_without_snapshot_fails_cleanly(tmp_path):
+    stream = io.StringIO()
+    code = main(["--load", "offline", "--snapshot-dir", str(tmp_path), "--checks", "MANDATORY_FIELDS"], stream=stream)
+    assert code == 1
+    assert "No local snapshot" in _events(stream)[-1]["error"]
+
+
+def test_pushdown_run_loads_only_fallback_checks(tmp_path, monkeypatch):
+    import sqlite3
+    from contextlib import closing
+    import loading
+    import pushdown
+    db = str(tmp_path / "src.db")
+    with closing(sqlite3.connect(db)) as conn:
+        pd.DataFrame({"UNITID": ["U1", "U2"], "UNITNO": ["A1", ""], "STREET": ["Main", "King"],
+                      "SERVICEOWN": ["PL UG", "DNO"]}).to_sql("ASSETS", conn, index=False)
+        pd.DataFrame({"LINK_ID": ["U1"]}).to_sql("CABLENOD", conn, index=False)
+        conn.commit()
+    def _sqlite_loader(conn_str, sql):
+        with closing(sqlite3.connect(db)) as conn:
+            return pd.read_sql(sql, conn)
+    monkeypatch.setattr(loading, "default_loader", lambda: _sqlite_loader)
+    monkeypatch.setattr(sql_defs, "ALL_TABLE_SQL", {"ASSETS": "SELECT * FROM ASSETS", "CABLENOD": "SELECT * FROM CABLENOD"})
+    monkeypatch.setitem(pushdown.DIALECTS, "mssql", pushdown.DIALECTS["sqlite"])
+    out = tmp_path / "findings.csv"
+    stream = io.StringIO()
+    code = main(["--conn", "sqlite", "--checks", "MANDATORY_*", "SERVICEOWN_*", "--pushdown", "--telemetry-db", str(tmp_path / "telemetry.db"),
+                 "--mode", "sequential", "--out", str(out)], stream=stream)
+    events = _events(stream)
+    assert code == EXIT_ERROR
+    pushed = next(e for e in events if e["event"] == "pushdown")
+    assert pushed["fallback"] == [] and pushed["rows_fetched"] == 1
+    assert not any(e["event"] == "table_loaded" for e in events)
+    written = pd.read_csv(out)
+    assert written["UNITID"].tolist() == ["U2"] and written["STREET"].tolist() == ["King"]
+
+
+def test_pipelined_run_matches_staged_run(tmp_path):
+    conn = "DSN=TEST;"
+    cache = SnapshotCache(str(tmp_path / "snap"), ttl=None)
+    cache.put(conn, sql_defs.ALL_TABLE_SQL["ASSETS"], pd.DataFrame({
+        "UNITID": ["U1", "U2", "U3"], "UNITNO": ["A1", "", "A3"], "STREET": ["Main", "King", ""],
+        "SERVICEOWN": ["PL UG", "DNO", "PL UG"], "INSTALLED": ["2020-01-01", "2021-01-01", None],
+    }))
+    cache.put(conn, sql_defs.ALL_TABLE_SQL["CABLENOD"], pd.DataFrame({"LINK_ID": ["U1"]}))
+    outputs = []
+    for extra in ([], ["--pipeline"]):
+        out = tmp_path / f"findings{len(outputs)}.jsonl"
+        stream = io.StringIO()
+        code = main(["--conn", conn, "--checks", "MANDATORY_*", "SERVICEOWN_*", "--load", "offline", "--all-tables",
+                     "--snapshot-dir", str(tmp_path / "snap"), "--telemetry-db", str(tmp_path / "t.db"),
+                     "--out", str(out), *extra], stream=stream)
+        assert code == EXIT_ERROR
+        assert _events(stream)[-1]["findings"] == 3
+        outputs.append(pd.read_json(out, lines=True).sort_values(["check_id", "UNITID"]).reset_index(drop=True))
+    pd.testing.assert_frame_equal(outputs[0], outputs[1])
+    assert "King" in outputs[1]["STREET"].tolist()   # enriched once ASSETS arrived
+
+
+def test_pipeline_rejects_process_modes():
+    stream = io.StringIO()
+    assert main(["--pipeline", "--mode", "partitioned"], stream=stream) == EXIT_USAGE
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from compaction import compact_frame
+from engine import run_selected_batches
+from reporting import findings_to_dataframe
+from telemetry import RunTelemetry
+import sql_defs
+from benchmarks.datasets import make_mayrise_tables
+
+
+def _as_read_sql(tables):
+    # What pd.read_sql hands back: Python strings in object columns, dates as text
+    return {name: df.astype({c: object for c in df.columns if df[c].dtype == "str"}) for name, df in tables.items()}
+
+
+def test_compaction_shrinks_tables_and_types_columns():
+    assets = pd.DataFrame({
+        "UNITID": pd.Series(["U1", "U2", "U3", "U4"], dtype=object),
+        "SERVICEOWN": pd.Series(["PL UG", "PL UG", None, " "], dtype=object),
+        "INSTALLED": pd.Series(["2020-01-01", None, "garbage", "2021-02-03"], dtype=object),
+        "COUNT": np.array([1, 2, 3, 200], dtype="int64"),
+        "MIXED": pd.Series([1, "a", None, 2.5], dtype=object),
+    })
+    out, report = compact_frame(assets, sql_defs.TABLE_COMPACTION["ASSETS"], table="ASSETS")
+    assert isinstance(out["SERVICEOWN"].dtype, pd.CategoricalDtype)
+    assert out["UNITID"].dtype == "str" and out["COUNT"].dtype == "uint8"
+    assert out["UNITID"].dtype.storage == "pyarrow"   # Arrow-backed, not object
+    assert out["INSTALLED"].dtype.kind == "M" and out["INSTALLED"].isna().tolist() == [False, True, True, False]
+    assert out["MIXED"].dtype == object and out["MIXED"].tolist()[:2] == [1, "a"]   # not all strings: untouched
+    assert out["SERVICEOWN"].isna().tolist() == [False, False, True, False] and out["SERVICEOWN"][3] == " "
+    assert set(report.converted) == {"UNITID", "SERVICEOWN", "INSTALLED", "COUNT"}
+    assert report.bytes_after < report.bytes_before and report.table in report.summary()
+
+
+def test_checks_find_the_same_rows_on_compacted_tables():
+    tables = _as_read_sql(make_mayrise_tables(5_000, seed=3, dates_as_text=True))
+    compacted = {name: compact_frame(df, sql_defs.TABLE_COMPACTION.get(name), table=name)[0] for name, df in tables.items()}
+    assert compacted["ASSETS"]["INSTALLDATE"].dtype.kind == "M"
+    assert isinstance(compacted["ASSETS"]["SERVICEOWN"].dtype, pd.CategoricalDtype)
+
+    def _findings(t):
+        df = findings_to_dataframe(run_selected_batches(t, telemetry=RunTelemetry(None, None)))
+        return df.sort_values(["check_id", "unitid", "field"]).reset_index(drop=True)
+    raw, small = _findings(tables), _findings(compacted)
+    assert len(raw) > 0
+    pd.testing.assert_frame_equal(raw.astype(object), small.astype(object))
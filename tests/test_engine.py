@@ -1,3 +1,4 @@
+import pytest
 import pandas as pd
 from engine import discover_checks, run_selected_checks
 
@@ -20,3 +21,46 @@ def test_engine_runs_specific_check():
     })
     out = run_selected_checks({'ASSETS': assets}, selected_ids=['MANDATORY_FIELDS'])
     assert out == []
+
+
+def _assets_with_problems():
+    return pd.DataFrame({
+        'UNITID': ['U1', 'U2', 'U3'],
+        'UNITNO': ['', 'BAD_2', 'A3'],
+        'STREET': ['X', '', 'Z'],
+        'SERVICEOWN': ['PL UG', 'DNO', 'PL UG'],
+        'INSTALLDATE': ['2035-01-01', '2020-01-01', None],
+    })
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_engine_parallel_matches_sequential_order(mode):
+    tables = {'ASSETS': _assets_with_problems(), 'CABLENOD': pd.DataFrame({'LINK_ID': ['U3']})}
+    ids = ['UNITNO_FORMAT', 'MANDATORY_FIELDS', 'SERVICEOWN_PLUG_REQUIRES_CABLENOD', 'INSTALL_DATE_FUTURE']
+    expected = run_selected_checks(tables, selected_ids=ids)
+    out = run_selected_checks(tables, selected_ids=ids, mode=mode, max_workers=4)
+    assert out == expected
+    assert [f.check_id for f in out] == sorted([f.check_id for f in out], key=ids.index)
+
+
+def test_engine_logs_once_per_check_in_parallel(tmp_path):
+    import engine
+    from telemetry import RunTelemetry, check_history
+    db, log = str(tmp_path / 'checks.db'), tmp_path / 'checks.csv'
+    ids = ['MANDATORY_FIELDS', 'UNITNO_FORMAT', 'INSTALL_DATE_FUTURE']
+    engine.run_selected_batches({'ASSETS': _assets_with_problems()}, selected_ids=ids, mode='thread', max_workers=3,
+                                telemetry=RunTelemetry(db, str(log)))
+    assert sorted(check_history(db)['check_id']) == sorted(ids)
+    assert [line.split(',')[1] for line in log.read_text().splitlines()[1:]] == ids
+
+
+def test_engine_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        run_selected_checks({}, selected_ids=['MANDATORY_FIELDS'], mode='gpu')
+
+
+def test_engine_batches_match_list_api():
+    from engine import run_selected_batches
+    tables = {'ASSETS': _assets_with_problems(), 'CABLENOD': pd.DataFrame({'LINK_ID': ['U3']})}
+    batch = run_selected_batches(tables)
+    assert batch.to_findings() == run_selected_checks(tables)
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+from checks.check_mandatory_fields import MandatoryFieldsCheck
+from checks.check_serviceown_plug_requires_cablenod import ServiceOwnPlugRequiresCableNodCheck
+from checks.check_unitno_format import UnitNoFormatCheck
+from engine import run_selected_batches
+from incremental import IncrementalStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IncrementalStore(str(tmp_path))
+
+
+def _assets(unitnos):
+    n = len(unitnos)
+    return pd.DataFrame({
+        "UNITID": [f"U{i}" for i in range(n)],
+        "UNITNO": unitnos,
+        "STREET": ["Main"] * n,
+        "SERVICEOWN": ["PL UG"] * n,
+    })
+
+
+def test_only_changed_rows_are_rechecked(store):
+    chk = MandatoryFieldsCheck()
+    first = store.run_check(chk, {"ASSETS": _assets(["", "A1", "A2", ""])})
+    assert sorted(f.unitid for f in first) == ["U0", "U3"]
+
+    # U1 becomes blank, U3 gets fixed, U4 is new; U0 is untouched and carried forward
+    second = store.run_check(chk, {"ASSETS": _assets(["", "", "A2", "A3", ""])})
+    assert store.last_stats["MANDATORY_FIELDS"] == {"rows": 5, "rechecked": 3, "carried": 1}
+    assert sorted(f.unitid for f in second) == ["U0", "U1", "U4"]
+    assert sorted(second.to_findings(), key=lambda f: f.unitid) == \
+        sorted(chk.run({"ASSETS": _assets(["", "", "A2", "A3", ""])}), key=lambda f: f.unitid)
+
+
+def test_removed_rows_drop_their_findings(store):
+    chk = MandatoryFieldsCheck()
+    store.run_check(chk, {"ASSETS": _assets(["", "A1"])})
+    out = store.run_check(chk, {"ASSETS": _assets(["", "A1"]).iloc[1:]})
+    assert list(out) == []
+
+
+def test_reference_table_change_forces_full_run(store):
+    chk = ServiceOwnPlugRequiresCableNodCheck()
+    assets = _assets(["A1", "A2"])
+    store.run_check(chk, {"ASSETS": assets, "CABLENOD": pd.DataFrame({"LINK_ID": ["U0"]})})
+    store.run_check(chk, {"ASSETS": assets, "CABLENOD": pd.DataFrame({"LINK_ID": ["U0"]})})
+    assert store.last_stats[chk.check_id]["rechecked"] == 0
+    out = store.run_check(chk, {"ASSETS": assets, "CABLENOD": pd.DataFrame({"LINK_ID": ["U0", "U1"]})})
+    assert store.last_stats[chk.check_id]["rechecked"] == 2
+    assert list(out) == []
+
+
+def test_engine_incremental_matches_full_run(store):
+    tables = {"ASSETS": _assets(["", "BAD_1", "A2"]), "CABLENOD": pd.DataFrame({"LINK_ID": ["U2"]})}
+    full = run_selected_batches(tables)
+    run_selected_batches(tables, incremental=store)
+    again = run_selected_batches(tables, incremental=store)
+    key = lambda f: (f.check_id, f.unitid, f.field or "")
+    assert sorted(again, key=key) == sorted(full, key=key)
+
+
+def test_check_config_change_forces_full_run(store):
+    tables = {"ASSETS": _assets(["A1", "12B", "A2"])}
+    first = store.run_check(UnitNoFormatCheck(), tables)
+    assert [f.unitid for f in first] == ["U1"]
+    # Same check_id and rows, new definition: nothing may be carried forward from the old one
+    chk = UnitNoFormatCheck(pattern=r"^\d+B$")
+    out = store.run_check(chk, tables)
+    assert store.last_stats[chk.check_id] == {"rows": 3, "rechecked": 3, "carried": 0}
+    assert sorted(f.unitid for f in out) == sorted(f.unitid for f in chk.run(tables)) == ["U0", "U2"]
+    store.run_check(chk, tables)
+    assert store.last_stats[chk.check_id]["rechecked"] == 0
+
+
+def test_blank_and_repeated_keys_are_always_rechecked(store):
+    chk = ServiceOwnPlugRequiresCableNodCheck()
+    cables = pd.DataFrame({"LINK_ID": ["U9"]})
+    assets = pd.DataFrame({"UNITID": ["", "", "", "D", "D", "U9"],
+                           "SERVICEOWN": ["PL UG", "DNO", "DNO", "PL UG", "PL UG", "PL UG"]})
+    store.run_check(chk, {"ASSETS": assets, "CABLENOD": cables})
+    # A blank-key row takes a (key, row) pair another blank row already had; a repeated key loses a row
+    changed = assets.drop(index=4).assign(SERVICEOWN=["PL UG", "PL UG", "DNO", "PL UG", "PL UG"])
+    out = store.run_check(chk, {"ASSETS": changed, "CABLENOD": cables})
+    full = chk.run_batch({"ASSETS": changed, "CABLENOD": cables})
+    assert sorted(f.unitid or "" for f in out) == sorted(f.unitid or "" for f in full) == ["", "", "D"]
+    assert store.last_stats[chk.check_id] == {"rows": 5, "rechecked": 4, "carried": 0}
@@ -0,0 +1,48 @@
+import sqlite3
+import pandas as pd
+import pytest
+from io_odbc import iter_query_chunks, read_query_chunked
+
+
+@pytest.fixture
+def cablenod_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE CABLENOD (LINK_ID TEXT, NODE INTEGER, LEN REAL)")
+    conn.executemany("INSERT INTO CABLENOD VALUES (?, ?, ?)",
+                     [(f"U{i}", i, i * 1.5 if i % 3 else None) for i in range(7)])
+    yield conn
+    conn.close()
+
+
+def test_iter_query_chunks_yields_typed_batches(cablenod_conn):
+    chunks = list(iter_query_chunks(cablenod_conn, "SELECT * FROM CABLENOD ORDER BY NODE", chunksize=3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    assert list(chunks[0].columns) == ["LINK_ID", "NODE", "LEN"]
+    assert chunks[0]["NODE"].dtype == "int64"
+    assert chunks[0]["LEN"].dtype == "float64"
+
+
+def test_read_query_chunked_matches_read_sql(cablenod_conn):
+    sql = "SELECT * FROM CABLENOD ORDER BY NODE"
+    out = read_query_chunked(cablenod_conn, sql, chunksize=2)
+    expected = pd.read_sql(sql, cablenod_conn)
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False)
+
+
+def test_read_query_chunked_empty_result_keeps_columns(cablenod_conn):
+    out = read_query_chunked(cablenod_conn, "SELECT LINK_ID, NODE FROM CABLENOD WHERE 1 = 0", chunksize=2)
+    assert out.empty
+    assert list(out.columns) == ["LINK_ID", "NODE"]
+
+
+def test_all_null_batch_keeps_nulls_in_bool_column():
+    # A BIT column arrives from pyodbc as Python bools; a sqlite converter does the same here
+    sqlite3.register_converter("BOOLEAN", lambda b: bool(int(b)))
+    conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_COLNAMES)
+    conn.execute("CREATE TABLE T (ID INTEGER, FLAG INTEGER)")
+    conn.executemany("INSERT INTO T VALUES (?, ?)", [(1, 1), (2, 0), (3, None), (4, None)])
+    # The second fetchmany batch is all NULL
+    out = read_query_chunked(conn, 'SELECT ID, FLAG AS "FLAG [BOOLEAN]" FROM T ORDER BY ID', chunksize=2)
+    conn.close()
+    assert out["FLAG"].dtype == "boolean"
+    assert out["FLAG"].tolist()[:2] == [True, False] and out["FLAG"].isna().tolist() == [False, False, True, True]
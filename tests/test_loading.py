@@ -0,0 +1,71 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from loading import iter_table_loads, load_all_tables
+
+
+def _fake_loader(delays):
+    def _load(conn_str, sql):
+        time.sleep(delays[sql])
+        return pd.DataFrame({"SQL": [sql], "THREAD": [threading.get_ident()]})
+    return _load
+
+
+def test_load_all_tables_runs_concurrently_and_keeps_registration_order():
+    table_sql = {"ASSETS": "a", "CABLENOD": "c"}
+    loader = _fake_loader({"a": 0.2, "c": 0.05})
+    seen = []
+    t0 = time.perf_counter()
+    tables = load_all_tables("DSN=X", table_sql, loader=loader,
+                             progress=lambda load, done, total: seen.append((load.name, done, total)))
+    elapsed = time.perf_counter() - t0
+    assert list(tables) == ["ASSETS", "CABLENOD"]
+    # CABLENOD finishes first, and both loads overlap
+    assert seen == [("CABLENOD", 1, 2), ("ASSETS", 2, 2)]
+    assert elapsed < 0.24
+    assert tables["ASSETS"]["THREAD"].iloc[0] != tables["CABLENOD"]["THREAD"].iloc[0]
+
+
+def test_iter_table_loads_reports_timing():
+    loads = list(iter_table_loads("DSN=X", {"ASSETS": "a"}, loader=_fake_loader({"a": 0.01})))
+    assert loads[0].name == "ASSETS" and loads[0].seconds >= 0.01
+
+
+def test_load_failure_names_the_table():
+    def _boom(conn_str, sql):
+        raise OSError("linked server timeout")
+    with pytest.raises(RuntimeError, match="Failed to load CABLENOD"):
+        load_all_tables("DSN=X", {"CABLENOD": "c"}, loader=_boom)
+
+
+def test_plan_tables_skips_unused_tables_and_narrows_select_star():
+    from loading import plan_tables
+    table_sql = {
+        "ASSETS": "select * from openquery(SRV,'SELECT UNITID, UNITNO, STREET FROM Units')",
+        "CABLENOD": "select * from openquery(SRV,'SELECT * FROM CABLENOD')",
+    }
+    known = {"ASSETS": ["UNITID", "UNITNO", "STREET"], "CABLENOD": None}
+    plan = plan_tables({"ASSETS": ["UNITID", "INSTALLDATE"]}, table_sql, known)
+    # CABLENOD is not needed; INSTALLDATE is not returned by ASSETS so it is not requested
+    assert plan == {"ASSETS": "SELECT UNITID from openquery(SRV,'SELECT UNITID, UNITNO, STREET FROM Units')"}
+    plan = plan_tables({"CABLENOD": ["LINK_ID"]}, table_sql, known)
+    assert plan == {"CABLENOD": "select * from openquery(SRV,'SELECT LINK_ID FROM CABLENOD')"}
+    assert plan_tables(None, table_sql, known) == table_sql
+
+
+def test_narrowed_query_falls_back_to_original_sql():
+    def _loader(conn_str, sql):
+        if "LINK_ID" in sql:
+            raise ValueError("invalid column name")
+        return pd.DataFrame({"SQL": [sql]})
+    out = load_all_tables("DSN=X", {"CABLENOD": "SELECT LINK_ID FROM C"}, loader=_loader,
+                          fallback_sql={"CABLENOD": "SELECT * FROM C"})
+    assert out["CABLENOD"]["SQL"].iloc[0] == "SELECT * FROM C"
+
+
+def test_engine_required_inputs_union():
+    from engine import required_inputs
+    req = required_inputs(["MANDATORY_FIELDS", "SERVICEOWN_PLUG_REQUIRES_CABLENOD"])
+    assert req == {"ASSETS": ["UNITID", "UNITNO", "STREET", "SERVICEOWN"], "CABLENOD": ["LINK_ID"]}
+    assert "CABLENOD" not in required_inputs(["MANDATORY_FIELDS"])
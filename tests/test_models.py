@@ -0,0 +1,54 @@
+import pandas as pd
+from models import Finding, FindingBatch
+from reporting import findings_to_dataframe
+
+
+def test_batch_from_mask_selects_rows_and_broadcasts_constants():
+    unitids = pd.Series(["U1", "U2", "U3"])
+    values = pd.Series(["a", "b", "c"])
+    batch = FindingBatch.from_mask(unitids, unitids.ne("U2"), "X", "WARN", "msg",
+                                   field="F", current_value=values, expected="e")
+    assert len(batch) == 2
+    assert list(batch) == [
+        Finding("U1", "X", "WARN", "msg", field="F", current_value="a", expected="e"),
+        Finding("U3", "X", "WARN", "msg", field="F", current_value="c", expected="e"),
+    ]
+
+
+def test_batch_iterates_missing_values_as_none():
+    batch = FindingBatch.from_mask(pd.Series(["U1"]), None, "X", "ERROR", "msg")
+    f = batch.to_findings()[0]
+    assert f.field is None and f.current_value is None and f.expected is None
+
+
+def test_batch_concat_and_roundtrip_through_findings():
+    a = FindingBatch.dataset_error("A", "Missing table: ASSETS", field="ASSETS")
+    b = FindingBatch.from_findings([Finding("U9", "B", "ERROR", "bad")])
+    both = FindingBatch.concat([a, FindingBatch(), b])
+    assert [f.check_id for f in both] == ["A", "B"]
+    assert both.to_findings()[0].unitid == "(DATASET)"
+    assert len(FindingBatch.concat([])) == 0
+
+
+def test_findings_to_dataframe_accepts_batch():
+    batch = FindingBatch.from_findings([Finding("U1", "X", "ERROR", "bad", field="F")])
+    fdf = findings_to_dataframe(batch)
+    assert list(fdf.columns) == ["unitid", "check_id", "severity", "message", "field", "current_value", "expected"]
+    assert fdf.iloc[0]["unitid"] == "U1"
+
+
+def test_batch_stores_check_constants_once():
+    n = 10_000
+    unitids = pd.Series([f"U{i:06d}" for i in range(n)], dtype="str")
+    a = FindingBatch.from_mask(unitids, None, "X", "ERROR", "a long message " * 4, field="F", expected="^[A-Z]+\\d+$")
+    b = FindingBatch.from_mask(unitids[:2], None, "Y", "WARN", "other")
+    assert not hasattr(Finding("U1", "X", "ERROR", "m"), "__dict__")
+    assert a.frame["message"].cat.categories.tolist() == ["a long message " * 4]
+    assert a.memory_bytes() / n < 40   # UNITID plus 1-byte codes; the strings are held once
+
+    both = FindingBatch.concat([b, a])
+    assert both.frame["check_id"].cat.categories.tolist() == ["X", "Y"]
+    assert [f.check_id for f in both][:3] == ["Y", "Y", "X"] and both.to_findings()[1].field is None
+    plain = findings_to_dataframe(both)
+    assert not isinstance(plain["message"].dtype, pd.CategoricalDtype)
+    assert plain["field"].fillna("").tolist()[1:3] == ["", "F"]
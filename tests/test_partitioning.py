@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from engine import run_selected_batches
+from incremental import IncrementalStore
+from partitioning import SharedTables, partition_rows, worker_context
+from reporting import findings_to_dataframe
+from sinks import SummarySink
+from telemetry import RunTelemetry
+from benchmarks.datasets import make_mayrise_tables
+
+
+def _sorted(batch):
+    df = findings_to_dataframe(batch)
+    return df.sort_values(["check_id", "unitid", "field"]).reset_index(drop=True).astype(object)
+
+
+def test_partition_rows_keeps_keys_together_and_rows_in_order():
+    keys = pd.Series(["a", "b", "a", None, "c", "b", None, "d"])
+    parts = partition_rows(keys, 3)
+    assert len(parts) == 3
+    assert sorted(np.concatenate(parts).tolist()) == list(range(len(keys)))
+    for rows in parts:
+        assert rows.tolist() == sorted(rows.tolist())
+    owner = {i: p for p, rows in enumerate(parts) for i in rows}
+    assert owner[0] == owner[2] and owner[1] == owner[5] and owner[3] == owner[6]
+    assert partition_rows(keys, 1)[0].tolist() == list(range(len(keys)))
+
+
+def test_shared_tables_round_trip_and_clean_up():
+    tables = {"CABLENOD": pd.DataFrame({"LINK_ID": ["U1", None, "U3"]}),
+              "MIXED": pd.DataFrame({"X": pd.Series([1, "a", None], dtype=object)})}
+    with SharedTables(tables) as shared:
+        assert shared.paths["CABLENOD"].endswith(".feather") and shared.paths["MIXED"].endswith(".pkl")
+        ctx = worker_context(shared.paths)
+        assert ctx is worker_context(dict(shared.paths))
+        assert ctx["CABLENOD"]["LINK_ID"].tolist()[::2] == ["U1", "U3"] and ctx["MIXED"]["X"].tolist()[:2] == [1, "a"]
+    assert not os.path.exists(shared.dir)
+
+
+class _CountingSink(SummarySink):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.finished = {}
+
+    def write(self, batch):
+        self.writes += 1
+        super().write(batch)
+
+    def check_finished(self, check_id, findings):
+        # Once per check, after all of its partitions were written
+        assert check_id not in self.finished
+        self.finished[check_id] = findings
+        assert findings == self.by_check.get(check_id, 0)
+
+
+@pytest.mark.parametrize("key", ["UNITID", "STREET"])
+def test_partitioned_run_matches_sequential(key):
+    tables = make_mayrise_tables(4_000, seed=9)
+    # A check whose column is missing runs whole and reports a single dataset error
+    tables["ASSETS"] = tables["ASSETS"].drop(columns="INSTALLDATE")
+    sequential = run_selected_batches(tables, telemetry=RunTelemetry(None, None))
+    summary = _CountingSink()
+    telemetry = RunTelemetry(None, None, mode="partitioned")
+    partitioned = run_selected_batches(tables, mode="partitioned", max_workers=2, partitions=4, partition_key=key,
+                                       telemetry=telemetry, sinks=[summary])
+    assert len(sequential) > 0
+    pd.testing.assert_frame_equal(_sorted(partitioned), _sorted(sequential))
+    assert summary.rows_written == len(sequential)
+    # Row-local checks stream one batch per partition; the one without its column runs once
+    checks = findings_to_dataframe(sequential)["check_id"].nunique()
+    assert summary.writes == (checks - 1) * 4 + 1
+    assert {cid: n for cid, n in summary.finished.items() if n} == \
+        findings_to_dataframe(sequential)["check_id"].value_counts().to_dict()
+    assert (findings_to_dataframe(partitioned)["unitid"] == "(DATASET)").sum() == 1
+
+
+def test_partitioned_runs_cannot_be_incremental(tmp_path):
+    with pytest.raises(ValueError, match="partitioned"):
+        run_selected_batches({}, ["MANDATORY_FIELDS"], mode="partitioned", incremental=IncrementalStore(str(tmp_path)))
+
+
+def test_partitioned_findings_come_in_partition_order_on_every_run():
+    tables = make_mayrise_tables(3_000, seed=11)
+    ids = ["UNITNO_FORMAT", "MANDATORY_FIELDS", "SERVICEOWN_PLUG_REQUIRES_CABLENOD", "INSTALL_DATE_FUTURE"]
+    # Serial runs over each partition, concatenated check by check in partition order
+    parts = partition_rows(tables["ASSETS"]["UNITID"].astype(str).str.strip(), 4)
+    serial = [findings_to_dataframe(run_selected_batches({**tables, "ASSETS": tables["ASSETS"].take(rows)}, ids,
+                                                         telemetry=RunTelemetry(None, None))) for rows in parts]
+    expected = pd.concat([df[df["check_id"] == cid] for cid in ids for df in serial], ignore_index=True)
+    for _ in range(3):
+        got = run_selected_batches(tables, ids, mode="partitioned", max_workers=2, partitions=4,
+                                   telemetry=RunTelemetry(None, None))
+        pd.testing.assert_frame_equal(findings_to_dataframe(got), expected)
+
+
+def test_partitioned_dates_parse_like_a_whole_column():
+    # pd.to_datetime infers the format from the first value; per-partition parsing would turn a
+    # different format into NaT in each partition
+    n = 12
+    assets = pd.DataFrame({
+        "UNITID": [f"U{i:02d}" for i in range(n)],
+        "INSTALLDATE": ["2035-05-05" if i % 2 else "2040-01-01 10:00:00" for i in range(n)],
+    })
+    tables = {"ASSETS": assets}
+    sequential = run_selected_batches(tables, ["INSTALL_DATE_FUTURE"], telemetry=RunTelemetry(None, None))
+    partitioned = run_selected_batches(tables, ["INSTALL_DATE_FUTURE"], mode="partitioned", max_workers=2,
+                                       partitions=3, telemetry=RunTelemetry(None, None))
+    pd.testing.assert_frame_equal(_sorted(partitioned), _sorted(sequential))
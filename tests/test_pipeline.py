@@ -0,0 +1,71 @@
+import threading
+import pandas as pd
+import pytest
+from engine import run_pipelined, run_selected_batches
+from loading import TableLoad
+from reporting import OUTPUT_ASSET_COLS, AssetEnricher, build_output, findings_to_dataframe
+from sinks import DeferredSink, FindingSink, FrameSink
+from telemetry import RunTelemetry
+from benchmarks.datasets import make_mayrise_tables
+
+ASSETS_ONLY = {"MANDATORY_FIELDS", "UNITNO_FORMAT", "INSTALL_DATE_FUTURE"}
+
+
+class _RecordingSink(FindingSink):
+    def __init__(self):
+        super().__init__(None)
+        self.checks = []
+        self.assets_checks_done = threading.Event()
+
+    def write(self, batch):
+        self.checks.append(findings_to_dataframe(batch)["check_id"].iloc[0] if len(batch) else None)
+        if ASSETS_ONLY <= set(self.checks):
+            self.assets_checks_done.set()
+
+    def _write_frame(self, df):
+        pass
+
+
+def test_checks_start_as_soon_as_their_tables_load():
+    tables = make_mayrise_tables(2_000, seed=4)
+    sink = _RecordingSink()
+    waited = []
+
+    def _loads():
+        yield TableLoad("ASSETS", tables["ASSETS"], 0.0)
+        # CABLENOD "downloads" until the ASSETS-only checks have finished
+        waited.append(sink.assets_checks_done.wait(timeout=30))
+        yield TableLoad("CABLENOD", tables["CABLENOD"], 0.0)
+
+    seen = []
+    batch = run_pipelined(_loads(), max_workers=2, telemetry=RunTelemetry(None, None), sinks=[sink],
+                          on_loaded=lambda load: seen.append(load.name))
+    assert waited == [True] and seen == ["ASSETS", "CABLENOD"]
+    expected = run_selected_batches(tables, telemetry=RunTelemetry(None, None))
+    pd.testing.assert_frame_equal(findings_to_dataframe(batch), findings_to_dataframe(expected))
+
+
+def test_failed_load_is_raised():
+    tables = make_mayrise_tables(100, seed=4)
+
+    def _loads():
+        yield TableLoad("ASSETS", tables["ASSETS"], 0.0)
+        raise RuntimeError("Failed to load CABLENOD: timeout")
+
+    with pytest.raises(RuntimeError, match="CABLENOD"):
+        run_pipelined(_loads(), telemetry=RunTelemetry(None, None))
+
+
+def test_deferred_sink_holds_batches_until_assets_arrive():
+    tables = make_mayrise_tables(500, seed=2)
+    expected = run_selected_batches(tables, ["UNITNO_FORMAT", "MANDATORY_FIELDS"], telemetry=RunTelemetry(None, None))
+    output = FrameSink()
+    deferred = DeferredSink(output)
+    deferred.write(expected)
+    assert output.rows_written == 0
+    deferred.release(AssetEnricher(tables["ASSETS"], OUTPUT_ASSET_COLS))
+    deferred.close()
+    built = build_output(findings_to_dataframe(expected), tables["ASSETS"])
+    pd.testing.assert_frame_equal(output.frame(), built)
+    reordered = output.frame(check_order=["MANDATORY_FIELDS", "UNITNO_FORMAT"])
+    assert reordered["check_id"].tolist() == sorted(built["check_id"].tolist(), key=["MANDATORY_FIELDS", "UNITNO_FORMAT"].index)
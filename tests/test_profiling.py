@@ -0,0 +1,49 @@
+import json
+import pstats
+import pandas as pd
+import pytest
+from engine import run_selected_batches
+from profiling import Profiler
+from telemetry import RunTelemetry
+
+
+def _tables():
+    assets = pd.DataFrame({
+        'UNITID': ['U1', 'U2'], 'UNITNO': ['', 'A2'], 'STREET': ['X', 'Y'],
+        'SERVICEOWN': ['DNO', 'DNO'], 'INSTALLDATE': ['2020-01-01', '2035-01-01'],
+    })
+    return {'ASSETS': assets}
+
+
+@pytest.mark.parametrize('mode', ['sequential', 'thread'])
+def test_hooks_and_spans(mode):
+    ids = ['MANDATORY_FIELDS', 'INSTALL_DATE_FUTURE']
+    prof, pre, post = Profiler(), [], []
+    prof.add_hook(pre=pre.append, post=lambda cid, batch, stats: post.append((cid, len(batch), stats.findings)))
+    run_selected_batches(_tables(), ids, mode=mode, max_workers=2,
+                         telemetry=RunTelemetry(None, None), profiler=prof)
+    assert pre == ids
+    assert [cid for cid, _, _ in post] == ids and all(n == f for _, n, f in post)
+    assert list(prof.stage_totals()) == ['check']
+    assert sorted(s.name for s in prof.spans if s.name) == sorted(ids)
+
+
+def test_cprofile_and_trace_dump(tmp_path):
+    prof = Profiler(cprofile=True)
+    with prof.span('load'):
+        prof.add_finished('load', 'ASSETS', 0.01)
+    run_selected_batches(_tables(), ['MANDATORY_FIELDS', 'INSTALL_DATE_FUTURE'], mode='thread',
+                         telemetry=RunTelemetry(None, None), profiler=prof)
+    assert list(prof.stage_totals()) == ['load', 'check']
+    assert prof.breakdown_lines()[0].startswith('load')
+
+    trace = tmp_path / 'run.json'
+    prof.dump_trace(str(trace))
+    events = json.loads(trace.read_text())['traceEvents']
+    assert {e['name'] for e in events} >= {'load', 'ASSETS', 'check', 'MANDATORY_FIELDS'}
+    assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+
+    out = tmp_path / 'run.prof'
+    assert prof.dump_pstats(str(out))
+    funcs = {fn for _, _, fn in pstats.Stats(str(out)).stats}
+    assert 'run_batch' in funcs
@@ -0,0 +1,139 @@
+import sqlite3
+from contextlib import closing
+import pandas as pd
+import pytest
+from checks.referential import ReferentialCheck
+from engine import run_selected_batches
+from io_odbc import read_query_chunked
+from models import FindingBatch
+from pushdown import DIALECTS, run_pushdown
+from registry import load_check
+from reporting import findings_to_dataframe
+from run_context import RunContext
+from telemetry import RunTelemetry
+from benchmarks.datasets import make_mayrise_tables
+
+TABLE_SQL = {"ASSETS": "SELECT * FROM ASSETS", "CABLENOD": "SELECT * FROM CABLENOD"}
+PUSHED = ["MANDATORY_FIELDS", "INSTALL_DATE_FUTURE", "SERVICEOWN_PLUG_REQUIRES_CABLENOD"]
+
+
+@pytest.fixture
+def source(tmp_path):
+    # SQLite stand-in for the Mayrise database, with blanks padded by tabs/newlines as in the extracts
+    tables = make_mayrise_tables(3_000, seed=5)
+    tables["ASSETS"].loc[:4, "STREET"] = " \t"
+    tables["ASSETS"].loc[5:9, "UNITNO"] = None
+    path = str(tmp_path / "mayrise.db")
+    with sqlite3.connect(path) as conn:
+        for name, df in tables.items():
+            df.to_sql(name, conn, index=False)
+    return path, tables
+
+
+def _loader(path, queries):
+    # One connection per query, like the ODBC loader (tables load on worker threads)
+    def load(conn_str, sql):
+        queries.append(sql)
+        with closing(sqlite3.connect(path)) as conn:
+            return read_query_chunked(conn, sql)
+    return load
+
+
+def _sorted(batch):
+    df = findings_to_dataframe(batch)
+    return df.sort_values(["check_id", "unitid", "field"]).reset_index(drop=True).astype(object)
+
+
+def test_pushdown_finds_the_same_rows_as_in_memory(source):
+    path, tables = source
+    queries = []
+    checks = [(cid, load_check(cid)) for cid in PUSHED]
+    result = run_pushdown("sqlite", checks, loader=_loader(path, queries), table_sql=TABLE_SQL, dialect="sqlite",
+                          telemetry=RunTelemetry(None, None))
+    assert result.fallback == [] and result.errors == {}
+    assert all("WHERE" in sql for sql in queries)
+
+    pushed = _sorted(FindingBatch.concat(result.batches.values()))
+    # Against the whole tables as the same source returns them (dates come back as text)
+    full = {name: _loader(path, [])("sqlite", sql) for name, sql in TABLE_SQL.items()}
+    expected = _sorted(run_selected_batches(full, PUSHED, telemetry=RunTelemetry(None, None)))
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(pushed, expected)
+    assert result.rows_fetched < sum(len(df) for df in tables.values()) / 4
+
+
+class _ManyCables(ReferentialCheck):
+    # Anti-join form: flags assets with two or more CABLENOD rows. Ids are set per instance so
+    # engine.discover_checks() doesn't pick these up.
+    severity_default, ref_key, ref_col, min_count, require = "WARN", "CABLENOD", "LINK_ID", 2, False
+    message = "Two or more CABLENOD rows."
+
+    def __init__(self):
+        self.check_id = "MANY_CABLES"
+
+
+class _ThreeCables(ReferentialCheck):
+    severity_default, ref_key, ref_col, min_count = "WARN", "CABLENOD", "LINK_ID", 3
+    where_col, where_values, message = "SERVICEOWN", ["PL OH", "PL UG"], "Fewer than three CABLENOD rows."
+
+    def __init__(self):
+        self.check_id = "THREE_CABLES"
+
+
+@pytest.mark.parametrize("first_date", ["2001-02-03", "01/02/2001"])
+def test_pushdown_rechecks_what_the_database_compares_differently(tmp_path, first_date):
+    tables = make_mayrise_tables(600, seed=7, dates_as_text=True)
+    assets, cablenod = tables["ASSETS"], tables["CABLENOD"]
+    # pd.to_datetime infers the format from the first date; the others are only read if they match it
+    assets.loc[0, "INSTALLDATE"] = first_date
+    assets.loc[20:27, "INSTALLDATE"] = ["2035-01-04T10:00:00", " 2035-01-02 ", "2035-01-03\xa0", "01/02/2035",
+                                         "25/12/2035", "20350106", "2035-01-05 10:00", "12/31/2035"]
+    # Blank to str.strip() (Unicode whitespace), or not
+    assets.loc[10:14, "STREET"] = ["\xa0", "\u3000\t", " x\xa0", "\x1f", "\u2003"]
+    assets.loc[15, "UNITNO"] = "\u2028"
+    # Keys and predicate values that only match once Unicode whitespace is stripped
+    linked = assets.index[assets["UNITID"].isin(cablenod["LINK_ID"])]
+    assets.loc[linked[0], "UNITID"] += "\xa0"
+    cablenod.loc[cablenod["LINK_ID"] == assets.loc[linked[1], "UNITID"], "LINK_ID"] = "\u3000" + assets.loc[linked[1], "UNITID"]
+    unlinked = assets.index[~assets["UNITID"].isin(cablenod["LINK_ID"]) & (assets["SERVICEOWN"] != "PL UG")]
+    assets.loc[unlinked[:3], "SERVICEOWN"] = ["PL UG\xa0", "pl ug", "PL\xa0UG"]
+    path = str(tmp_path / "odd.db")
+    with sqlite3.connect(path) as conn:
+        for name, df in tables.items():
+            df.to_sql(name, conn, index=False)
+
+    checks = [(cid, load_check(cid)) for cid in PUSHED] + [("MANY_CABLES", _ManyCables), ("THREE_CABLES", _ThreeCables)]
+    result = run_pushdown("sqlite", checks, loader=_loader(path, []), table_sql=TABLE_SQL, dialect="sqlite")
+    assert result.fallback == [] and result.errors == {}
+    full = {name: _loader(path, [])("sqlite", sql) for name, sql in TABLE_SQL.items()}
+    for cid, cls in checks:
+        expected = _sorted(cls().run_batch(RunContext(full)))
+        assert len(expected) > 0, cid
+        pd.testing.assert_frame_equal(_sorted(result.batches[cid]), expected, obj=cid)
+
+
+def test_unsupported_or_failing_checks_fall_back(source):
+    path, _ = source
+    mandatory = load_check("MANDATORY_FIELDS")
+    missing_col = type("MissingColumn", (mandatory,), {"__init__": lambda self: mandatory.__init__(self, required=("NOPE",))})
+    checks = [("MISSING", missing_col), ("UNITNO_FORMAT", load_check("UNITNO_FORMAT")), ("MANDATORY_FIELDS", mandatory)]
+    result = run_pushdown("sqlite", checks, loader=_loader(path, []), table_sql=TABLE_SQL, dialect="sqlite")
+    assert result.fallback == ["MISSING", "UNITNO_FORMAT"]
+    assert "NOPE" in result.errors["MISSING"]
+    assert list(result.batches) == ["MANDATORY_FIELDS"] and len(result.batches["MANDATORY_FIELDS"]) > 0
+
+
+def test_dialect_literals_and_identifiers():
+    d = DIALECTS["mssql"]
+    assert d.ident("UNITID", "s") == "s.[UNITID]" and d.ident("A; DROP TABLE x") is None
+    assert d.literal("O'Brien") == "'O''Brien'" and d.literal(pd.Timestamp("2024-05-01")) == "'2024-05-01T00:00:00'"
+    assert d.matches("x", "*[^ -~]*") == "(x COLLATE Latin1_General_BIN LIKE '%[^ -~]%')"
+    assert d.strip_all("x").startswith("LTRIM(RTRIM(TRANSLATE(x, NCHAR(9)+") and d.strip_all("x").endswith(", SPACE(28))))")
+
+
+def test_install_date_query_orders_its_first_row_explicitly():
+    # SQL Server keeps neither a source's row order nor UNION ALL's, so both are ordered by key
+    sql = load_check("INSTALL_DATE_FUTURE")().pushdown_sql(TABLE_SQL, DIALECTS["mssql"])["ASSETS"]
+    order = "CASE WHEN {0}.[UNITID] IS NULL THEN 1 ELSE 0 END, {0}.[UNITID] COLLATE Latin1_General_BIN2"
+    assert f"SELECT TOP 1 * FROM (SELECT * FROM ASSETS) f WHERE [INSTALLDATE] IS NOT NULL ORDER BY {order.format('f')}" in sql
+    assert sql.startswith("SELECT * FROM (") and f") u ORDER BY {order.format('u')}" in sql
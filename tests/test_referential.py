@@ -0,0 +1,71 @@
+import pandas as pd
+from checks.referential import ReferentialCheck
+from engine import _build_reference_indexes
+from run_context import RunContext
+
+
+class _AtLeastTwoCables(ReferentialCheck):
+    ref_key, ref_col = "CABLENOD", "LINK_ID"
+    where_col, where_values = "SERVICEOWN", ["pl ug", "PL OH"]
+    min_count = 2
+    message = "Fewer than 2 cables"
+
+
+class _NoCablesOnCouncil(ReferentialCheck):
+    ref_key, ref_col = "CABLENOD", "LINK_ID"
+    where_col, where_values = "SERVICEOWN", ["COUNCIL"]
+    require = False
+    message = "Council asset has cables"
+
+
+def _ctx():
+    return RunContext({
+        "ASSETS": pd.DataFrame({"UNITID": ["U1", " U2", "U3", "U4", None],
+                                "SERVICEOWN": ["PL UG", "PL OH ", "COUNCIL", "COUNCIL", "PL UG"]}),
+        "CABLENOD": pd.DataFrame({"LINK_ID": ["U1", "U1 ", "U2", "U3", None]}),
+    })
+
+
+def test_count_threshold_and_anti_join():
+    ctx = _ctx()
+    assert [f.unitid for f in _AtLeastTwoCables().run(ctx)] == ["U2", None]   # null keys never match
+    assert [f.unitid for f in _NoCablesOnCouncil().run(ctx)] == ["U3"]
+    assert _AtLeastTwoCables().requires() == {"ASSETS": ["UNITID", "SERVICEOWN"], "CABLENOD": ["LINK_ID"]}
+    missing = _NoCablesOnCouncil().run(RunContext({"ASSETS": ctx["ASSETS"], "CABLENOD": pd.DataFrame({"X": [1]})}))
+    assert missing[0].unitid == "(DATASET)" and "Missing column in CABLENOD: LINK_ID" in missing[0].message
+
+
+def test_rules_share_one_reference_index(monkeypatch):
+    import run_context
+    builds = []
+    orig = run_context.KeyIndex.__init__
+    monkeypatch.setattr(run_context.KeyIndex, "__init__", lambda self, values: builds.append(1) or orig(self, values))
+    ctx = _ctx()
+    _build_reference_indexes(ctx, [("A", _AtLeastTwoCables), ("B", _NoCablesOnCouncil)])
+    _AtLeastTwoCables().run(ctx), _NoCablesOnCouncil().run(ctx)
+    assert len(builds) == 1
+    assert ctx.key_index("CABLENOD", "LINK_ID").counts.tolist() == [2, 1, 1]
+    assert ctx.match_counts("ASSETS", "UNITID", "CABLENOD", "LINK_ID").tolist() == [2, 1, 1, 0, 0]
+
+
+def test_null_keys_never_match_nan_text():
+    # astype(str) can spell a null 'nan' or 'None'; the join keys must keep it null
+    ctx = RunContext({
+        "ASSETS": pd.DataFrame({"UNITID": pd.Series(["U1", float("nan"), None], dtype=object),
+                                "SERVICEOWN": ["PL UG"] * 3}),
+        "CABLENOD": pd.DataFrame({"LINK_ID": ["U1", "U1", "nan", "None"]}),
+    })
+    assert ctx.match_counts("ASSETS", "UNITID", "CABLENOD", "LINK_ID").tolist() == [2, 0, 0]
+    assert [f.unitid for f in _AtLeastTwoCables().run(ctx)] == [None, None]
+
+
+def test_class_level_rule_change_forces_full_incremental_run(tmp_path, monkeypatch):
+    from incremental import IncrementalStore
+    store = IncrementalStore(str(tmp_path))
+    tables = dict(_ctx())
+    chk = _AtLeastTwoCables()
+    assert [f.unitid for f in store.run_check(chk, tables)] == ["U2", None]
+    # Declared on the class, so only config_token() sees the change
+    monkeypatch.setattr(_AtLeastTwoCables, "min_count", 1)
+    assert [f.unitid for f in store.run_check(chk, tables)] == [f.unitid for f in chk.run(tables)] == [None]
+    assert store.last_stats[chk.check_id]["carried"] == 0
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import pytest
+import registry
+from engine import discover_checks
+
+
+def test_manifest_lists_checks_without_importing_them(tmp_path, monkeypatch):
+    pkg = tmp_path / "checks"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "base.py").write_text("class BaseCheck:\n    check_id = 'BASE'\n")
+    (pkg / "check_a.py").write_text(
+        "raise RuntimeError('must not be imported')\n"
+        "from .base import BaseCheck\n"
+        "class Parent(BaseCheck):\n    description = 'inherited'\n"
+        "class A(Parent):\n    check_id = 'A_CHECK'\n    name = 'A check'\n"
+        "class NotACheck:\n    check_id = 'NOPE'\n"
+    )
+    manifest = registry.build_manifest(str(pkg))
+    assert [(e["check_id"], e["class_name"], e["description"]) for e in manifest["checks"]] == \
+        [("A_CHECK", "A", "inherited")]
+
+
+def test_list_checks_matches_discovery():
+    infos = registry.list_checks()
+    found = discover_checks()
+    assert set(infos) == set(found)
+    # Rules listed from the file carry the metadata of their compiled classes
+    assert {cid: (i.name, i.description, i.class_name) for cid, i in infos.items()} == \
+        {cid: (c.name, c.description, c.__name__) for cid, c in found.items()}
+    assert infos["UNITNO_FORMAT"].module == "checks.check_unitno_format"
+
+
+def test_registry_refreshes_when_package_changes(tmp_path, monkeypatch):
+    pkg = tmp_path / "checks"
+    pkg.mkdir()
+    (pkg / "base.py").write_text("class BaseCheck:\n    check_id = 'BASE'\n")
+    (pkg / "check_a.py").write_text("class A(BaseCheck):\n    check_id = 'A'\n")
+    monkeypatch.setattr(registry, "_package_dir", lambda: str(pkg))
+    monkeypatch.setattr(registry, "_cache", {})
+    assert list(registry.list_checks()) == ["A"]
+    assert (pkg / "__pycache__" / registry.MANIFEST_NAME).is_file()
+    (pkg / "check_b.py").write_text("class B(BaseCheck):\n    check_id = 'B'\n")
+    assert sorted(registry.list_checks()) == ["A", "B"]
+
+
+def test_load_check_imports_selected_module_only():
+    cls = registry.load_check("MANDATORY_FIELDS")
+    assert cls.check_id == "MANDATORY_FIELDS"
+    assert registry.load_check("NO_SUCH_CHECK") is None
+
+
+def test_list_checks_does_not_import_pandas():
+    # A fresh interpreter, as at GUI startup: the rules file is read, not compiled
+    code = ("import sys, registry; infos = registry.list_checks(); "
+            "assert 'pandas' not in sys.modules, 'pandas imported'; print(len(infos))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert int(out.stdout) == len(registry.list_checks())
+
+
+def test_rule_clashing_with_a_check_is_an_error_everywhere(tmp_path, monkeypatch):
+    path = tmp_path / "rules.toml"
+    path.write_text('[[rule]]\nid = "UNITNO_FORMAT"\ntable = "ASSETS"\ntype = "not_null"\ncolumn = "UNITNO"\n')
+    monkeypatch.setattr(registry, "RULES_PATH", str(path))
+    with pytest.raises(ValueError, match="same id as the check UnitNoFormatCheck"):
+        registry.list_checks()
+    with pytest.raises(ValueError, match="same id as the check UnitNoFormatCheck"):
+        discover_checks()
@@ -23,3 +23,43 @@ def test_findings_to_dataframe_and_join():
     # Dataset-level finding will have NaNs for asset columns (no join match)
     ds = out[out['UNITID']=='(DATASET)'].iloc[0]
     assert pd.isna(ds['UNITNO'])
+
+
+def test_export_streams_and_rolls_over_sheets(tmp_path):
+    from reporting import export_findings_excel
+    out = pd.DataFrame({
+        'UNITID': ['U1', 'U2', 'U3', None, 'U5'], 'UNITNO': [None, 'A2', 'A3', 'A4', 'A5'],
+        'check_id': ['X', 'Y', 'X', 'X', 'Y'], 'severity': ['ERROR', 'WARN', 'ERROR', 'ERROR', 'WARN'],
+    })
+    path, calls = tmp_path / 'f.xlsx', []
+    export_findings_excel(out, str(path), max_rows_per_sheet=2, chunk_rows=1, progress=lambda d, t: calls.append((d, t)))
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ['Findings', 'Findings_2', 'Findings_3', 'Summary']
+    rows = pd.concat([sheets[s] for s in ('Findings', 'Findings_2', 'Findings_3')], ignore_index=True)
+    assert rows['UNITNO'].isna().tolist() == [True, False, False, False, False]
+    assert rows['check_id'].tolist() == out['check_id'].tolist()
+    assert sheets['Summary'].values.tolist() == [['X', 'ERROR', 3], ['Y', 'WARN', 2]]
+    assert calls[-1] == (5, 5) and len(calls) == 5
+
+
+def test_asset_index_matches_merge_and_adds_columns():
+    from reporting import AssetEnricher, AssetIndex
+    assets = pd.DataFrame({
+        'UNITID': [1, 2, 2, 3], 'UNITNO': ['A1', 'A2', 'DUP', 'A3'], 'STREET': ['Main', 'King', 'X', 'Queen'],
+        'LOCATION': ['N', 'S', 'E', 'W'],
+    })
+    fdf = findings_to_dataframe([
+        Finding(unitid='2', check_id='X', severity='ERROR', message='m'),
+        Finding(unitid='(DATASET)', check_id='Y', severity='ERROR', message='m'),
+        Finding(unitid='3', check_id='X', severity='WARN', message='m'),
+    ])
+    index = AssetIndex(assets)
+    one_off, indexed = build_output(fdf, assets), build_output(fdf, index)
+    pd.testing.assert_frame_equal(one_off, indexed)
+    assert indexed['UNITID'].tolist() == ['2', '(DATASET)', '3']
+    assert indexed['UNITNO'].tolist()[0] == 'A2' and pd.isna(indexed['UNITNO'][1])   # first duplicate wins
+
+    enricher = AssetEnricher(index)
+    wider = enricher.add_columns(enricher(fdf), ['LOCATION'])
+    assert wider['LOCATION'].tolist()[::2] == ['S', 'W']
+    assert list(build_output(fdf, index, extra_cols=['LOCATION']).columns[:4]) == ['UNITID', 'UNITNO', 'STREET', 'LOCATION']
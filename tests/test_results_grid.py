@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from results_grid import ALL, GridModel
+
+
+def _df():
+    return pd.DataFrame({
+        'UNITID': ['U3', 'U1', 'U2', None],
+        'check_id': ['UNITNO_FORMAT', 'MANDATORY_FIELDS', 'UNITNO_FORMAT', 'INSTALL_DATE_FUTURE'],
+        'severity': ['ERROR', 'ERROR', 'ERROR', 'WARN'],
+        'message': ['Bad format', 'Blank street', 'Bad Format', 'Future date'],
+    })
+
+
+def test_filters_search_and_sort():
+    m = GridModel(_df())
+    assert m.distinct('severity') == ['ERROR', 'WARN']
+    assert m.query({'check_id': 'UNITNO_FORMAT', 'severity': ALL}).tolist() == [0, 2]
+    assert m.query(text='bad FORMAT').tolist() == [0, 2]
+    assert m.query({'severity': 'ERROR'}, sort_col='UNITID').tolist() == [1, 2, 0]
+    assert m.query(sort_col='UNITID', ascending=False).tolist() == [0, 2, 1, 3]   # nulls last
+
+
+def test_rows_page_through_view():
+    m = GridModel(_df())
+    m.set_view(np.array([3, 1]))
+    assert len(m) == 2
+    assert m.rows(0, 10) == [('', 'INSTALL_DATE_FUTURE', 'WARN', 'Future date'),
+                             ('U1', 'MANDATORY_FIELDS', 'ERROR', 'Blank street')]
+    assert m.rows(1, 1)[0][0] == 'U1'
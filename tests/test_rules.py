@@ -0,0 +1,155 @@
+import pickle
+import pandas as pd
+import pytest
+import registry
+import rules
+from engine import discover_checks, run_selected_batches
+from reporting import findings_to_dataframe
+from telemetry import RunTelemetry
+from benchmarks.datasets import make_mayrise_tables
+
+RULES_TOML = '''
+[[rule]]
+id = "R_MANDATORY"
+table = "ASSETS"
+type = "not_null"
+columns = ["UNITNO", "STREET"]
+message = "Blank"
+
+[[rule]]
+id = "R_UNITNO"
+table = "ASSETS"
+type = "regex"
+column = "UNITNO"
+pattern = '^[A-Za-z]+[ .-]?\\d+(?:[A-Za-z]+)?$'
+
+[[rule]]
+id = "R_FUTURE"
+table = "ASSETS"
+type = "date_range"
+column = "INSTALLDATE"
+max = "today"
+severity = "WARN"
+
+[[rule]]
+id = "R_OWNER"
+table = "ASSETS"
+type = "allowed_values"
+column = "SERVICEOWN"
+values = ["pl ug", "DNO"]
+
+[[rule]]
+id = "R_PLUG"
+table = "ASSETS"
+type = "exists"
+ref_table = "CABLENOD"
+ref_column = "LINK_ID"
+where = { column = "SERVICEOWN", values = ["PL UG"] }
+'''
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    path = tmp_path / "rules.toml"
+    path.write_text(RULES_TOML)
+    monkeypatch.setattr(registry, "RULES_PATH", str(path))
+    return str(path)
+
+
+def _run(tables, ids, mode="sequential"):
+    fdf = findings_to_dataframe(run_selected_batches(tables, ids, mode=mode, max_workers=2, telemetry=RunTelemetry(None, None)))
+    return fdf.sort_values(["unitid", "field"]).reset_index(drop=True)
+
+
+def test_rules_match_the_hand_written_checks(rules_file):
+    tables = make_mayrise_tables(3_000, seed=5)
+    assert {"R_MANDATORY", "R_PLUG"} <= set(discover_checks())
+    for rule_id, check_id in [("R_MANDATORY", "MANDATORY_FIELDS"), ("R_UNITNO", "UNITNO_FORMAT"),
+                              ("R_FUTURE", "INSTALL_DATE_FUTURE"), ("R_PLUG", "SERVICEOWN_PLUG_REQUIRES_CABLENOD")]:
+        got, want = _run(tables, [rule_id]), _run(tables, [check_id])
+        assert len(got) == len(want) > 0, rule_id
+        assert got["unitid"].tolist() == want["unitid"].tolist()
+        assert rule_id == "R_PLUG" or got["field"].tolist() == want["field"].tolist()   # exists reports its key column
+    owners = _run(tables, ["R_OWNER"])
+    assert set(owners["current_value"]) == {"COUNCIL", "PL OH", "PRIVATE"} and owners["expected"].iloc[0] == "pl ug, DNO"
+
+
+def test_rules_on_a_table_are_evaluated_once_and_survive_process_pools(rules_file, monkeypatch):
+    calls = []
+    orig = rules.evaluate_rule
+    monkeypatch.setattr(rules, "evaluate_rule", lambda ctx, rule: calls.append(rule.id) or orig(ctx, rule))
+    tables = make_mayrise_tables(500, seed=1)
+    ids = ["R_MANDATORY", "R_UNITNO", "R_OWNER"]
+    threaded = _run(tables, ids, mode="thread")
+    # The whole ASSETS-only group, once; the exists rule (it also reads CABLENOD) is its own group
+    assert sorted(calls) == sorted(set(rules.rule_checks()) - {"R_PLUG"})
+    cls = rules.rule_checks()["R_UNITNO"]
+    clone = pickle.loads(pickle.dumps(cls))
+    assert clone.rule == cls.rule and clone.group == cls.group
+    pd.testing.assert_frame_equal(_run(tables, ids, mode="process"), threaded)
+
+
+def test_registry_lists_rules_without_compiling_them(rules_file):
+    infos = {cid: i for cid, i in registry.list_checks().items() if i.module == "rules"}
+    compiled = rules.rule_checks()
+    assert {cid: (i.name, i.description, i.class_name) for cid, i in infos.items()} == \
+        {cid: (c.name, c.description, c.__name__) for cid, c in compiled.items()}
+    assert registry.load_check("R_PLUG") is compiled["R_PLUG"]
+
+
+def test_rule_errors_are_reported():
+    with pytest.raises(ValueError, match="unknown type"):
+        rules.parse_rule({"id": "X", "table": "ASSETS", "type": "nope", "column": "A"})
+    with pytest.raises(ValueError, match="regex rules need pattern"):
+        rules.parse_rule({"id": "X", "table": "ASSETS", "type": "regex", "column": "A"})
+    with pytest.raises(ValueError, match="Rule X: invalid min date '2020-13-01'"):
+        rules.parse_rule({"id": "X", "table": "ASSETS", "type": "date_range", "column": "A", "min": "2020-13-01"})
+    with pytest.raises(ValueError, match="unknown setting"):
+        rules.parse_rule({"id": "X", "table": "ASSETS", "type": "not_null", "column": "A", "pattern": "x"})
+    check = rules.compile_rule(rules.parse_rule({"id": "X", "table": "ASSETS", "type": "not_null", "column": "A"}))
+    f = check().run({"ASSETS": pd.DataFrame({"UNITID": ["U1"]})})
+    assert f[0].unitid == "(DATASET)" and f[0].message == "Missing column(s): A"
+
+
+def test_pipelined_rules_wait_for_their_reference_table(rules_file):
+    import threading
+    from engine import run_pipelined
+    from loading import TableLoad
+    from sinks import SummarySink
+    tables = make_mayrise_tables(2_000, seed=6)
+    ids = sorted(rules.rule_checks())
+    assets_rules = {"R_MANDATORY", "R_UNITNO", "R_FUTURE", "R_OWNER"}
+    done = threading.Event()
+
+    class _Sink(SummarySink):
+        seen = set()
+
+        def write(self, batch):
+            self.seen.add(batch.frame["check_id"].iloc[0] if len(batch) else None)
+            super().write(batch)
+            if assets_rules <= self.seen:
+                done.set()
+
+    def _loads():
+        # CABLENOD loads last, after the ASSETS-only rules have already run
+        yield TableLoad("ASSETS", tables["ASSETS"], 0.0)
+        assert done.wait(timeout=30)
+        yield TableLoad("CABLENOD", tables["CABLENOD"], 0.0)
+
+    batch = run_pipelined(_loads(), ids, max_workers=2, telemetry=RunTelemetry(None, None), sinks=[_Sink()])
+    pipelined = findings_to_dataframe(batch).sort_values(["unitid", "field"]).reset_index(drop=True)
+    assert not (pipelined["unitid"] == "(DATASET)").any()
+    pd.testing.assert_frame_equal(pipelined, _run(tables, ids))
+
+
+def test_rule_edit_forces_full_incremental_run(tmp_path):
+    from incremental import IncrementalStore
+    store = IncrementalStore(str(tmp_path / "state"))
+    tables = {"ASSETS": pd.DataFrame({"UNITID": ["U1", "U2"], "SERVICEOWN": ["PL UG", "DNO"]})}
+    spec = {"id": "R_OWNER", "table": "ASSETS", "type": "allowed_values", "column": "SERVICEOWN", "values": ["PL UG"]}
+    old = rules.compile_rule(rules.parse_rule(spec))()
+    assert [f.unitid for f in store.run_check(old, tables)] == ["U2"]
+    # Same id and columns, new allowed values: the old finding must not be carried forward
+    new = rules.compile_rule(rules.parse_rule({**spec, "values": ["PL UG", "DNO", "XX"]}))()
+    assert list(store.run_check(new, tables)) == list(new.run_batch(tables)) == []
+    assert store.last_stats["R_OWNER"]["carried"] == 0
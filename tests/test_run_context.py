@@ -0,0 +1,52 @@
+import pickle
+import threading
+import pandas as pd
+from run_context import RunContext
+
+
+def _ctx():
+    return RunContext({
+        "ASSETS": pd.DataFrame({"UNITID": [" U1", "U2 ", None], "SERVICEOWN": [" PL UG", "dno", None],
+                                "INSTALLDATE": ["2020-01-01", "bad", None]}),
+        "CABLENOD": pd.DataFrame({"LINK_ID": ["U1 ", "U1", None]}),
+    })
+
+
+def test_views_are_memoized_and_normalized():
+    ctx = _ctx()
+    svc = ctx.view("ASSETS", "SERVICEOWN", "casefold")
+    assert svc.iloc[0] == "pl ug"
+    assert ctx.view("ASSETS", "SERVICEOWN", "casefold") is svc
+    assert ctx.view("ASSETS", "UNITID", "blank").tolist() == [False, False, True]
+    assert ctx.view("ASSETS", "INSTALLDATE", "datetime").notna().tolist() == [True, False, False]
+    assert list(ctx.key_values("CABLENOD", "LINK_ID")) == ["U1"]
+
+
+def test_views_evicted_on_table_replace_and_clear():
+    ctx = _ctx()
+    first = ctx.view("ASSETS", "UNITID", "strip")
+    ctx["ASSETS"] = pd.DataFrame({"UNITID": ["X"]})
+    assert ctx.view("ASSETS", "UNITID", "strip").tolist() == ["X"]
+    ctx.clear_views()
+    assert ctx.view("ASSETS", "UNITID", "strip") is not first
+
+
+def test_view_built_once_across_threads(monkeypatch):
+    import run_context
+    calls = []
+    orig = run_context.TRANSFORMS["datetime"]
+    monkeypatch.setitem(run_context.TRANSFORMS, "datetime", lambda c, t, col: calls.append(1) or orig(c, t, col))
+    ctx = _ctx()
+    threads = [threading.Thread(target=ctx.view, args=("ASSETS", "INSTALLDATE", "datetime")) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1
+
+
+def test_context_pickles_without_views():
+    ctx = _ctx()
+    ctx.view("ASSETS", "UNITID", "strip")
+    clone = pickle.loads(pickle.dumps(ctx))
+    assert isinstance(clone, RunContext) and list(clone) == ["ASSETS", "CABLENOD"]
+    assert clone._views == {}
+    assert RunContext.wrap(ctx) is ctx
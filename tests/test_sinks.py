@@ -0,0 +1,92 @@
+import gzip
+import json
+import sqlite3
+import pandas as pd
+import pytest
+from engine import run_selected_batches
+from models import Finding, FindingBatch
+from reporting import AssetEnricher, build_output, findings_to_dataframe
+from sinks import CsvGzSink, FindingSink, JsonLinesSink, ParquetSink, SqliteSink, SummarySink
+from telemetry import RunTelemetry
+
+
+def _assets():
+    return pd.DataFrame({
+        'UNITID': ['U1', 'U2', 'U3'], 'UNITNO': ['', 'BAD_2', 'A3'], 'STREET': ['X', '', 'Z'],
+        'SERVICEOWN': ['PL UG', 'DNO', 'PL UG'], 'INSTALLDATE': ['2035-01-01', '2020-01-01', None],
+    })
+
+
+def _read(kind, path):
+    if kind == 'parquet':
+        return pd.read_parquet(path)
+    if kind == 'csv':
+        return pd.read_csv(path, keep_default_na=False, na_values=[''])
+    if kind == 'jsonl':
+        return pd.read_json(path, lines=True)
+    with sqlite3.connect(path) as conn:
+        return pd.read_sql('SELECT * FROM findings', conn)
+
+
+@pytest.mark.parametrize('kind, name, cls', [
+    ('parquet', 'f.parquet', ParquetSink), ('csv', 'f.csv.gz', CsvGzSink),
+    ('jsonl', 'f.jsonl', JsonLinesSink), ('sqlite', 'f.db', SqliteSink),
+])
+@pytest.mark.parametrize('mode', ['sequential', 'thread'])
+def test_sinks_match_in_memory_output(tmp_path, kind, name, cls, mode):
+    tables = {'ASSETS': _assets(), 'CABLENOD': pd.DataFrame({'LINK_ID': ['U3']})}
+    expected = build_output(findings_to_dataframe(run_selected_batches(tables, telemetry=RunTelemetry(None, None))),
+                            tables['ASSETS'])
+    path, summary = str(tmp_path / name), SummarySink()
+    with cls(path, enrich=AssetEnricher(tables['ASSETS'])) as sink:
+        batch = run_selected_batches(tables, mode=mode, max_workers=4, telemetry=RunTelemetry(None, None),
+                                     sinks=[sink, summary], keep_findings=False)
+    assert len(batch) == 0
+    assert sink.rows_written == summary.rows_written == len(expected)
+    got = _read(kind, path)
+    assert list(got.columns) == list(expected.columns)
+    key = ['check_id', 'UNITID', 'field']
+    got = got.fillna('').astype(str).sort_values(key).reset_index(drop=True)
+    want = expected.fillna('').astype(str).sort_values(key).reset_index(drop=True)
+    assert got[key + ['STREET', 'message']].equals(want[key + ['STREET', 'message']])
+    assert summary.by_severity == expected.groupby('severity').size().to_dict()
+
+
+def test_empty_run_still_writes_headers(tmp_path):
+    enrich = AssetEnricher(_assets())
+    with CsvGzSink(str(tmp_path / 'f.csv.gz'), enrich=enrich):
+        pass
+    with gzip.open(tmp_path / 'f.csv.gz', 'rt') as f:
+        assert f.read().strip().split(',') == enrich.columns
+    with ParquetSink(str(tmp_path / 'f.parquet'), enrich=enrich):
+        pass
+    assert list(pd.read_parquet(tmp_path / 'f.parquet').columns) == enrich.columns
+
+
+def test_jsonl_is_readable_before_close(tmp_path):
+    path = tmp_path / 'f.jsonl'
+    sink = JsonLinesSink(str(path))
+    run_selected_batches({'ASSETS': _assets()}, ['MANDATORY_FIELDS'], telemetry=RunTelemetry(None, None), sinks=[sink])
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])['check_id'] == 'MANDATORY_FIELDS'
+    sink.close()
+
+
+def test_parquet_takes_batches_with_different_value_types(tmp_path):
+    path = tmp_path / 'f.parquet'
+    first = FindingBatch.from_findings([Finding('U1', 'A', 'ERROR', 'm', 'LEN', 12.5, None)])
+    second = FindingBatch.from_findings([Finding('U2', 'B', 'ERROR', 'm', 'UNITNO', 'BAD_2', pd.Timestamp('2024-05-01')),
+                                         Finding('U3', 'B', 'ERROR', 'm', 'UNITNO', None, None)])
+    with ParquetSink(str(path)) as sink:
+        sink.write(first)
+        sink.write(second)
+    got = pd.read_parquet(path)
+    assert got['current_value'].tolist()[:2] == ['12.5', 'BAD_2'] and got['current_value'].isna().tolist() == [False, False, True]
+    assert got['expected'].isna().tolist() == [True, False, True] and got['expected'][1].startswith('2024-05-01')
+
+
+def test_sinks_must_implement_write_frame():
+    with pytest.raises(TypeError, match="_write_frame"):
+        FindingSink()
+    with pytest.raises(TypeError, match="_write_frame"):
+        type("NoFrames", (FindingSink,), {})()
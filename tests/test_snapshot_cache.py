@@ -0,0 +1,46 @@
+import time
+import pandas as pd
+import pytest
+from snapshot_cache import SnapshotCache
+
+
+@pytest.fixture
+def counting_loader():
+    calls = []
+    def _load(conn_str, sql):
+        calls.append(sql)
+        return pd.DataFrame({"LINK_ID": ["U1", "U2"], "N": [1, 2]})
+    _load.calls = calls
+    return _load
+
+
+def test_cache_hit_skips_loader(tmp_path, counting_loader):
+    cache = SnapshotCache(str(tmp_path), ttl=60)
+    first = cache.load("DSN=X", "SELECT 1", counting_loader)
+    second = cache.load("DSN=X", "SELECT 1", counting_loader)
+    assert len(counting_loader.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    # Different SQL text or connection string is a different key
+    cache.load("DSN=Y", "SELECT 1", counting_loader)
+    assert len(counting_loader.calls) == 2
+
+
+def test_cache_refresh_and_ttl(tmp_path, counting_loader):
+    cache = SnapshotCache(str(tmp_path), ttl=0.01)
+    cache.load("DSN=X", "SELECT 1", counting_loader)
+    time.sleep(0.02)
+    cache.load("DSN=X", "SELECT 1", counting_loader)  # expired
+    cache.ttl = None
+    cache.load("DSN=X", "SELECT 1", counting_loader, refresh=True)
+    assert len(counting_loader.calls) == 3
+    assert cache.info("DSN=X", "SELECT 1")["rows"] == 2
+
+
+def test_cache_offline_uses_stale_snapshot(tmp_path, counting_loader):
+    cache = SnapshotCache(str(tmp_path), ttl=0)
+    with pytest.raises(LookupError):
+        cache.load("DSN=X", "SELECT 1", counting_loader, offline=True)
+    cache.put("DSN=X", "SELECT 1", pd.DataFrame({"A": ["x"]}))
+    out = cache.wrap(counting_loader, offline=True)("DSN=X", "SELECT 1")
+    assert out["A"].tolist() == ["x"]
+    assert counting_loader.calls == []
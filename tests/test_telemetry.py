@@ -0,0 +1,59 @@
+from datetime import datetime
+import sqlite3
+import pandas as pd
+from engine import run_selected_batches
+from telemetry import CheckStats, RunTelemetry, check_history, monthly_trends, slower_checks
+
+
+def _assets():
+    return pd.DataFrame({
+        'UNITID': ['U1', 'U2'], 'UNITNO': ['', 'A2'], 'STREET': ['X', 'Y'],
+        'SERVICEOWN': ['DNO', 'DNO'], 'INSTALLDATE': ['2020-01-01', '2035-01-01'],
+    })
+
+
+def test_run_records_stats_and_flushes_once(tmp_path):
+    db, log = str(tmp_path / 'checks.db'), tmp_path / 'checks.csv'
+    tel = RunTelemetry(db, str(log), run_id='r1')
+    batch = run_selected_batches({'ASSETS': _assets()}, ['MANDATORY_FIELDS', 'INSTALL_DATE_FUTURE'],
+                                 telemetry=tel, track_memory=True)
+    hist = check_history(db).set_index('check_id')
+    assert set(hist.index) == {'MANDATORY_FIELDS', 'INSTALL_DATE_FUTURE'}
+    assert hist['findings'].sum() == len(batch)
+    assert (hist['rows_read'] == 2).all()
+    assert (hist['wall_s'] >= 0).all() and (hist['peak_mem_bytes'] > 0).all()
+    with sqlite3.connect(db) as conn:
+        assert conn.execute('SELECT checks, findings FROM runs').fetchall() == [(2, len(batch))]
+        assert len(conn.execute('SELECT * FROM checks_csv').fetchall()) == 2
+    lines = log.read_text().splitlines()
+    assert lines[0] == 'DateTime,CheckID,ItemsReturned' and len(lines) == 3
+    assert tel.stats == []
+
+
+def test_peak_memory_is_not_recorded_for_concurrent_thread_checks(tmp_path):
+    db = str(tmp_path / 'threads.db')
+    run_selected_batches({'ASSETS': _assets()}, ['MANDATORY_FIELDS', 'INSTALL_DATE_FUTURE'], mode='thread',
+                         max_workers=2, telemetry=RunTelemetry(db, None), track_memory=True)
+    assert check_history(db)['peak_mem_bytes'].isna().all()
+
+
+def test_default_telemetry_is_written_to_the_default_paths(tmp_path):
+    import telemetry
+    run_selected_batches({'ASSETS': _assets()}, ['MANDATORY_FIELDS'])
+    # tests/conftest.py points the defaults into tmp_path
+    assert telemetry.DEFAULT_DB_PATH == str(tmp_path / 'checks.db') and (tmp_path / 'checks.csv').is_file()
+
+
+
+def test_slower_checks_compares_recent_to_previous_period(tmp_path):
+    db = str(tmp_path / 'checks.db')
+    for run_id, day, fast, slow in [('a', '2026-08-20', 1.0, 1.0), ('b', '2026-09-25', 1.0, 3.0)]:
+        tel = RunTelemetry(db, None, run_id=run_id)
+        tel.record(CheckStats('FAST', f'{day} 10:00:00', fast, fast, 10, 0))
+        tel.record(CheckStats('SLOW', f'{day} 10:00:00', slow, slow, 10, 0))
+        tel.flush()
+    out = slower_checks(db, days=30, now=datetime(2026, 10, 1))
+    assert list(out['check_id']) == ['SLOW']
+    assert out['ratio'][0] == 3.0
+    trends = monthly_trends(db)
+    assert list(trends[trends['check_id'] == 'SLOW']['month']) == ['2026-08', '2026-09']